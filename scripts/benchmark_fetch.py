@@ -0,0 +1,67 @@
+"""Record a replay corpus from the live sources, or benchmark the fetcher against one offline."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from newsreader.replay import ReplayConditions, record_corpus, run_benchmark
+from newsreader.settings import get_settings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    record = sub.add_parser("record", help="Capture front pages and articles of the configured sources")
+    record.add_argument("corpus", type=Path, help="Output corpus directory")
+    record.add_argument("--sources", type=Path, default=None, help="sources.json to record (default: configured one)")
+    record.add_argument("--max-articles", type=int, default=10, help="Articles to capture per source")
+
+    run = sub.add_parser("run", help="Run fetch_all_sources against a recorded corpus")
+    run.add_argument("corpus", type=Path, help="Corpus directory created with 'record'")
+    run.add_argument("--latency-ms", type=float, default=0.0, help="Added latency per request")
+    run.add_argument("--bandwidth-kbps", type=float, default=0.0, help="Per-connection bandwidth cap (0 = unlimited)")
+    run.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 503")
+    run.add_argument("--seed", type=int, default=0, help="Seed for error injection")
+    run.add_argument("--max-articles", type=int, default=None, help="Articles per source (default: all recorded)")
+    run.add_argument("--parse-workers", type=int, default=None, help="Parse pool size (0 = inline)")
+    run.add_argument("--download-workers", type=int, default=None, help="Concurrent source downloads")
+    run.add_argument("--profile", default=None, help="Extraction profile (minimal/standard/full)")
+
+    args = parser.parse_args()
+
+    if args.command == "record":
+        sources_path = args.sources or get_settings().default_sources_path
+        config = json.loads(sources_path.read_text(encoding="utf-8"))
+        sources = [s for s in config.get("sources", []) if s.get("enabled", True)]
+        manifest = record_corpus(sources, args.corpus, max_articles=args.max_articles)
+        print(f"Recorded {sum(len(s['pages']) for s in manifest['sources'])} pages into {args.corpus}")
+        return
+
+    fetcher_config = {}
+    if args.parse_workers is not None:
+        fetcher_config["parse_workers"] = args.parse_workers
+    if args.download_workers is not None:
+        fetcher_config["download_workers"] = args.download_workers
+    if args.profile:
+        fetcher_config["extraction_profile"] = args.profile
+    conditions = ReplayConditions(
+        latency_ms=args.latency_ms,
+        bandwidth_kbps=args.bandwidth_kbps,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    report = run_benchmark(args.corpus, conditions, args.max_articles, fetcher_config)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
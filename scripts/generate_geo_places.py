@@ -26,13 +26,33 @@ def fetch_csv(url: str) -> str:
     return resp.text
 
 
-def extract_cities(csv_text: str) -> set[str]:
-    cities: set[str] = set()
+def _number(value: str | None, cast):
+    try:
+        return cast(value) if value not in (None, "") else None
+    except ValueError:
+        return None
+
+
+def extract_cities(csv_text: str) -> dict[str, dict]:
+    """City entries with coordinates, keeping the most populous city per name."""
+    cities: dict[str, dict] = {}
     reader = csv.DictReader(StringIO(csv_text))
     for row in reader:
-        city = row.get("city")
-        if city:
-            cities.add(city.strip())
+        city = (row.get("city") or "").strip()
+        lat = _number(row.get("lat"), float)
+        lon = _number(row.get("lng"), float)
+        if not city or lat is None or lon is None:
+            continue
+        entry = {
+            "name": city,
+            "lat": lat,
+            "lon": lon,
+            "population": _number(row.get("population"), lambda value: int(float(value))),
+            "country": (row.get("country") or "").strip() or None,
+        }
+        current = cities.get(city.lower())
+        if current is None or (entry["population"] or 0) > (current["population"] or 0):
+            cities[city.lower()] = entry
     return cities
 
 
@@ -54,7 +74,9 @@ def main() -> None:
     countries_csv = fetch_csv(COUNTRIES_URL)
     cities = extract_cities(cities_csv)
     countries = extract_countries(countries_csv)
-    all_places = sorted(cities | countries)
+    # Countries have no coordinates in the source list; they are geocoded online (and cached)
+    all_places = list(cities.values()) + [name for name in countries if name.lower() not in cities]
+    all_places.sort(key=lambda place: (place["name"] if isinstance(place, dict) else place).lower())
     print(f"Total unique places: {len(all_places)}")
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import argparse
+import os
 import sys
 from pathlib import Path
 
@@ -15,11 +17,23 @@ from newsreader.nlp_processor import NLPProcessor
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="tagger processes (more than 1 resolves places offline/from cache only)")
+    parser.add_argument("--batch-size", type=int, default=64, help="articles per chunk/transaction")
+    args = parser.parse_args()
+
     db = DatabaseManager()
     nlp = NLPProcessor()
     print("Extracting and saving geo-tags for all articles...")
-    db.geo_tag_all_articles(nlp)
-    print("Geo-tagging complete.")
+    stats = db.geo_tag_all_articles(
+        nlp,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        progress=lambda done, total: print(f"  {done}/{total} articles", flush=True),
+    )
+    print(f"Geo-tagging complete: {stats['tags']} tags on {stats['tagged_articles']} of {stats['processed']} articles "
+          f"in {stats['seconds']}s.")
 
 
 if __name__ == "__main__":
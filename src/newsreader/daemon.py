@@ -17,6 +17,7 @@ SETTINGS = get_settings()
 from .database import DatabaseManager
 from .fetcher import NewsFetcher
 from .scorer import ArticleScorer
+from .source_scheduler import SourceScheduler
 
 # Configure logging
 logging.basicConfig(
@@ -45,6 +46,7 @@ class NewsDaemon:
         self.db = DatabaseManager()
         self.fetcher = NewsFetcher(self.db, self.sources_file)
         self.scorer = ArticleScorer(self.db)
+        self.source_scheduler: Optional[SourceScheduler] = None
         self.lockfile_path = Path(self.LOCKFILE)
         self.lockfile_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -110,7 +112,12 @@ class NewsDaemon:
                     'fetch_interval_minutes': config.get('fetch_interval_minutes', 30),
                     'max_articles_per_source': config.get('max_articles_per_source', 10),
                     'cleanup_days': config.get('cleanup_days', 30),
-                    'enabled': config.get('daemon_enabled', True)
+                    'enabled': config.get('daemon_enabled', True),
+                    'adaptive_scheduling': config.get('adaptive_scheduling', False),
+                    'min_fetch_interval_minutes': config.get('min_fetch_interval_minutes', 5),
+                    'max_fetch_interval_minutes': config.get('max_fetch_interval_minutes', 240),
+                    'target_new_articles': config.get('target_new_articles', 3),
+                    'schedule_jitter': config.get('schedule_jitter', 0.1)
                 }
         except (FileNotFoundError, json.JSONDecodeError) as e:
             logger.error(f"Failed to load daemon config: {e}")
@@ -118,7 +125,8 @@ class NewsDaemon:
                 'fetch_interval_minutes': 30,
                 'max_articles_per_source': 10,
                 'cleanup_days': 30,
-                'enabled': True
+                'enabled': True,
+                'adaptive_scheduling': False
             }
 
     def signal_handler(self, signum, frame):
@@ -155,8 +163,10 @@ class NewsDaemon:
             else:
                 logger.info("Fetcher does not support fetch_all_sources method.")
 
-            # Update article scores
-            self.scorer.score_all_articles()
+            # Fill in summaries the cheap extraction profiles deferred. New articles were
+            # already scored by the pipeline; full rescoring is left to score-word changes.
+            if hasattr(self.fetcher, 'enrich_articles'):
+                self.fetcher.enrich_articles()
 
             duration = datetime.now() - start_time
             logger.info(f"News fetch completed in {duration.total_seconds():.1f} seconds")
@@ -164,6 +174,37 @@ class NewsDaemon:
         except Exception as e:
             logger.error(f"Error in news fetch job: {e}")
 
+    def adaptive_fetch_job(self):
+        """Job that fetches only the sources whose adaptive polling interval has elapsed"""
+        try:
+            due = self.source_scheduler.due_sources()
+            if not due:
+                return
+
+            logger.info(f"Starting adaptive fetch for {len(due)} due sources: {', '.join(s['name'] for s in due)}")
+            start_time = datetime.now()
+            result = self.fetcher.fetch_all_sources(self.config['max_articles_per_source'], sources=due)
+            result = result if isinstance(result, dict) else {}
+            saved_by_source = result.get('saved_by_source', {})
+            failed = set(result.get('failed_sources', ()))
+            capped = set(result.get('capped_sources', ()))
+            for source in due:
+                name = source['name']
+                if name in failed:
+                    # No observation: a failed fetch must not drag the rate towards zero
+                    self.source_scheduler.defer(name)
+                    continue
+                self.source_scheduler.record_fetch(name, saved_by_source.get(name, 0), capped=name in capped)
+
+            if hasattr(self.fetcher, 'enrich_articles'):
+                self.fetcher.enrich_articles()
+
+            duration = datetime.now() - start_time
+            logger.info(f"Adaptive fetch completed in {duration.total_seconds():.1f} seconds")
+
+        except Exception as e:
+            logger.error(f"Error in adaptive fetch job: {e}")
+
     def cleanup_job(self):
         """Job to clean up old articles"""
         try:
@@ -192,8 +233,17 @@ class NewsDaemon:
         interval = self.config['fetch_interval_minutes']
 
         # Main news fetching job
-        schedule.every(interval).minutes.do(self.fetch_news_job)
-        logger.info(f"Scheduled news fetch every {interval} minutes")
+        if self.config.get('adaptive_scheduling'):
+            # Per-source intervals are learned from history; the job just checks who is due
+            self.source_scheduler = SourceScheduler(self.db, getattr(self.fetcher, 'sources', []), self.config)
+            schedule.every(1).minutes.do(self.adaptive_fetch_job)
+            logger.info(
+                f"Scheduled adaptive per-source fetching "
+                f"({self.config['min_fetch_interval_minutes']}-{self.config['max_fetch_interval_minutes']} minutes)"
+            )
+        else:
+            schedule.every(interval).minutes.do(self.fetch_news_job)
+            logger.info(f"Scheduled news fetch every {interval} minutes")
 
         # Cleanup job (run daily)
         schedule.every().day.at("02:00").do(self.cleanup_job)
@@ -224,7 +274,10 @@ class NewsDaemon:
 
         # Run initial fetch
         logger.info("Running initial news fetch...")
-        self.fetch_news_job()
+        if self.source_scheduler is not None:
+            self.adaptive_fetch_job()
+        else:
+            self.fetch_news_job()
 
         self.running = True
         logger.info("Daemon started successfully. Press Ctrl+C to stop.")
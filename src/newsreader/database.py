@@ -2,9 +2,16 @@ import sqlite3
 import json
 import logging
 import tempfile
+import threading
+import time
 from datetime import date, datetime, timedelta, timezone
 from typing import List, Dict, Optional, Tuple
 from .settings import get_settings
+from .gazetteer import get_gazetteer
+from .geo_bulk import CHECKPOINT_NAME as GEO_CHECKPOINT_NAME, run_geo_tagging
+from .geo_grid import ROLLUP_LEVELS, cell_range, cell_size_for_zoom
+from .dedupe import MAX_HAMMING_DISTANCE, bands, from_signed, hamming_distance, to_signed
+from .urls import canonicalize_url
 from pathlib import Path
 
 
@@ -31,6 +38,195 @@ SETTINGS = get_settings()
 
 
 class DatabaseManager:
+    # How long a cached lookup table is trusted before its version row is re-read
+    LOOKUP_RECHECK_SECONDS = 2.0
+
+    def init_lookup_versions_table(self):
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS lookup_versions (
+                    name TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL DEFAULT 0
+                )
+            ''')
+            conn.commit()
+
+    def _bump_lookup_version(self, cursor, name: str):
+        """Mark a small lookup table as changed (call inside the writing transaction)."""
+        cursor.execute(
+            "INSERT INTO lookup_versions (name, version) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET version = version + 1",
+            (name,)
+        )
+        with self._lookup_lock:
+            self._lookup_cache.pop(name, None)
+
+    def mark_thumbnails_changed(self):
+        """Bump the ``thumbnails`` token so cached pages pick up newly cached thumbnails."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            self._bump_lookup_version(cursor, 'thumbnails')
+            conn.commit()
+
+    # Tables whose writes bump their lookup_versions row through triggers (response cache tokens)
+    TRACKED_TABLES = ('articles', 'geo_tags')
+
+    def init_change_tracking(self):
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            for table in self.TRACKED_TABLES:
+                for event in ('INSERT', 'UPDATE', 'DELETE'):
+                    cursor.execute(f'''
+                        CREATE TRIGGER IF NOT EXISTS {table}_version_{event.lower()} AFTER {event} ON {table}
+                        BEGIN
+                            INSERT INTO lookup_versions (name, version) VALUES ('{table}', 1)
+                            ON CONFLICT(name) DO UPDATE SET version = version + 1;
+                        END
+                    ''')
+            conn.commit()
+
+    # Ingest notifications kept for SSE clients catching up via Last-Event-ID
+    INGEST_EVENT_RETENTION = 5000
+
+    def init_ingest_events_table(self):
+        """Notification channel from the ingest daemon to ``/api/stream``.
+
+        Triggers append a row when an article is inserted, flagged as a near-duplicate or
+        geo-tagged, whichever process wrote it; web workers tail the table by id. Only the
+        newest ``INGEST_EVENT_RETENTION`` rows are kept.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS ingest_events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    article_id INTEGER NOT NULL,
+                    tag TEXT,
+                    lat REAL,
+                    lon REAL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS ingest_article_insert AFTER INSERT ON articles
+                BEGIN
+                    INSERT INTO ingest_events (kind, article_id) VALUES ('article', NEW.id);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS ingest_article_duplicate AFTER UPDATE OF duplicate_of ON articles
+                WHEN NEW.duplicate_of IS NOT NULL AND OLD.duplicate_of IS NULL
+                BEGIN
+                    INSERT INTO ingest_events (kind, article_id) VALUES ('duplicate', NEW.id);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS ingest_geo_tag_insert AFTER INSERT ON geo_tags
+                BEGIN
+                    INSERT INTO ingest_events (kind, article_id, tag, lat, lon)
+                    VALUES ('geo', NEW.article_id, NEW.tag, NEW.lat, NEW.lon);
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS ingest_events_retention AFTER INSERT ON ingest_events
+                BEGIN
+                    DELETE FROM ingest_events WHERE id <= NEW.id - {int(self.INGEST_EVENT_RETENTION)};
+                END
+            ''')
+            conn.commit()
+
+    def get_latest_ingest_event_id(self) -> int:
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM ingest_events")
+            return cursor.fetchone()[0]
+
+    def get_ingest_events(self, after_id: int, limit: int = 500) -> Tuple[List[Dict], int]:
+        """Ingest events after ``after_id`` as ``(events, last_id)``.
+
+        'article' events carry the article card (skipped if the article is gone or a
+        duplicate), 'duplicate' events just the id, and 'geo' events the tag and position
+        (skipped for excluded tags). ``last_id`` is the id to resume from, including
+        events that were skipped.
+        """
+        excluded = self.get_excluded_tag_set()
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("PRAGMA table_info(articles)")
+            has_thumbnail = 'thumbnail_url' in {row[1] for row in cursor.fetchall()}
+            cursor.execute(f'''
+                SELECT e.id, e.kind, e.article_id, e.tag, e.lat, e.lon,
+                       a.id AS found, a.duplicate_of, a.title, a.summary, a.url, a.source,
+                       a.published_date, a.score, {'a.thumbnail_url' if has_thumbnail else 'NULL'} AS thumbnail_url
+                FROM ingest_events e
+                LEFT JOIN articles a ON a.id = e.article_id AND e.kind = 'article'
+                WHERE e.id > ?
+                ORDER BY e.id
+                LIMIT ?
+            ''', (after_id, limit))
+            rows = cursor.fetchall()
+        events: List[Dict] = []
+        for row in rows:
+            if row['kind'] == 'article':
+                if row['found'] is None or row['duplicate_of'] is not None:
+                    continue
+                events.append({
+                    'id': row['id'], 'kind': 'article',
+                    'article': {
+                        'id': row['article_id'], 'title': row['title'], 'summary': row['summary'],
+                        'url': row['url'], 'source': row['source'], 'published_date': row['published_date'],
+                        'score': row['score'], 'thumbnail_url': row['thumbnail_url'],
+                    },
+                })
+            elif row['kind'] == 'geo':
+                if row['tag'] in excluded:
+                    continue
+                events.append({
+                    'id': row['id'], 'kind': 'geo', 'article_id': row['article_id'],
+                    'tag': row['tag'], 'lat': row['lat'], 'lon': row['lon'],
+                })
+            else:
+                events.append({'id': row['id'], 'kind': row['kind'], 'article_id': row['article_id']})
+        return events, (rows[-1]['id'] if rows else after_id)
+
+    def get_change_token(self, names: Tuple[str, ...]) -> Tuple[int, ...]:
+        """Current versions of the named tables; changes whenever any of them is written."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT name, version FROM lookup_versions WHERE name IN ({','.join('?' * len(names))})",
+                names
+            )
+            versions = dict(cursor.fetchall())
+        return tuple(versions.get(name, 0) for name in names)
+
+    def _cached_lookup(self, name: str, query: str) -> Tuple:
+        """Rows of a rarely-changing lookup table, served from memory while its version is unchanged.
+
+        Writers in this process invalidate immediately; changes made by other processes
+        are noticed within ``LOOKUP_RECHECK_SECONDS``.
+        """
+        now = time.monotonic()
+        with self._lookup_lock:
+            entry = self._lookup_cache.get(name)
+            if entry is not None and now - entry[1] < self.LOOKUP_RECHECK_SECONDS:
+                return entry[2]
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT version FROM lookup_versions WHERE name = ?", (name,))
+            row = cursor.fetchone()
+            version = row[0] if row else 0
+            if entry is not None and entry[0] == version:
+                values = entry[2]
+            else:
+                cursor.execute(query)
+                values = tuple(row[0] for row in cursor.fetchall())
+        with self._lookup_lock:
+            self._lookup_cache[name] = (version, now, values)
+        return values
+
     def init_excluded_tags_table(self):
         with self.get_connection() as conn:
             cursor = conn.cursor()
@@ -47,19 +243,21 @@ class DatabaseManager:
                     'Man','Uden','Inden','Os','Lille','Side','Grad','Givet','August','Maj','April','Juni','Juli','Februar','Marts','September','Oktober','November','December','Grave','Mine','Satte','Rolle','Kampen','Ende','Galt','Time','Sang','Bo','Bruges','Taber','Center'
                 ]
                 cursor.executemany('INSERT OR IGNORE INTO excluded_tags (tag) VALUES (?)', [(tag,) for tag in initial_tags])
+                self._bump_lookup_version(cursor, 'excluded_tags')
             conn.commit()
 
     def add_excluded_tag(self, tag: str):
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('INSERT OR IGNORE INTO excluded_tags (tag) VALUES (?)', (tag,))
+            self._bump_lookup_version(cursor, 'excluded_tags')
             conn.commit()
 
     def get_excluded_tags(self) -> list:
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT tag FROM excluded_tags')
-            return [row[0] for row in cursor.fetchall()]
+        return list(self._cached_lookup('excluded_tags', 'SELECT tag FROM excluded_tags ORDER BY id'))
+
+    def get_excluded_tag_set(self) -> frozenset:
+        return frozenset(self._cached_lookup('excluded_tags', 'SELECT tag FROM excluded_tags ORDER BY id'))
     def init_geo_tag_not_found_table(self):
         with self.get_connection() as conn:
             cursor = conn.cursor()
@@ -73,17 +271,214 @@ class DatabaseManager:
             conn.commit()
 
     def is_geo_tag_not_found(self, tag: str) -> bool:
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT 1 FROM geo_tag_not_found WHERE tag = ?', (tag.lower(),))
-            return cursor.fetchone() is not None
+        return tag.lower() in self._geo_tag_not_found_set()
+
+    def _geo_tag_not_found_set(self) -> frozenset:
+        values = self._cached_lookup('geo_tag_not_found', 'SELECT tag FROM geo_tag_not_found')
+        # Build the set once per loaded version, not per lookup
+        if self._not_found_set[0] is not values:
+            self._not_found_set = (values, frozenset(values))
+        return self._not_found_set[1]
 
     def add_geo_tag_not_found(self, tag: str):
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('INSERT OR IGNORE INTO geo_tag_not_found (tag) VALUES (?)', (tag.lower(),))
+            self._bump_lookup_version(cursor, 'geo_tag_not_found')
+            conn.commit()
+
+    def init_geo_cache_table(self):
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS geo_cache (
+                    place TEXT PRIMARY KEY,
+                    lat REAL NOT NULL,
+                    lon REAL NOT NULL,
+                    importance REAL,
+                    fetched_at TIMESTAMP NOT NULL,
+                    ttl_seconds INTEGER NOT NULL
+                )
+            ''')
+            conn.commit()
+
+    def get_geo_cache(self, place: str) -> Optional[Dict]:
+        """Return the cached geocode of ``place`` unless it has expired (``expires_at`` is a UNIX time)."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT lat, lon, importance, fetched_at, ttl_seconds FROM geo_cache WHERE place = ?',
+                (place.lower(),)
+            )
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        expires_at = datetime.fromisoformat(row['fetched_at']).timestamp() + row['ttl_seconds']
+        if expires_at <= datetime.now(timezone.utc).timestamp():
+            return None
+        return {'lat': row['lat'], 'lon': row['lon'], 'importance': row['importance'], 'expires_at': expires_at}
+
+    def save_geo_cache(self, place: str, lat: float, lon: float, importance: Optional[float], ttl_seconds: int):
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                'INSERT OR REPLACE INTO geo_cache (place, lat, lon, importance, fetched_at, ttl_seconds) VALUES (?, ?, ?, ?, ?, ?)',
+                (place.lower(), lat, lon, importance, datetime.now(timezone.utc), int(ttl_seconds))
+            )
             conn.commit()
 
+    def init_raw_pages_table(self):
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS raw_pages (
+                    url TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL,
+                    fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            conn.commit()
+
+    def record_raw_page(self, url: str, content_hash: str):
+        """Index an archived page so it can be re-parsed later."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "INSERT OR REPLACE INTO raw_pages (url, content_hash, fetched_at) VALUES (?, ?, ?)",
+                (url, content_hash, datetime.now(timezone.utc))
+            )
+            conn.commit()
+
+    def delete_raw_pages_before(self, cutoff: datetime) -> List[str]:
+        """Drop index rows archived before ``cutoff``; returns the digests no page references any more."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT DISTINCT content_hash FROM raw_pages WHERE fetched_at < ?", (cutoff,))
+            candidates = [row[0] for row in cursor.fetchall()]
+            cursor.execute("DELETE FROM raw_pages WHERE fetched_at < ?", (cutoff,))
+            unreferenced = []
+            for digest in candidates:
+                cursor.execute("SELECT 1 FROM raw_pages WHERE content_hash = ? LIMIT 1", (digest,))
+                if cursor.fetchone() is None:
+                    unreferenced.append(digest)
+            conn.commit()
+            return unreferenced
+
+    def get_raw_pages(self) -> List[Tuple[str, str]]:
+        """Return (url, content_hash) for every archived page."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT url, content_hash FROM raw_pages ORDER BY fetched_at")
+            return [(row[0], row[1]) for row in cursor.fetchall()]
+
+    def init_source_fetch_state_table(self):
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS source_fetch_state (
+                    source TEXT PRIMARY KEY,
+                    rate_per_hour REAL NOT NULL DEFAULT 0,
+                    interval_minutes REAL NOT NULL,
+                    last_fetch_at TIMESTAMP,
+                    next_fetch_at TIMESTAMP
+                )
+            ''')
+            conn.commit()
+
+    def get_source_fetch_states(self) -> Dict[str, Dict]:
+        """Return the adaptive scheduler state per source name."""
+        def parse(value):
+            return datetime.fromisoformat(value) if value else None
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT source, rate_per_hour, interval_minutes, last_fetch_at, next_fetch_at FROM source_fetch_state")
+            return {
+                row[0]: {
+                    'source': row[0],
+                    'rate_per_hour': row[1],
+                    'interval_minutes': row[2],
+                    'last_fetch_at': parse(row[3]),
+                    'next_fetch_at': parse(row[4]),
+                }
+                for row in cursor.fetchall()
+            }
+
+    def save_source_fetch_state(self, source: str, rate_per_hour: float, interval_minutes: float,
+                                last_fetch_at: Optional[datetime], next_fetch_at: Optional[datetime]):
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "INSERT OR REPLACE INTO source_fetch_state (source, rate_per_hour, interval_minutes, last_fetch_at, next_fetch_at) VALUES (?, ?, ?, ?, ?)",
+                (source, rate_per_hour, interval_minutes, last_fetch_at, next_fetch_at)
+            )
+            conn.commit()
+
+    def init_source_health_table(self):
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS source_health (
+                    source TEXT PRIMARY KEY,
+                    state TEXT NOT NULL DEFAULT 'closed',
+                    consecutive_failures INTEGER NOT NULL DEFAULT 0,
+                    trips INTEGER NOT NULL DEFAULT 0,
+                    opened_at TIMESTAMP,
+                    retry_at TIMESTAMP,
+                    last_success_at TIMESTAMP,
+                    last_failure_at TIMESTAMP,
+                    last_error TEXT
+                )
+            ''')
+            conn.commit()
+
+    def get_source_health(self) -> List[Dict]:
+        """Return the circuit-breaker state of every source that has been fetched."""
+        timestamps = ('opened_at', 'retry_at', 'last_success_at', 'last_failure_at')
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT source, state, consecutive_failures, trips, opened_at, retry_at, last_success_at, "
+                "last_failure_at, last_error FROM source_health ORDER BY source"
+            )
+            rows = []
+            for row in cursor.fetchall():
+                entry = dict(row)
+                for key in timestamps:
+                    entry[key] = datetime.fromisoformat(entry[key]) if entry[key] else None
+                rows.append(entry)
+            return rows
+
+    def save_source_health(self, state: Dict):
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "INSERT OR REPLACE INTO source_health (source, state, consecutive_failures, trips, opened_at, retry_at, "
+                "last_success_at, last_failure_at, last_error) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (state['source'], state['state'], state['consecutive_failures'], state['trips'], state['opened_at'],
+                 state['retry_at'], state['last_success_at'], state['last_failure_at'], state['last_error'])
+            )
+            conn.commit()
+
+    def get_source_article_rates(self, hours: int = 72) -> Dict[str, float]:
+        """New articles per hour for each source over the last ``hours`` of ingest history."""
+        cutoff = (datetime.now(timezone.utc) - timedelta(hours=hours)).strftime('%Y-%m-%d %H:%M:%S')
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT source, COUNT(*), MIN(fetched_at) FROM articles WHERE fetched_at >= ? GROUP BY source",
+                (cutoff,)
+            )
+            rates = {}
+            for source, count, first_seen in cursor.fetchall():
+                try:
+                    first = datetime.fromisoformat(str(first_seen)[:19].replace('T', ' ')).replace(tzinfo=timezone.utc)
+                    span_hours = max((datetime.now(timezone.utc) - first).total_seconds() / 3600.0, 1.0)
+                except ValueError:
+                    span_hours = float(hours)
+                rates[source] = count / span_hours
+            return rates
+
     # Geo-tag management methods
     def save_geo_tags(self, article_id: int, tags: list):
         """Save geo-tags for an article, skipping excluded tags."""
@@ -97,7 +492,7 @@ class DatabaseManager:
         logger = logging.getLogger("geo-db-debug")
         info_logger = logging.getLogger("geo-db-info")
         info_logger.setLevel(logging.INFO)
-        excluded = set(self.get_excluded_tags())
+        excluded = self.get_excluded_tag_set()
         with self.get_connection() as conn:
             cursor = conn.cursor()
             for tag in tags:
@@ -138,8 +533,13 @@ class DatabaseManager:
                 for row in rows
             ]
 
-    def geo_tag_all_articles(self, nlp_processor):
-        """Extract and save geo-tags for all articles that do not have geo-tags yet. Includes debug logging. Buffers geo_tag_not_found writes to avoid DB locking."""
+    def geo_tag_all_articles(self, nlp_processor, batch_size: int = 32, workers: int = 1, progress=None) -> Dict:
+        """Extract and save geo-tags for all articles that do not have geo-tags yet. Includes debug logging. Buffers geo_tag_not_found writes to avoid DB locking.
+
+        Resumable bulk job (see ``geo_bulk``): untagged articles are streamed in chunks of
+        ``batch_size``, tagged in-process or by ``workers`` processes, and committed per
+        chunk with a checkpoint. ``progress(processed, total)`` is called after each chunk.
+        """
         import logging
         logging.basicConfig(level=logging.DEBUG,
                             format='%(asctime)s %(levelname)s %(name)s %(message)s',
@@ -148,61 +548,474 @@ class DatabaseManager:
                                 logging.StreamHandler()
                             ])
         logger = logging.getLogger("geo-db-debug")
-        info_logger = logging.getLogger("geo-db-info")
-        info_logger.setLevel(logging.INFO)
         not_found_tags = set()
         def not_found_callback(tag):
             not_found_tags.add(tag)
+        # Compile/load the shared gazetteer once up front instead of inside the first chunk
+        try:
+            get_gazetteer()
+        except (OSError, ValueError) as e:
+            logger.warning(f"Geo places list unavailable: {e}")
+        try:
+            stats = run_geo_tagging(self, nlp_processor, batch_size=batch_size, workers=workers,
+                                    progress=progress, not_found_callback=not_found_callback)
+        finally:
+            # After the chunk transactions, write geo_tag_not_found tags
+            if not_found_tags:
+                logger.info(f"Writing {len(not_found_tags)} geo_tag_not_found tags after geo-tagging batch.")
+                self._bulk_add_geo_tag_not_found(not_found_tags)
+        logger.info(f"Geo-tagging complete: {stats}")
+        return stats
+
+    def _untagged_articles_query(self, columns: str) -> str:
+        return (
+            f"SELECT {columns} FROM articles a LEFT JOIN geo_tags g ON g.article_id = a.id "
+            "WHERE g.article_id IS NULL AND a.duplicate_of IS NULL AND a.id > ?"
+        )
+
+    def count_untagged_articles(self, after_id: int = 0) -> int:
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT id, content FROM articles")
-            articles = cursor.fetchall()
-            logger.debug(f"Found {len(articles)} articles for geo-tagging.")
-            info_logger.info(f"Found {len(articles)} articles for geo-tagging.")
-            processed_since_commit = 0
-            for idx, (article_id, content) in enumerate(articles, 1):
-                cursor.execute("SELECT COUNT(*) FROM geo_tags WHERE article_id = ?", (article_id,))
-                if cursor.fetchone()[0] == 0:
-                    logger.debug(f"Geo-tagging article {article_id}")
-                    info_logger.info(f"Geo-tagging article {article_id}")
-                    # Try to get title and summary if available (for better geo coverage)
-                    cursor2 = conn.cursor()
-                    cursor2.execute("SELECT title, summary FROM articles WHERE id = ?", (article_id,))
-                    row = cursor2.fetchone()
-                    title = row[0] if row else None
-                    summary = row[1] if row else None
-                    tags = nlp_processor.extract_geo_tags(content or "", title=title, summary=summary, db_manager=self, not_found_callback=not_found_callback)
-                    logger.debug(f"Extracted tags for article {article_id}: {tags}")
-                    info_logger.info(f"Extracted tags for article {article_id}: {tags}")
-                    for tag in tags:
-                        logger.debug(f"Inserting geo-tag for article {article_id}: {tag}")
-                        info_logger.info(f"Inserting geo-tag for article {article_id}: {tag}")
-                        cursor.execute(
-                            "INSERT INTO geo_tags (article_id, tag, confidence, source, lat, lon) VALUES (?, ?, ?, ?, ?, ?)",
-                            (article_id, tag.get('tag'), tag.get('confidence'), tag.get('label'), tag.get('lat'), tag.get('lon'))
-                        )
-                    processed_since_commit += 1
-                    if processed_since_commit >= 10:
-                        conn.commit()
-                        logger.debug(f"Committed geo-tag inserts after {processed_since_commit} articles.")
-                        info_logger.info(f"Committed geo-tag inserts after {processed_since_commit} articles.")
-                        processed_since_commit = 0
-            # Commit any remaining uncommitted changes
-            if processed_since_commit > 0:
+            cursor.execute(self._untagged_articles_query("COUNT(*)"), (after_id,))
+            return cursor.fetchone()[0]
+
+    def get_untagged_articles(self, after_id: int = 0, limit: int = 100) -> List[Dict]:
+        """Next ``limit`` articles without geo-tags with an id above ``after_id`` (keyset pagination)."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                self._untagged_articles_query("a.id, a.title, a.summary, a.content") + " ORDER BY a.id LIMIT ?",
+                (after_id, limit)
+            )
+            return [dict(row) for row in cursor.fetchall()]
+
+    def save_geo_tag_chunk(self, results: List[Tuple[int, List[Dict]]], checkpoint_name: str, last_id: int, processed: int) -> int:
+        """Insert the tags of a chunk of articles and advance the job checkpoint in one transaction."""
+        rows = [
+            (article_id, tag.get('tag'), tag.get('confidence'), tag.get('label'), tag.get('lat'), tag.get('lon'))
+            for article_id, tags in results for tag in tags
+        ]
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                "INSERT INTO geo_tags (article_id, tag, confidence, source, lat, lon) VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            cursor.execute(
+                "INSERT OR REPLACE INTO bulk_job_checkpoints (name, last_id, processed, updated_at) VALUES (?, ?, ?, ?)",
+                (checkpoint_name, last_id, processed, datetime.now(timezone.utc))
+            )
+            conn.commit()
+        return len(rows)
+
+    def init_bulk_job_checkpoints_table(self):
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS bulk_job_checkpoints (
+                    name TEXT PRIMARY KEY,
+                    last_id INTEGER NOT NULL,
+                    processed INTEGER NOT NULL DEFAULT 0,
+                    updated_at TIMESTAMP
+                )
+            ''')
+            conn.commit()
+
+    def get_bulk_job_checkpoint(self, name: str) -> Optional[Dict]:
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT name, last_id, processed, updated_at FROM bulk_job_checkpoints WHERE name = ?", (name,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
+
+    def clear_bulk_job_checkpoint(self, name: str):
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM bulk_job_checkpoints WHERE name = ?", (name,))
+            conn.commit()
+
+    def init_geo_tags_rtree(self):
+        """R*Tree over geo-tag coordinates, kept in sync with ``geo_tags`` by triggers.
+
+        Falls back to a plain (lat, lon) index if SQLite was built without R*Tree.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'geo_tags_rtree'")
+            exists = cursor.fetchone() is not None
+            try:
+                cursor.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS geo_tags_rtree USING rtree(id, min_lat, max_lat, min_lon, max_lon)"
+                )
+            except sqlite3.OperationalError as exc:
+                logging.getLogger(__name__).warning(f"R*Tree unavailable, using a lat/lon index instead: {exc}")
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_geo_tags_lat_lon ON geo_tags (lat, lon)")
                 conn.commit()
-                logger.debug(f"Committed geo-tag inserts after final batch of {processed_since_commit} articles.")
-                info_logger.info(f"Committed geo-tag inserts after final batch of {processed_since_commit} articles.")
+                self.geo_rtree = False
+                return
+            cursor.executescript('''
+                CREATE TRIGGER IF NOT EXISTS geo_tags_rtree_insert AFTER INSERT ON geo_tags
+                WHEN NEW.lat IS NOT NULL AND NEW.lon IS NOT NULL
+                BEGIN
+                    INSERT OR REPLACE INTO geo_tags_rtree VALUES (NEW.id, NEW.lat, NEW.lat, NEW.lon, NEW.lon);
+                END;
+                CREATE TRIGGER IF NOT EXISTS geo_tags_rtree_delete AFTER DELETE ON geo_tags
+                BEGIN
+                    DELETE FROM geo_tags_rtree WHERE id = OLD.id;
+                END;
+                CREATE TRIGGER IF NOT EXISTS geo_tags_rtree_update AFTER UPDATE OF lat, lon ON geo_tags
+                BEGIN
+                    DELETE FROM geo_tags_rtree WHERE id = OLD.id;
+                    INSERT INTO geo_tags_rtree SELECT NEW.id, NEW.lat, NEW.lat, NEW.lon, NEW.lon
+                    WHERE NEW.lat IS NOT NULL AND NEW.lon IS NOT NULL;
+                END;
+            ''')
+            if not exists:
+                # Index geo-tags stored before the R*Tree existed
+                cursor.execute(
+                    "INSERT INTO geo_tags_rtree SELECT id, lat, lat, lon, lon FROM geo_tags "
+                    "WHERE lat IS NOT NULL AND lon IS NOT NULL"
+                )
+            conn.commit()
+            self.geo_rtree = True
+
+    def get_geo_tag_cells(self, boxes, cell_size: float, start_day: Optional[str] = None,
+                          end_day: Optional[str] = None) -> List[Tuple]:
+        """Raw geo-tags inside ``boxes`` bucketed into a ``cell_size``-degree grid.
+
+        Returns ``(cell_y, cell_x, tag, weight, lat_sum, lon_sum)`` per cell and tag.
+        Excluded tags are skipped; ``start_day``/``end_day`` (``YYYY-MM-DD``, inclusive)
+        limit by the day the tag is counted under (its article's day when it was written).
+        """
+        if self.geo_rtree:
+            source = "geo_tags_rtree r JOIN geo_tags g ON g.id = r.id"
+            box_sql = "(r.min_lat <= ? AND r.max_lat >= ? AND r.min_lon <= ? AND r.max_lon >= ?)"
+        else:
+            source = "geo_tags g"
+            box_sql = "(g.lat <= ? AND g.lat >= ? AND g.lon <= ? AND g.lon >= ?)"
+        conditions = ['(' + ' OR '.join([box_sql] * len(boxes)) + ')']
+        params: List = [cell_size, cell_size]
+        for box in boxes:
+            params.extend((box.north, box.south, box.east, box.west))
+        excluded = self.get_excluded_tags()
+        if excluded:
+            conditions.append(f"g.tag NOT IN ({','.join('?' * len(excluded))})")
+            params.extend(excluded)
+        if start_day or end_day:
+            conditions.append("g.day BETWEEN ? AND ?")
+            params.extend((start_day or '0000-00-00', end_day or '9999-99-99'))
+        query = (
+            "SELECT CAST((g.lat + 90.0) / ? AS INTEGER) AS cell_y, CAST((g.lon + 180.0) / ? AS INTEGER) AS cell_x, "
+            f"g.tag, COUNT(*), SUM(g.lat), SUM(g.lon) FROM {source} WHERE {' AND '.join(conditions)} "
+            "GROUP BY cell_y, cell_x, g.tag"
+        )
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return [tuple(row) for row in cursor.fetchall()]
+
+    # Day a geo-tag is counted under in the rollups: its article's publication (or fetch) day,
+    # stored on the geo_tags row when it is written so later date changes cannot strand it
+    _ARTICLE_DAY_SQL = "substr(COALESCE(a.published_date, a.fetched_at), 1, 10)"
+
+    def init_geo_rollup_tables(self):
+        """Per-day rollups of ``geo_tags``, maintained by triggers.
+
+        ``geo_tag_daily`` counts mentions per tag and day; ``geo_cell_daily`` holds the
+        weight and coordinate sums per grid cell, day and tag at every rollup level. Rows
+        are keyed by ``geo_tags.day``, set from the article's day on insert, so a re-parse
+        that changes ``published_date`` or deleting the article first cannot unbalance them.
+        """
+        levels = [(level, cell_size_for_zoom(level)) for level in ROLLUP_LEVELS]
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executescript('''
+                CREATE TABLE IF NOT EXISTS geo_tag_daily (
+                    tag TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    mentions INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (tag, day)
+                );
+                CREATE INDEX IF NOT EXISTS idx_geo_tag_daily_day ON geo_tag_daily (day);
+                CREATE TABLE IF NOT EXISTS geo_cell_daily (
+                    level INTEGER NOT NULL,
+                    day TEXT NOT NULL,
+                    cell_y INTEGER NOT NULL,
+                    cell_x INTEGER NOT NULL,
+                    tag TEXT NOT NULL,
+                    weight INTEGER NOT NULL DEFAULT 0,
+                    lat_sum REAL NOT NULL DEFAULT 0,
+                    lon_sum REAL NOT NULL DEFAULT 0,
+                    PRIMARY KEY (level, day, cell_y, cell_x, tag)
+                );
+                CREATE INDEX IF NOT EXISTS idx_geo_cell_daily_cell ON geo_cell_daily (level, cell_y, cell_x);
+                CREATE TABLE IF NOT EXISTS geo_rollup_levels (
+                    level INTEGER PRIMARY KEY,
+                    cell_size REAL NOT NULL
+                );
+            ''')
+            cursor.execute("PRAGMA table_info(geo_tags)")
+            if 'day' not in [row[1] for row in cursor.fetchall()]:
+                cursor.execute("ALTER TABLE geo_tags ADD COLUMN day TEXT")
+            cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'geo_rollup_delete'")
+            row = cursor.fetchone()
+            triggers_current = row is not None and 'OLD.day' in row[0]
+            cursor.execute("SELECT level, cell_size FROM geo_rollup_levels ORDER BY level")
+            if [tuple(row) for row in cursor.fetchall()] == levels and triggers_current:
+                return
+            # New database, the rollup grid changed or geo_tags.day is new: (re)build from geo_tags
+            cursor.execute("DELETE FROM geo_rollup_levels")
+            cursor.executemany("INSERT INTO geo_rollup_levels (level, cell_size) VALUES (?, ?)", levels)
+            day_of_new = f"COALESCE((SELECT {self._ARTICLE_DAY_SQL} FROM articles a WHERE a.id = NEW.article_id), date('now'))"
+            day_of_old = "OLD.day"
+            # CROSS JOIN keeps geo_rollup_levels as the outer loop: one primary-key lookup per level
+            old_cell = (
+                f"rowid IN (SELECT c.rowid FROM geo_rollup_levels l CROSS JOIN geo_cell_daily c "
+                f"ON c.level = l.level AND c.day = {day_of_old} "
+                f"AND c.cell_y = CAST((OLD.lat + 90.0) / l.cell_size AS INTEGER) "
+                f"AND c.cell_x = CAST((OLD.lon + 180.0) / l.cell_size AS INTEGER) AND c.tag = OLD.tag "
+                f"WHERE OLD.lat IS NOT NULL AND OLD.lon IS NOT NULL)"
+            )
+            cursor.execute("DROP TRIGGER IF EXISTS geo_rollup_insert")
+            cursor.execute("DROP TRIGGER IF EXISTS geo_rollup_delete")
+            cursor.execute(f'''
+                CREATE TRIGGER geo_rollup_insert AFTER INSERT ON geo_tags
+                BEGIN
+                    UPDATE geo_tags SET day = {day_of_new} WHERE id = NEW.id;
+                    INSERT INTO geo_tag_daily (tag, day, mentions) SELECT NEW.tag, {day_of_new}, 1 WHERE 1
+                    ON CONFLICT (tag, day) DO UPDATE SET mentions = mentions + 1;
+                    INSERT INTO geo_cell_daily (level, day, cell_y, cell_x, tag, weight, lat_sum, lon_sum)
+                    SELECT l.level, {day_of_new}, CAST((NEW.lat + 90.0) / l.cell_size AS INTEGER),
+                           CAST((NEW.lon + 180.0) / l.cell_size AS INTEGER), NEW.tag, 1, NEW.lat, NEW.lon
+                    FROM geo_rollup_levels l WHERE NEW.lat IS NOT NULL AND NEW.lon IS NOT NULL
+                    ON CONFLICT (level, day, cell_y, cell_x, tag) DO UPDATE SET
+                        weight = weight + 1, lat_sum = lat_sum + excluded.lat_sum, lon_sum = lon_sum + excluded.lon_sum;
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER geo_rollup_delete AFTER DELETE ON geo_tags
+                BEGIN
+                    UPDATE geo_tag_daily SET mentions = mentions - 1 WHERE tag = OLD.tag AND day = {day_of_old};
+                    DELETE FROM geo_tag_daily WHERE tag = OLD.tag AND day = {day_of_old} AND mentions <= 0;
+                    UPDATE geo_cell_daily SET weight = weight - 1, lat_sum = lat_sum - OLD.lat, lon_sum = lon_sum - OLD.lon
+                    WHERE {old_cell};
+                    DELETE FROM geo_cell_daily WHERE {old_cell} AND weight <= 0;
+                END
+            ''')
+            self._rebuild_geo_rollups(cursor)
+            conn.commit()
+
+    def _rebuild_geo_rollups(self, cursor):
+        cursor.execute("DELETE FROM geo_tag_daily")
+        cursor.execute("DELETE FROM geo_cell_daily")
+        cursor.execute(
+            f"UPDATE geo_tags SET day = COALESCE((SELECT {self._ARTICLE_DAY_SQL} FROM articles a "
+            f"WHERE a.id = geo_tags.article_id), date('now')) WHERE day IS NULL"
+        )
+        cursor.execute(
+            "INSERT INTO geo_tag_daily (tag, day, mentions) "
+            "SELECT tag, day, COUNT(*) FROM geo_tags GROUP BY 1, 2"
+        )
+        cursor.execute(
+            "INSERT INTO geo_cell_daily (level, day, cell_y, cell_x, tag, weight, lat_sum, lon_sum) "
+            "SELECT l.level, g.day, CAST((g.lat + 90.0) / l.cell_size AS INTEGER), "
+            "CAST((g.lon + 180.0) / l.cell_size AS INTEGER), g.tag, COUNT(*), SUM(g.lat), SUM(g.lon) "
+            "FROM geo_tags g CROSS JOIN geo_rollup_levels l "
+            "WHERE g.lat IS NOT NULL AND g.lon IS NOT NULL GROUP BY 1, 2, 3, 4, 5"
+        )
+
+    def rebuild_geo_rollups(self):
+        """Recompute the heat-map rollups from ``geo_tags`` (after bulk edits outside this class)."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            self._rebuild_geo_rollups(cursor)
+            conn.commit()
 
-        # After main transaction, write geo_tag_not_found tags
-        if not_found_tags:
-            logger.info(f"Writing {len(not_found_tags)} geo_tag_not_found tags after geo-tagging batch.")
-            self._bulk_add_geo_tag_not_found(not_found_tags)
+    def get_geo_rollup_cells(self, level: int, boxes, start_day: Optional[str] = None,
+                             end_day: Optional[str] = None) -> List[Tuple]:
+        """Like ``get_geo_tag_cells``, but read from the rollup grid of ``level``."""
+        cell_size = cell_size_for_zoom(level)
+        box_sql = "(cell_y BETWEEN ? AND ? AND cell_x BETWEEN ? AND ?)"
+        conditions = ["level = ?", '(' + ' OR '.join([box_sql] * len(boxes)) + ')']
+        params: List = [level]
+        for box in boxes:
+            params.extend(cell_range(box, cell_size))
+        if start_day or end_day:
+            conditions.append("day BETWEEN ? AND ?")
+            params.extend((start_day or '0000-00-00', end_day or '9999-99-99'))
+        excluded = self.get_excluded_tags()
+        if excluded:
+            conditions.append(f"tag NOT IN ({','.join('?' * len(excluded))})")
+            params.extend(excluded)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT cell_y, cell_x, tag, SUM(weight), SUM(lat_sum), SUM(lon_sum) FROM geo_cell_daily "
+                f"WHERE {' AND '.join(conditions)} GROUP BY cell_y, cell_x, tag",
+                params
+            )
+            return [tuple(row) for row in cursor.fetchall()]
+
+    def get_geo_timeline(self) -> List[Dict]:
+        """Geo-tag mentions per day (excluded tags left out), oldest first."""
+        excluded = self.get_excluded_tags()
+        where = f"WHERE tag NOT IN ({','.join('?' * len(excluded))})" if excluded else ""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT day, SUM(mentions) FROM geo_tag_daily {where} GROUP BY day ORDER BY day", excluded)
+            return [{'day': row[0], 'mentions': row[1]} for row in cursor.fetchall()]
+
+    def init_jobs_table(self):
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'queued',
+                    progress INTEGER NOT NULL DEFAULT 0,
+                    total INTEGER,
+                    message TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_by INTEGER,
+                    owner TEXT,
+                    cancel_requested INTEGER NOT NULL DEFAULT 0,
+                    created_at TIMESTAMP,
+                    started_at TIMESTAMP,
+                    finished_at TIMESTAMP
+                )
+            ''')
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status)")
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_jobs_one_active'")
+            if cursor.fetchone() is None:
+                # Older databases may hold several active jobs of a kind; keep the newest
+                cursor.execute(
+                    "UPDATE jobs SET status = 'failed', error = 'Superseded by a newer job of the same kind', "
+                    "finished_at = ? WHERE status IN ('queued', 'running') AND id NOT IN ("
+                    "SELECT MAX(id) FROM jobs WHERE status IN ('queued', 'running') "
+                    "GROUP BY kind, IFNULL(created_by, 0))",
+                    (datetime.now(timezone.utc),)
+                )
+                # At most one queued/running job per kind and user, across threads and processes
+                cursor.execute(
+                    "CREATE UNIQUE INDEX idx_jobs_one_active ON jobs(kind, IFNULL(created_by, 0)) "
+                    "WHERE status IN ('queued', 'running')"
+                )
+            conn.commit()
+
+    _JOB_COLUMNS = ('id', 'kind', 'status', 'progress', 'total', 'message', 'result', 'error', 'created_by',
+                    'owner', 'cancel_requested', 'created_at', 'started_at', 'finished_at')
+
+    def _job_from_row(self, row) -> Dict:
+        job = dict(row)
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        job['cancel_requested'] = bool(job['cancel_requested'])
+        return job
+
+    def create_job(self, kind: str, created_by: Optional[int] = None, owner: Optional[str] = None) -> Optional[int]:
+        """Queue a job; returns None if ``created_by`` already has an active job of ``kind``."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "INSERT INTO jobs (kind, status, created_by, owner, created_at) VALUES (?, 'queued', ?, ?, ?) "
+                "ON CONFLICT DO NOTHING",
+                (kind, created_by, owner, datetime.now(timezone.utc))
+            )
+            conn.commit()
+            return cursor.lastrowid if cursor.rowcount else None
+
+    def get_job(self, job_id: int) -> Optional[Dict]:
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT {', '.join(self._JOB_COLUMNS)} FROM jobs WHERE id = ?", (job_id,))
+            row = cursor.fetchone()
+            return self._job_from_row(row) if row else None
+
+    def get_jobs(self, limit: Optional[int] = None, statuses: Optional[Tuple[str, ...]] = None) -> List[Dict]:
+        """Most recent jobs first, optionally only those in ``statuses``."""
+        query = f"SELECT {', '.join(self._JOB_COLUMNS)} FROM jobs"
+        params: List = []
+        if statuses:
+            query += f" WHERE status IN ({','.join('?' * len(statuses))})"
+            params.extend(statuses)
+        query += " ORDER BY id DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return [self._job_from_row(row) for row in cursor.fetchall()]
+
+    def get_active_job(self, kind: str, created_by: Optional[int] = None) -> Optional[Dict]:
+        """The queued or running job of ``kind`` started by ``created_by``, if any."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT {', '.join(self._JOB_COLUMNS)} FROM jobs WHERE kind = ? AND created_by IS ? "
+                "AND status IN ('queued', 'running') ORDER BY id DESC LIMIT 1",
+                (kind, created_by)
+            )
+            row = cursor.fetchone()
+            return self._job_from_row(row) if row else None
+
+    def update_job(self, job_id: int, **fields):
+        """Update progress fields (``progress``, ``total``, ``message``) of a job."""
+        allowed = {key: value for key, value in fields.items() if key in ('progress', 'total', 'message')}
+        if not allowed:
+            return
+        assignments = ', '.join(f"{key} = ?" for key in allowed)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*allowed.values(), job_id))
+            conn.commit()
+
+    def start_job(self, job_id: int):
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "UPDATE jobs SET status = 'running', started_at = ? WHERE id = ?",
+                (datetime.now(timezone.utc), job_id)
+            )
+            conn.commit()
+
+    def finish_job(self, job_id: int, status: str, result: Optional[Dict] = None,
+                   error: Optional[str] = None, message: Optional[str] = None):
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, message = COALESCE(?, message), finished_at = ? "
+                "WHERE id = ?",
+                (status, json.dumps(result) if result is not None else None, error, message,
+                 datetime.now(timezone.utc), job_id)
+            )
+            conn.commit()
+
+    def request_job_cancel(self, job_id: int) -> bool:
+        """Flag a queued or running job for cancellation; False if it is not active."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status IN ('queued', 'running')",
+                (job_id,)
+            )
+            conn.commit()
+            return cursor.rowcount > 0
+
+    def is_job_cancel_requested(self, job_id: int) -> bool:
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,))
+            row = cursor.fetchone()
+            return bool(row and row[0])
 
     def _bulk_add_geo_tag_not_found(self, tags):
         with self.get_connection() as conn:
             cursor = conn.cursor()
             for tag in tags:
                 cursor.execute('INSERT OR IGNORE INTO geo_tag_not_found (tag) VALUES (?)', (tag.lower(),))
+            self._bump_lookup_version(cursor, 'geo_tag_not_found')
             conn.commit()
     def update_user_email(self, user_id: int, new_email: str):
         """Update a user's email address"""
@@ -231,16 +1044,21 @@ class DatabaseManager:
                         (user_id, article_id, score)
                     )
             conn.commit()
-    def set_user_article_score(self, user_id: int, article_id: int, score: float):
-        """Set or update a user's score for an article"""
+    def set_user_article_score(self, user_id: int, article_id: int, score: float,
+                               matched_words: Optional[Dict[str, int]] = None):
+        """Set or update a user's score for an article (and the matched-word counts behind it)"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "INSERT OR REPLACE INTO user_article_scores (user_id, article_id, score) VALUES (?, ?, ?)",
-                (user_id, article_id, score)
+                "INSERT OR REPLACE INTO user_article_scores (user_id, article_id, score, matched_words) VALUES (?, ?, ?, ?)",
+                (user_id, article_id, score, self._encode_matched_words(matched_words))
             )
             conn.commit()
 
+    @staticmethod
+    def _encode_matched_words(matched_words: Optional[Dict[str, int]]) -> Optional[str]:
+        return json.dumps(matched_words, ensure_ascii=False, separators=(',', ':')) if matched_words is not None else None
+
     def get_user_article_score(self, user_id: int, article_id: int) -> Optional[float]:
         """Get a user's score for an article, or None if not set"""
         with self.get_connection() as conn:
@@ -348,10 +1166,24 @@ class DatabaseManager:
 
         self.db_path = resolved_db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lookup_lock = threading.Lock()
+        self._lookup_cache: Dict[str, Tuple] = {}
+        self._not_found_set: Tuple = (None, frozenset())
         self.init_database()
+        self.init_lookup_versions_table()
+        self.init_change_tracking()
+        self.init_geo_tags_rtree()
+        self.init_geo_rollup_tables()
+        self.init_ingest_events_table()
         self.init_word_table()
         self.init_geo_tag_not_found_table()
+        self.init_geo_cache_table()
         self.init_excluded_tags_table()
+        self.init_raw_pages_table()
+        self.init_source_fetch_state_table()
+        self.init_source_health_table()
+        self.init_bulk_job_checkpoints_table()
+        self.init_jobs_table()
         # Migrate global scores to per-user if needed
         self.migrate_global_scores_to_user_scores()
 
@@ -453,6 +1285,8 @@ class DatabaseManager:
                 FOREIGN KEY (article_id) REFERENCES articles (id)
             )
         ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_geo_tags_article_id ON geo_tags (article_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_geo_tags_tag ON geo_tags (tag)")
         # --- MIGRATION: Ensure lat/lon columns exist ---
         cursor.execute("PRAGMA table_info(geo_tags)")
         geo_columns = [row[1] for row in cursor.fetchall()]
@@ -461,6 +1295,56 @@ class DatabaseManager:
         if 'lon' not in geo_columns:
             cursor.execute("ALTER TABLE geo_tags ADD COLUMN lon REAL")
 
+        # --- MIGRATION: near-duplicate marker on articles ---
+        cursor.execute("PRAGMA table_info(articles)")
+        article_columns = [row[1] for row in cursor.fetchall()]
+        if 'duplicate_of' not in article_columns:
+            cursor.execute("ALTER TABLE articles ADD COLUMN duplicate_of INTEGER")
+
+        # --- MIGRATION: matched score-word counts persisted by the scorer ---
+        if 'matched_words' not in article_columns:
+            cursor.execute("ALTER TABLE articles ADD COLUMN matched_words TEXT")
+        cursor.execute("PRAGMA table_info(user_article_scores)")
+        if 'matched_words' not in [row[1] for row in cursor.fetchall()]:
+            cursor.execute("ALTER TABLE user_article_scores ADD COLUMN matched_words TEXT")
+
+        # --- MIGRATION: canonical URL used for dedupe across URL variants ---
+        if 'canonical_url' not in article_columns:
+            cursor.execute("ALTER TABLE articles ADD COLUMN canonical_url TEXT")
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_articles_canonical_url'")
+        if cursor.fetchone() is None:
+            # Build the index first (NULLs never collide), then backfill: the first article
+            # owns a canonical URL, later variants keep NULL and are marked duplicates of it
+            cursor.execute("UPDATE articles SET canonical_url = NULL")
+            cursor.execute("CREATE UNIQUE INDEX idx_articles_canonical_url ON articles (canonical_url)")
+            cursor.execute("SELECT id, url FROM articles ORDER BY id")
+            for article_id, url in cursor.fetchall():
+                canonical = canonicalize_url(url)
+                cursor.execute("SELECT id FROM articles WHERE canonical_url = ?", (canonical,))
+                owner = cursor.fetchone()
+                if owner is None:
+                    cursor.execute("UPDATE articles SET canonical_url = ? WHERE id = ?", (canonical, article_id))
+                else:
+                    cursor.execute(
+                        "UPDATE articles SET duplicate_of = ? WHERE id = ? AND duplicate_of IS NULL",
+                        (owner[0], article_id)
+                    )
+
+        # SimHash fingerprints, banded for indexed near-duplicate lookup
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS article_fingerprints (
+                article_id INTEGER PRIMARY KEY,
+                simhash INTEGER NOT NULL,
+                band0 INTEGER NOT NULL,
+                band1 INTEGER NOT NULL,
+                band2 INTEGER NOT NULL,
+                band3 INTEGER NOT NULL,
+                FOREIGN KEY (article_id) REFERENCES articles (id)
+            )
+        ''')
+        for band in range(4):
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_fingerprints_band{band} ON article_fingerprints (band{band})")
+
         # Default scoring criteria for new users (removed hardcoded user_id)
         # This will be handled in create_user method
         pass
@@ -571,8 +1455,8 @@ class DatabaseManager:
             conn.commit()
 
     # Article management methods
-    def save_article(self, title: str, content: str, summary: str, url: str, source: str, published_date: Optional[datetime] = None, thumbnail_url: Optional[str] = None) -> int:
-        """Save an article to database, including thumbnail_url"""
+    def save_article(self, title: str, content: str, summary: str, url: str, source: str, published_date: Optional[datetime] = None, thumbnail_url: Optional[str] = None, canonical_url: Optional[str] = None) -> int:
+        """Save an article to database, including thumbnail_url. canonical_url defaults to the canonical form of url."""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             # Add thumbnail_url column if not exists
@@ -580,33 +1464,65 @@ class DatabaseManager:
             columns = [row[1] for row in cursor.fetchall()]
             if 'thumbnail_url' not in columns:
                 cursor.execute("ALTER TABLE articles ADD COLUMN thumbnail_url TEXT")
+            canonical_url = canonical_url or canonicalize_url(url)
+            # Never REPLACE: that would delete the stored row (and orphan its geo-tags and scores)
             cursor.execute(
-                "INSERT OR REPLACE INTO articles (title, content, summary, url, source, published_date, thumbnail_url) VALUES (?, ?, ?, ?, ?, ?, ?)",
-                (title, content, summary, url, source, published_date, thumbnail_url)
+                "INSERT INTO articles (title, content, summary, url, source, published_date, thumbnail_url, canonical_url) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT DO NOTHING",
+                (title, content, summary, url, source, published_date, thumbnail_url, canonical_url)
             )
             conn.commit()
-            return cursor.lastrowid
+            if cursor.rowcount:
+                return cursor.lastrowid
+            cursor.execute(
+                "SELECT id FROM articles WHERE url = ? OR canonical_url = ? ORDER BY id LIMIT 1",
+                (url, canonical_url)
+            )
+            return cursor.fetchone()[0]
 
-    def get_articles(self, limit: int = 50, offset: int = 0, user_id: Optional[int] = None) -> List[Dict]:
-        """Get articles sorted by user score (if user_id), else global score, including thumbnail_url. Excludes articles with only excluded geo-tags."""
-        excluded = set(self.get_excluded_tags())
+    def article_exists(self, url: str, canonical_url: Optional[str] = None) -> Optional[int]:
+        """Return the id of an article stored under ``url`` or its canonical form, if any."""
+        canonical_url = canonical_url or canonicalize_url(url)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT id FROM articles WHERE url = ? OR canonical_url = ? LIMIT 1",
+                (url, canonical_url)
+            )
+            row = cursor.fetchone()
+            return row[0] if row else None
+
+    def get_articles(self, limit: int = 50, offset: int = 0, user_id: Optional[int] = None,
+                     include_content: bool = True) -> List[Dict]:
+        """Get articles sorted by user score (if user_id), else global score, including thumbnail_url. Excludes articles with only excluded geo-tags.
+
+        ``word_matches`` holds the score-word counts stored with the score (None if not scored
+        since they were introduced); ``include_content=False`` leaves the article body out.
+        """
+        excluded = self.get_excluded_tag_set()
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("PRAGMA table_info(articles)")
             columns = [row[1] for row in cursor.fetchall()]
             has_thumbnail = 'thumbnail_url' in columns
-            select_cols = "a.id, a.title, a.content, a.summary, a.url, a.source, a.published_date, a.fetched_at, "
+            content_col = "a.content" if include_content else "NULL AS content"
+            select_cols = f"a.id, a.title, {content_col}, a.summary, a.url, a.source, a.published_date, a.fetched_at, "
             if user_id is not None:
                 select_cols += "COALESCE(uas.score, a.score) AS score"
             else:
                 select_cols += "a.score"
             if has_thumbnail:
                 select_cols += ", a.thumbnail_url"
+            if user_id is not None:
+                select_cols += ", COALESCE(uas.matched_words, a.matched_words) AS word_matches"
+            else:
+                select_cols += ", a.matched_words AS word_matches"
             if user_id is not None:
                 query = f"""
                     SELECT {select_cols}
                     FROM articles a
                     LEFT JOIN user_article_scores uas ON a.id = uas.article_id AND uas.user_id = ?
+                    WHERE a.duplicate_of IS NULL
                     ORDER BY a.published_date DESC, score DESC
                     LIMIT ? OFFSET ?
                 """
@@ -615,6 +1531,7 @@ class DatabaseManager:
                 query = f"""
                     SELECT {select_cols}
                     FROM articles a
+                    WHERE a.duplicate_of IS NULL
                     ORDER BY a.published_date DESC, a.score DESC
                     LIMIT ? OFFSET ?
                 """
@@ -644,6 +1561,7 @@ class DatabaseManager:
                 }
                 if has_thumbnail:
                     article['thumbnail_url'] = row[9]
+                article['word_matches'] = json.loads(row['word_matches']) if row['word_matches'] else None
                 # Exclude articles with only excluded geo-tags (if any geo-tags)
                 cursor2 = conn.cursor()
                 cursor2.execute("SELECT tag FROM geo_tags WHERE article_id = ?", (article['id'],))
@@ -653,9 +1571,73 @@ class DatabaseManager:
                 articles.append(article)
             return articles
 
+    # Article fields the JSON feed can return, by column ('geo_tags' is loaded separately)
+    FEED_COLUMNS = {
+        'id': 'a.id', 'title': 'a.title', 'summary': 'a.summary', 'content': 'a.content', 'url': 'a.url',
+        'source': 'a.source', 'published_date': 'a.published_date', 'fetched_at': 'a.fetched_at',
+        'score': 'a.score', 'thumbnail_url': 'a.thumbnail_url',
+    }
+
+    def get_article_feed(self, fields, limit: int = 50, offset: int = 0, source: Optional[str] = None,
+                         tag: Optional[str] = None, article_id: Optional[int] = None) -> List[Dict]:
+        """Newest articles as dicts holding only ``fields`` (keys of ``FEED_COLUMNS`` plus 'geo_tags').
+
+        Duplicates and articles whose geo-tags are all excluded are left out, as in ``get_articles``.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("PRAGMA table_info(articles)")
+            columns = {row[1] for row in cursor.fetchall()}
+            select = ['a.id AS id']
+            for field in fields:
+                if field in self.FEED_COLUMNS and field != 'id':
+                    column = self.FEED_COLUMNS[field]
+                    select.append(f"{column if column[2:] in columns else 'NULL'} AS {field}")
+            conditions = ["a.duplicate_of IS NULL"]
+            params: List = []
+            excluded = self.get_excluded_tags()
+            if excluded:
+                conditions.append(
+                    "(NOT EXISTS (SELECT 1 FROM geo_tags g WHERE g.article_id = a.id) OR EXISTS ("
+                    f"SELECT 1 FROM geo_tags g WHERE g.article_id = a.id AND g.tag NOT IN ({','.join('?' * len(excluded))})))"
+                )
+                params.extend(excluded)
+            if article_id is not None:
+                conditions.append("a.id = ?")
+                params.append(article_id)
+            if source is not None:
+                conditions.append("a.source = ?")
+                params.append(source)
+            if tag is not None:
+                conditions.append("a.id IN (SELECT article_id FROM geo_tags WHERE tag = ?)")
+                params.append(tag)
+            cursor.execute(
+                f"SELECT {', '.join(select)} FROM articles a WHERE {' AND '.join(conditions)} "
+                "ORDER BY a.published_date DESC, a.id DESC LIMIT ? OFFSET ?",
+                (*params, limit, offset)
+            )
+            articles = [dict(row) for row in cursor.fetchall()]
+            if 'geo_tags' in fields and articles:
+                by_id = {article['id']: article for article in articles}
+                for article in articles:
+                    article['geo_tags'] = []
+                cursor.execute(
+                    f"SELECT article_id, tag, lat, lon FROM geo_tags WHERE article_id IN ({','.join('?' * len(by_id))}) "
+                    "ORDER BY id",
+                    list(by_id)
+                )
+                excluded_set = frozenset(excluded)
+                for owner_id, geo_tag, lat, lon in cursor.fetchall():
+                    if geo_tag not in excluded_set:
+                        by_id[owner_id]['geo_tags'].append({'tag': geo_tag, 'lat': lat, 'lon': lon})
+            if 'id' not in fields:
+                for article in articles:
+                    del article['id']
+            return articles
+
     def get_article_by_id(self, article_id: int, user_id: Optional[int] = None) -> Optional[Dict]:
         """Fetch a single article by its primary key, including per-user score if provided."""
-        excluded = set(self.get_excluded_tags())
+        excluded = self.get_excluded_tag_set()
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("PRAGMA table_info(articles)")
@@ -729,6 +1711,9 @@ class DatabaseManager:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM geo_tags WHERE article_id = ?", (article_id,))
             cursor.execute("DELETE FROM user_article_scores WHERE article_id = ?", (article_id,))
+            cursor.execute("DELETE FROM article_fingerprints WHERE article_id = ?", (article_id,))
+            # Duplicates of a deleted article become visible again
+            cursor.execute("UPDATE articles SET duplicate_of = NULL WHERE duplicate_of = ?", (article_id,))
             cursor.execute("DELETE FROM articles WHERE id = ?", (article_id,))
             deleted = cursor.rowcount
             conn.commit()
@@ -739,8 +1724,11 @@ class DatabaseManager:
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM geo_tags")
+            cursor.execute("DELETE FROM bulk_job_checkpoints WHERE name = ?", (GEO_CHECKPOINT_NAME,))
             cursor.execute("DELETE FROM user_article_scores")
             cursor.execute("DELETE FROM geo_tag_not_found")
+            self._bump_lookup_version(cursor, 'geo_tag_not_found')
+            cursor.execute("DELETE FROM article_fingerprints")
             cursor.execute("DELETE FROM articles")
             deleted_articles = cursor.rowcount
             conn.commit()
@@ -752,8 +1740,11 @@ class DatabaseManager:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM geo_tags")
             cleared = cursor.rowcount
+            # A fresh re-tag must not resume after an old checkpoint
+            cursor.execute("DELETE FROM bulk_job_checkpoints WHERE name = ?", (GEO_CHECKPOINT_NAME,))
             if reset_not_found:
                 cursor.execute("DELETE FROM geo_tag_not_found")
+                self._bump_lookup_version(cursor, 'geo_tag_not_found')
             conn.commit()
             return cleared
 
@@ -798,16 +1789,89 @@ class DatabaseManager:
                 })
             return stats
 
-    def update_article_score(self, article_id: int, score: float, user_id: Optional[int] = None):
-        """Update article score globally or for a specific user"""
+    def update_article_score(self, article_id: int, score: float, user_id: Optional[int] = None,
+                             matched_words: Optional[Dict[str, int]] = None):
+        """Update article score globally or for a specific user, with the matched-word counts behind it"""
         if user_id is not None:
-            self.set_user_article_score(user_id, article_id, score)
+            self.set_user_article_score(user_id, article_id, score, matched_words)
         else:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("UPDATE articles SET score = ? WHERE id = ?", (score, article_id))
+                cursor.execute(
+                    "UPDATE articles SET score = ?, matched_words = ? WHERE id = ?",
+                    (score, self._encode_matched_words(matched_words), article_id)
+                )
                 conn.commit()
 
+    def get_articles_missing_summary(self, limit: int = 500) -> List[Dict]:
+        """Return articles whose summary was deferred to the enrichment stage (summary still NULL)."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT id, title, content FROM articles WHERE summary IS NULL ORDER BY id DESC LIMIT ?",
+                (limit,)
+            )
+            return [{'id': row[0], 'title': row[1], 'content': row[2]} for row in cursor.fetchall()]
+
+    def update_article_summary(self, article_id: int, summary: str):
+        """Store a generated summary for an article"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("UPDATE articles SET summary = ? WHERE id = ?", (summary, article_id))
+            conn.commit()
+
+    def update_article_extraction(self, url: str, article: Dict) -> bool:
+        """Overwrite the extracted fields of an existing article (used by re-parsing)."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "UPDATE articles SET title = ?, content = ?, summary = COALESCE(?, summary), "
+                "published_date = COALESCE(?, published_date), thumbnail_url = COALESCE(?, thumbnail_url) WHERE url = ?",
+                (article['title'], article['content'], article.get('summary'), article.get('published_date'),
+                 article.get('thumbnail_url'), url)
+            )
+            conn.commit()
+            return cursor.rowcount > 0
+
+    def save_article_fingerprint(self, article_id: int, fingerprint: int):
+        """Store an article's SimHash fingerprint and its bands."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "INSERT OR REPLACE INTO article_fingerprints (article_id, simhash, band0, band1, band2, band3) VALUES (?, ?, ?, ?, ?, ?)",
+                (article_id, to_signed(fingerprint), *bands(fingerprint))
+            )
+            conn.commit()
+
+    def find_near_duplicate(self, fingerprint: int, max_distance: int = MAX_HAMMING_DISTANCE, exclude_id: Optional[int] = None) -> Optional[int]:
+        """Return the id of the closest non-duplicate article within ``max_distance`` bits, if any."""
+        b0, b1, b2, b3 = bands(fingerprint)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT f.article_id, f.simhash
+                FROM article_fingerprints f
+                JOIN articles a ON a.id = f.article_id
+                WHERE (f.band0 = ? OR f.band1 = ? OR f.band2 = ? OR f.band3 = ?)
+                  AND a.duplicate_of IS NULL AND f.article_id != ?
+                """,
+                (b0, b1, b2, b3, exclude_id if exclude_id is not None else -1)
+            )
+            best = None
+            for article_id, stored in cursor.fetchall():
+                distance = hamming_distance(fingerprint, from_signed(stored))
+                if distance <= max_distance and (best is None or distance < best[1]):
+                    best = (article_id, distance)
+            return best[0] if best else None
+
+    def mark_article_duplicate(self, article_id: int, duplicate_of: int):
+        """Flag an article as a near-duplicate so it is hidden and skipped by later stages."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("UPDATE articles SET duplicate_of = ? WHERE id = ?", (duplicate_of, article_id))
+            conn.commit()
+
     def get_article_count(self) -> int:
         """Get total number of articles"""
         with self.get_connection() as conn:
@@ -0,0 +1,71 @@
+"""Near-duplicate detection for ingested articles using 64-bit SimHash.
+
+Each article's title and body are shingled into overlapping word 3-grams and folded
+into a SimHash. Fingerprints are split into four 16-bit bands that are stored and
+indexed per article; any two fingerprints within ``MAX_HAMMING_DISTANCE`` (3) bits
+share at least one identical band, so candidate lookup is an indexed equality query
+rather than a scan of the archive.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from typing import List, Optional
+
+SHINGLE_SIZE = 3
+SIMHASH_BITS = 64
+BANDS = 4
+BAND_BITS = SIMHASH_BITS // BANDS
+MAX_HAMMING_DISTANCE = 3
+# Texts shorter than this many words give unstable fingerprints and are not deduplicated
+MIN_WORDS = 12
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+_MASK = (1 << SIMHASH_BITS) - 1
+
+
+def _shingles(text: str, size: int = SHINGLE_SIZE) -> List[str]:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < MIN_WORDS:
+        return []
+    return [' '.join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+
+def simhash(text: str) -> Optional[int]:
+    """Return the unsigned 64-bit SimHash of ``text``, or None if it is too short."""
+    shingles = _shingles(text or '')
+    if not shingles:
+        return None
+    weights = [0] * SIMHASH_BITS
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def article_fingerprint(title: Optional[str], content: Optional[str]) -> Optional[int]:
+    return simhash(f"{title or ''}\n{content or ''}")
+
+
+def bands(fingerprint: int) -> List[int]:
+    mask = (1 << BAND_BITS) - 1
+    return [(fingerprint >> (i * BAND_BITS)) & mask for i in range(BANDS)]
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin((a ^ b) & _MASK).count('1')
+
+
+def to_signed(fingerprint: int) -> int:
+    """SQLite integers are signed 64-bit; store fingerprints in that range."""
+    return fingerprint - (1 << SIMHASH_BITS) if fingerprint >= 1 << (SIMHASH_BITS - 1) else fingerprint
+
+
+def from_signed(value: int) -> int:
+    return value & _MASK
@@ -0,0 +1,118 @@
+"""Article field extraction shared by the fetch path and background enrichment."""
+
+from __future__ import annotations
+
+import logging
+import re
+from typing import Dict, Optional
+
+from .urls import find_canonical_link
+
+logger = logging.getLogger(__name__)
+
+# Extraction profiles, cheapest first:
+# - minimal:  parse only; summary from the page's meta description, anything else is
+#             filled in later by the enrichment stage.
+# - standard: parse only; missing summaries are generated inline from the first sentences.
+# - full:     also runs newspaper's article.nlp() (keywords + summary), the legacy behaviour.
+EXTRACTION_PROFILES = ('minimal', 'standard', 'full')
+DEFAULT_EXTRACTION_PROFILE = 'minimal'
+
+_IMG_SRC_RE = re.compile(r'<img[^>]+src=["\\\']([^"\\\']+)["\\\']', re.IGNORECASE)
+
+
+def resolve_profile(profile: Optional[str]) -> str:
+    """Return a known extraction profile name, falling back to the default."""
+    if profile and profile.lower() in EXTRACTION_PROFILES:
+        return profile.lower()
+    if profile:
+        logger.warning(f"Unknown extraction profile '{profile}', using '{DEFAULT_EXTRACTION_PROFILE}'")
+    return DEFAULT_EXTRACTION_PROFILE
+
+
+def simple_summary(content: str, max_sentences: int = 3) -> str:
+    """Generate a simple summary by taking first few sentences"""
+    if not content:
+        return ""
+
+    sentences = content.split('.')
+    summary_sentences = []
+
+    for sentence in sentences[:max_sentences]:
+        sentence = sentence.strip()
+        if sentence:
+            summary_sentences.append(sentence)
+
+    return '. '.join(summary_sentences) + ('.' if summary_sentences else '')
+
+
+def find_thumbnail(article) -> Optional[str]:
+    """Pick a thumbnail from data newspaper already collected during parse().
+
+    ``meta_img_url`` is the page's og:image and ``twitter:image`` comes from the parsed
+    meta tags, so no extra pass over the document is needed in the common case; the
+    first ``<img>`` in the HTML is the last resort.
+    """
+    meta_img = getattr(article, 'meta_img_url', None)
+    if meta_img:
+        return meta_img
+    twitter = (getattr(article, 'meta_data', None) or {}).get('twitter')
+    if isinstance(twitter, dict):
+        twitter_img = twitter.get('image')
+        if isinstance(twitter_img, dict):
+            twitter_img = twitter_img.get('src') or twitter_img.get('identifier')
+        if isinstance(twitter_img, str) and twitter_img.strip():
+            return twitter_img.strip()
+    top_image = getattr(article, 'top_image', None)
+    if top_image:
+        return top_image
+    html = getattr(article, 'html', None)
+    if html:
+        match = _IMG_SRC_RE.search(html)
+        if match:
+            return match.group(1)
+    return None
+
+
+def extract_article_data(article, url: str, profile: str = DEFAULT_EXTRACTION_PROFILE) -> Optional[Dict]:
+    """Build the article dict from a downloaded and parsed newspaper Article.
+
+    Returns None when the page has no title or body text.
+    """
+    profile = resolve_profile(profile)
+
+    if profile == 'full':
+        try:
+            article.nlp()
+        except Exception as e:
+            logger.debug(f"article.nlp() failed for {url}: {e}")
+
+    canonical_link = getattr(article, 'canonical_link', None) or find_canonical_link(getattr(article, 'html', None), url)
+
+    thumbnail_url = None
+    try:
+        thumbnail_url = find_thumbnail(article)
+    except Exception as e:
+        logger.debug(f"Failed to extract thumbnail for {url}: {e}")
+
+    # Skip if article has no content or title
+    if not article.title or not article.text:
+        return None
+
+    if profile == 'full':
+        summary = getattr(article, 'summary', None) or None
+    else:
+        summary = (getattr(article, 'meta_description', None) or '').strip() or None
+        if not summary and profile == 'standard':
+            summary = simple_summary(article.text) or None
+
+    return {
+        'title': article.title,
+        'content': article.text,
+        'url': url,
+        'canonical_link': canonical_link or None,
+        'published_date': article.publish_date,
+        'authors': article.authors,
+        'summary': summary,
+        'thumbnail_url': thumbnail_url
+    }
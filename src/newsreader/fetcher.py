@@ -1,15 +1,24 @@
 import json
 import logging
 import time
-from datetime import datetime
+from collections import deque
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 import newspaper
 from newspaper import Article
 
 from .database import DatabaseManager
+from .dedupe import article_fingerprint
+from .extraction import extract_article_data, resolve_profile, simple_summary
+from .parse_pool import default_parse_workers, get_parse_pool
+from .pipeline import IngestPipeline
+from .raw_archive import RawPageStore
 from .settings import get_settings
+from .thumbnails import get_thumbnail_cache
+from .source_health import SourceHealth, TransientError, retry_with_backoff
+from .urls import canonicalize_url
 
 SETTINGS = get_settings()
 
@@ -29,8 +38,37 @@ geo_fetcher_info_logger.setLevel(logging.INFO)
 class NewsFetcher:
     def __init__(self, db_manager: DatabaseManager, sources_file: Optional[str] = None):
         self.db = db_manager
-        self.sources_file = Path(sources_file).expanduser() if sources_file else SETTINGS.default_sources_path
+        self.sources_file = Path(sources_file).expanduser() if sources_file else get_settings().default_sources_path
         self.sources = self.load_sources()
+        self.extraction_profile = resolve_profile(self.config.get('extraction_profile'))
+        self.download_workers = max(1, int(self.config.get('download_workers', 4)))
+        self.parse_pool = get_parse_pool(
+            self.config.get('parse_workers', default_parse_workers()),
+            self.config.get('parse_queue_size')
+        )
+        # Resolved when the fetcher is built, so NEWSREADER_RAW_ARCHIVE_DIR/VAR_DIR set later still apply
+        self.raw_store = RawPageStore(get_settings().raw_archive_dir) if self.config.get('archive_raw_html') else None
+        # Politeness delays (seconds) between article downloads of one source and between sources
+        self.article_delay = float(self.config.get('article_delay_seconds', 1))
+        self.source_delay = float(self.config.get('source_delay_seconds', 2))
+        self.geo_tag_on_ingest = self.config.get('geo_tag_on_ingest', True)
+        # Articles per nlp.pipe pass in the geo-tag stage
+        self.geo_batch_size = max(1, int(self.config.get('geo_batch_size', 16)))
+        self.thumbnails = (
+            get_thumbnail_cache(int(self.config.get('thumbnail_cache_max_mb', 200)) * 1024 * 1024)
+            if self.config.get('cache_thumbnails', False) else None
+        )
+        # Failure handling: circuit breaker per source, retries for transient errors and
+        # a hard time budget per source and cycle
+        self.source_health = SourceHealth(self.db, self.config)
+        self.download_retries = max(0, int(self.config.get('download_retries', 2)))
+        self.retry_base_delay = float(self.config.get('retry_base_delay_seconds', 1.0))
+        self.source_time_budget = float(self.config.get('source_time_budget_seconds', 300))
+        # Per-article download+parse latencies of the most recent fetch_all_sources() run
+        self.article_latencies: List[float] = []
+        # Per-source outcome of the most recent run: 'complete', 'capped' (stopped at
+        # max_articles or the time budget, so more may be waiting) or 'failed'
+        self.source_outcomes: Dict[str, str] = {}
 
     def load_sources(self) -> List[Dict]:
         """Load news sources from configuration file"""
@@ -45,50 +83,99 @@ class NewsFetcher:
             return []
 
     def fetch_article_content(self, url: str) -> Optional[Dict]:
-        """Fetch and parse a single article, including thumbnail image with fallbacks"""
-        logger.debug(f"Fetching article content from {url}")
+        """Fetch and parse a single article using the configured extraction profile.
+
+        Only the ``full`` profile runs newspaper's costly ``article.nlp()``; the cheaper
+        profiles take the thumbnail from og:image and leave summaries to ``enrich_articles``.
+        """
+        logger.debug(f"Fetching article content from {url} (profile={self.extraction_profile})")
         try:
             article = Article(url)
             article.download()
+            self.archive_html(url, getattr(article, 'html', None))
             article.parse()
-
-            # Try to fetch the top image (thumbnail) with fallbacks
-            thumbnail_url = None
-            try:
-                article.nlp()  # This will extract summary and keywords, and sometimes image
-                if hasattr(article, 'top_image') and article.top_image:
-                    thumbnail_url = article.top_image
-                elif hasattr(article, 'meta_img_url') and article.meta_img_url:
-                    thumbnail_url = article.meta_img_url
-                # Fallback: parse first <img> from HTML if still no image
-                if not thumbnail_url and hasattr(article, 'html') and article.html:
-                    import re
-                    match = re.search(r'<img[^>]+src=["\\\']([^"\\\']+)["\\\']', article.html)
-                    if match:
-                        thumbnail_url = match.group(1)
-            except Exception as e:
-                logger.debug(f"Failed to extract thumbnail for {url}: {e}")
-
-            # Skip if article has no content or title
-            if not article.title or not article.text:
-                return None
-
-            return {
-                'title': article.title,
-                'content': article.text,
-                'url': url,
-                'published_date': article.publish_date,
-                'authors': article.authors,
-                'summary': article.summary if hasattr(article, 'summary') and article.summary else None,
-                'thumbnail_url': thumbnail_url
-            }
+            return extract_article_data(article, url, self.extraction_profile)
         except Exception as e:
             logger.warning(f"Failed to fetch article {url}: {e}")
             return None
 
 
-    def fetch_source_articles(self, source: Dict, max_articles: int = 10) -> List[Dict]:
-        """Fetch articles from a single news source, skipping already-saved articles and enforcing base URL match. Adds debug logging and skips non-article URLs."""
+    def download_article_html(self, url: str, deadline: Optional[float] = None) -> Optional[str]:
+        """Download stage: fetch the raw article HTML without parsing it.
+
+        Transient failures (timeouts, 5xx, 429) are retried with backoff, but never past
+        ``deadline`` (a ``time.monotonic()`` value).
+        """
+        def attempt() -> str:
+            article = Article(url)
+            article.download()
+            if not article.html:
+                raise RuntimeError(getattr(article, 'download_exception_msg', None) or 'empty response')
+            return article.html
+
+        try:
+            html = retry_with_backoff(attempt, attempts=self.download_retries + 1,
+                                      base_delay=self.retry_base_delay, deadline=deadline)
+        except Exception as e:
+            logger.warning(f"Failed to download article {url}: {e}")
+            return None
+        self.archive_html(url, html)
+        return html
+
+    def archive_html(self, url: str, html: Optional[str]) -> None:
+        """Keep the raw page in the content-addressed archive when archiving is enabled."""
+        if not self.raw_store or not html:
+            return
+        try:
+            digest = self.raw_store.put(html)
+            self.db.record_raw_page(url, digest)
+        except Exception as e:
+            logger.warning(f"Failed to archive raw HTML for {url}: {e}")
+
+    def reparse_archive(self) -> Dict[str, int]:
+        """Re-run extraction over every archived page and update the stored articles.
+
+        Reads only from the raw-page archive; nothing is downloaded.
+        """
+        store = self.raw_store or RawPageStore(get_settings().raw_archive_dir)
+        pages = self.db.get_raw_pages()
+        stats = {'pages': len(pages), 'updated': 0, 'missing': 0, 'failed': 0}
+        logger.info(f"Re-parsing {len(pages)} archived pages (profile={self.extraction_profile})")
+
+        pending = deque()
+        for url, digest in pages:
+            html = store.get(digest)
+            if html is None:
+                stats['missing'] += 1
+                continue
+            pending.append((url, self.parse_pool.submit(url, html, self.extraction_profile)))
+            # Keep at most one batch of results waiting so memory stays flat
+            while len(pending) > self.parse_pool.max_pending:
+                self._apply_reparse(*pending.popleft(), stats)
+        while pending:
+            self._apply_reparse(*pending.popleft(), stats)
+
+        logger.info(f"Re-parse complete: {stats}")
+        return stats
+
+    def _apply_reparse(self, url: str, future, stats: Dict[str, int]) -> None:
+        try:
+            article_data = future.result()
+        except Exception as e:
+            logger.warning(f"Re-parse failed for {url}: {e}")
+            article_data = None
+        if not article_data:
+            stats['failed'] += 1
+        elif self.db.update_article_extraction(url, article_data):
+            stats['updated'] += 1
+
+    def fetch_source_articles(self, source: Dict, max_articles: int = 10, emit: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """Fetch articles from a single news source, skipping already-saved articles and enforcing base URL match. Adds debug logging and skips non-article URLs.
+
+        Downloads run sequentially on this thread (politeness delay per source) while the
+        parse pool extracts earlier pages in parallel. With ``emit``, each parsed article is
+        handed on as soon as it is ready instead of being collected into the returned list.
+        """
         import re
         source_url = source['url']
         source_name = source['name']
@@ -101,10 +188,24 @@ class NewsFetcher:
         ]
         skip_regex = re.compile('|'.join(skip_patterns), re.IGNORECASE)
 
+        if not self.source_health.allow(source_name):
+            logger.warning(f"[{source_name}] Circuit open, skipping source this cycle")
+            self.source_outcomes[source_name] = 'failed'
+            return []
+        deadline = time.monotonic() + self.source_time_budget
+
         try:
             # Build newspaper source
             source_start_time = time.time()
-            news_source = newspaper.build(source_url, memoize_articles=False, language='da')
+            def build():
+                built = newspaper.build(source_url, memoize_articles=False, language='da')
+                if not built.articles:
+                    # newspaper swallows network errors; an empty front page means it was unreachable
+                    raise TransientError('no articles discovered on source page')
+                return built
+
+            news_source = retry_with_backoff(build, attempts=self.download_retries + 1,
+                                             base_delay=self.retry_base_delay, deadline=deadline)
             source_build_time = time.time() - source_start_time
 
             logger.info(f"Found {len(news_source.articles)} potential articles from {source_name} (source build time: {source_build_time:.2f}s)")
@@ -113,14 +214,55 @@ class NewsFetcher:
             articles_to_fetch = min(max_articles, len(news_source.articles))
 
             articles = []
-            successful_fetches = 0
-            failed_fetches = 0
-            total_fetch_time = 0
+            pending = deque()  # (url, canonical url, started_at, parse future) in submission order
+            stats = {'successful': 0, 'failed': 0, 'download_failed': 0, 'total_fetch_time': 0.0}
             checked = 0
+            out_of_time = False
+            canonical_rules = source.get('canonical_rules')
+            seen_canonical = set()  # canonical URLs already queued in this run
 
+            def harvest(entry) -> None:
+                article_url, queued_canonical, started_at, future = entry
+                try:
+                    article_data = future.result()
+                except Exception as e:
+                    logger.error(f"[ERROR] Exception while parsing {article_url}: {e}")
+                    article_data = None
+
+                article_fetch_time = time.time() - started_at
+                stats['total_fetch_time'] += article_fetch_time
+                self.article_latencies.append(article_fetch_time)
+
+                if article_data:
+                    # The page's <link rel=canonical> may reveal a variant we already have
+                    canonical = canonicalize_url(article_data.get('canonical_link') or article_url, canonical_rules)
+                    if canonical != queued_canonical:
+                        if canonical in seen_canonical or self.db.article_exists(canonical, canonical):
+                            logger.debug(f"[SKIP] Canonical link points to a known article: {article_url} -> {canonical}")
+                            return
+                        seen_canonical.add(canonical)
+                    article_data['canonical_url'] = canonical
 
-            for i, article in enumerate(news_source.articles):
-                if len(articles) >= articles_to_fetch:
+                if article_data:
+                    # Log successful fetch with details
+                    content_length = len(article_data.get('content', ''))
+                    title = article_data.get('title', 'No title')[:50]  # Truncate long titles
+                    logger.info(f"[{source_name}] SUCCESS: '{title}' ({content_length} chars) - {article_fetch_time:.2f}s")
+                    article_data['source'] = source_name
+                    stats['successful'] += 1
+                    if emit is not None:
+                        emit(article_data)
+                    else:
+                        articles.append(article_data)
+                else:
+                    logger.warning(f"[{source_name}] FAILED (no title or text): {article_url} - {article_fetch_time:.2f}s")
+                    stats['failed'] += 1
+
+            for article in news_source.articles:
+                # Wait for in-flight parses before downloading more than we need
+                while pending and stats['successful'] + len(pending) >= articles_to_fetch:
+                    harvest(pending.popleft())
+                if stats['successful'] >= articles_to_fetch:
                     break
                 article_url = article.url
 
@@ -136,196 +278,258 @@ class NewsFetcher:
                     logger.debug(f"[SKIP] Non-article URL by pattern: {article_url}")
                     continue
 
-                # Check if article already exists in DB before fetching
-                with self.db.get_connection() as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("SELECT id FROM articles WHERE url = ?", (article_url,))
-                    if cursor.fetchone():
-                        logger.debug(f"[SKIP] Already-saved article: {article_url}")
-                        continue  # Skip fetching this article
+                # Check if article (or a URL variant of it) already exists before fetching
+                canonical_url = canonicalize_url(article_url, canonical_rules)
+                if canonical_url in seen_canonical or self.db.article_exists(article_url, canonical_url):
+                    logger.debug(f"[SKIP] Already-saved article: {article_url}")
+                    continue  # Skip fetching this article
+                seen_canonical.add(canonical_url)
+
+                if time.monotonic() >= deadline:
+                    logger.warning(f"[{source_name}] Time budget of {self.source_time_budget:.0f}s used up, stopping downloads")
+                    out_of_time = True
+                    break
 
                 article_start_time = time.time()
                 if checked > 0:  # Don't sleep before first article
-                    time.sleep(1)  # Add delay to be respectful to the source
+                    time.sleep(self.article_delay)  # Add delay to be respectful to the source
                 checked += 1
 
-                logger.info(f"[{source_name}] Fetching article {len(articles)+1}/{articles_to_fetch}: {article_url}")
-
-                try:
-                    article_data = self.fetch_article_content(article_url)
-                except Exception as e:
-                    logger.error(f"[ERROR] Exception in fetch_article_content for {article_url}: {e}")
-                    article_data = None
+                logger.info(f"[{source_name}] Fetching article {stats['successful'] + len(pending) + 1}/{articles_to_fetch}: {article_url}")
 
-                article_fetch_time = time.time() - article_start_time
-                total_fetch_time += article_fetch_time
+                html = self.download_article_html(article_url, deadline=deadline)
+                if not html:
+                    logger.warning(f"[{source_name}] FAILED (download): {article_url} - {time.time() - article_start_time:.2f}s")
+                    stats['failed'] += 1
+                    stats['download_failed'] += 1
+                    continue
 
-                if article_data:
-                    # Log successful fetch with details
-                    content_length = len(article_data.get('content', ''))
-                    title = article_data.get('title', 'No title')[:50]  # Truncate long titles
-                    logger.info(f"[{source_name}] SUCCESS: '{title}' ({content_length} chars) - {article_fetch_time:.2f}s")
-                    article_data['source'] = source_name
-                    articles.append(article_data)
-                    successful_fetches += 1
-                else:
-                    # Try to diagnose why it failed
-                    logger.warning(f"[{source_name}] FAILED: {article_url} - {article_fetch_time:.2f}s")
-                    # Try to fetch again and log details
-                    try:
-                        article = Article(article_url)
-                        article.download()
-                        article.parse()
-                        if not article.title:
-                            logger.warning(f"[DEBUG] Article has no title: {article_url}")
-                        if not article.text:
-                            logger.warning(f"[DEBUG] Article has no text: {article_url}")
-                    except Exception as e:
-                        logger.warning(f"[DEBUG] Exception during manual article parse: {article_url} - {e}")
-                    failed_fetches += 1
-
-            avg_fetch_time = total_fetch_time / len(articles) if articles else 0
-            logger.info(f"[{source_name}] Fetch complete: {successful_fetches} successful, {failed_fetches} failed, avg time: {avg_fetch_time:.2f}s per article")
+                # Hand off to the parse stage; blocks here if the parse queue is full
+                pending.append((article_url, canonical_url, article_start_time, self.parse_pool.submit(article_url, html, self.extraction_profile)))
+
+            while pending:
+                harvest(pending.popleft())
+
+            avg_fetch_time = stats['total_fetch_time'] / stats['successful'] if stats['successful'] else 0
+            logger.info(f"[{source_name}] Fetch complete: {stats['successful']} successful, {stats['failed']} failed, avg time: {avg_fetch_time:.2f}s per article")
+            if checked and stats['download_failed'] == checked:
+                self.source_health.record_failure(source_name, f"all {checked} article downloads failed")
+                self.source_outcomes[source_name] = 'failed'
+            else:
+                self.source_health.record_success(source_name)
+                capped = out_of_time or stats['successful'] >= max_articles
+                self.source_outcomes[source_name] = 'capped' if capped else 'complete'
             return articles
 
         except Exception as e:
             logger.error(f"Failed to fetch from {source_name}: {e}")
+            self.source_health.record_failure(source_name, str(e))
+            self.source_outcomes[source_name] = 'failed'
             return []
 
+    def persist_article(self, article: Dict) -> Tuple[str, Optional[int]]:
+        """Persist stage for one parsed article: dedupe, save and fingerprint it.
+
+        Returns ``(status, article_id)`` where status is ``'duplicate'`` (already stored
+        under this URL or a variant; nothing saved), ``'near_duplicate'`` (saved but
+        flagged, so later stages skip it) or ``'saved'``. The summary actually stored is
+        written back to ``article['summary']`` for the geo-tag stage.
+        """
+        article_url = article.get('url', 'unknown')
+        article_title = article.get('title', 'No title')[:50]  # Truncate for logging
+
+        # Check if article already exists, under this URL or any variant of it
+        canonical_url = article.get('canonical_url') or canonicalize_url(article.get('canonical_link') or article_url)
+        if self.db.article_exists(article_url, canonical_url):
+            logger.debug(f"Skipping duplicate article: {article_title}")
+            return 'duplicate', None
+
+        # Summaries missing at this point are filled in by enrich_articles() unless
+        # the legacy 'full' profile is in use, which expects one at save time.
+        summary = article.get('summary')
+        if not summary and self.extraction_profile == 'full':
+            summary = self.generate_simple_summary(article['content'])
+        article['summary'] = summary
+
+        # Save article
+        article_id = self.db.save_article(
+            title=article['title'],
+            content=article['content'],
+            summary=summary,
+            url=article_url,
+            source=article['source'],
+            published_date=article.get('published_date'),
+            thumbnail_url=article.get('thumbnail_url'),
+            canonical_url=canonical_url
+        )
+
+        # Flag near-duplicates (same wire story, URL variants) before the costly stages
+        fingerprint = article_fingerprint(article['title'], article['content'])
+        if fingerprint is not None:
+            duplicate_of = self.db.find_near_duplicate(fingerprint, exclude_id=article_id)
+            self.db.save_article_fingerprint(article_id, fingerprint)
+            if duplicate_of is not None:
+                self.db.mark_article_duplicate(article_id, duplicate_of)
+                logger.info(f"Article {article_id} ('{article_title}') is a near-duplicate of {duplicate_of}; skipping geo-tagging")
+                return 'near_duplicate', article_id
+
+        # Thumbnail download/downsizing happens in the background, off the ingest path; the
+        # version bump lets cached pages switch from the remote image to the local copy
+        if self.thumbnails is not None:
+            self.thumbnails.schedule(article.get('thumbnail_url'), on_stored=self.db.mark_thumbnails_changed)
+
+        logger.debug(f"Saved new article: '{article_title}' (ID: {article_id})")
+        return 'saved', article_id
+
+    def geo_tag_article(self, nlp, article_id: int, article: Dict) -> List:
+        """Geo-tag stage for one persisted article."""
+        article_title = article.get('title', 'No title')[:50]
+        logger.debug(f"Extracting geo-tags for article {article_id} ('{article_title}')")
+        geo_fetcher_info_logger.info(f"Extracting geo-tags for article {article_id} ('{article_title}')")
+        geo_tags = nlp.extract_geo_tags(
+            article.get('content'),
+            title=article.get('title'),
+            summary=article.get('summary'),
+            db_manager=self.db
+        )
+        logger.debug(f"Geo-tags for article {article_id}: {geo_tags}")
+        geo_fetcher_info_logger.info(f"Geo-tags for article {article_id}: {geo_tags}")
+        if geo_tags:
+            logger.debug(f"Saving geo-tags for article {article_id}")
+            geo_fetcher_info_logger.info(f"Saving geo-tags for article {article_id}")
+            self.db.save_geo_tags(article_id, geo_tags)
+        return geo_tags or []
+
+    def geo_tag_articles(self, nlp, items: List[Tuple[int, Dict]]) -> Dict[int, List]:
+        """Geo-tag stage for a batch of ``(article_id, article)`` pairs.
+
+        Uses one ``NLPProcessor.enrich_many`` (``nlp.pipe``) pass when the processor
+        supports it, otherwise falls back to ``geo_tag_article`` per article.
+        """
+        if not items:
+            return {}
+        if not hasattr(nlp, 'enrich_many'):
+            return {article_id: self.geo_tag_article(nlp, article_id, article) for article_id, article in items}
+        results = nlp.enrich_many([article for _, article in items], db_manager=self.db, batch_size=len(items))
+        tagged = {}
+        for (article_id, article), result in zip(items, results):
+            geo_tags = result['geo_tags']
+            logger.debug(f"Geo-tags for article {article_id}: {geo_tags}")
+            if geo_tags:
+                self.db.save_geo_tags(article_id, geo_tags)
+            tagged[article_id] = geo_tags
+        return tagged
+
     def save_articles_to_db(self, articles: List[Dict]):
-        """Save fetched articles to database and extract/save geo-tags. Includes debug/info logging for geo-tagging."""
-        from .nlp_processor import NLPProcessor
-        nlp = NLPProcessor()
+        """Save fetched articles to database and extract/save geo-tags. Includes debug/info logging for geo-tagging.
+
+        Batch counterpart of the streaming pipeline used by ``fetch_all_sources``.
+        """
+        nlp = None
+        if self.geo_tag_on_ingest:
+            from .nlp_processor import NLPProcessor
+            nlp = NLPProcessor(nominatim_fallback=self.config.get('nominatim_fallback', True))
         saved_count = 0
         duplicate_count = 0
+        near_duplicate_count = 0
         error_count = 0
 
         logger.info(f"Attempting to save {len(articles)} articles to database")
         geo_fetcher_info_logger.info(f"Attempting to save {len(articles)} articles to database")
 
+        to_tag = []
         for article in articles:
             try:
-                article_url = article.get('url', 'unknown')
-                article_title = article.get('title', 'No title')[:50]  # Truncate for logging
-
-                # Check if article already exists
-                with self.db.get_connection() as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("SELECT id FROM articles WHERE url = ?", (article_url,))
-                    row = cursor.fetchone()
-                    if row:
-                        logger.debug(f"Skipping duplicate article: {article_title}")
-                        duplicate_count += 1
-                        continue  # Skip duplicate
-
-                # Generate summary if not provided
-                summary = article.get('summary') or self.generate_simple_summary(article['content'])
-
-                # Save article
-                article_id = self.db.save_article(
-                    title=article['title'],
-                    content=article['content'],
-                    summary=summary,
-                    url=article_url,
-                    source=article['source'],
-                    published_date=article.get('published_date'),
-                    thumbnail_url=article.get('thumbnail_url')
-                )
-
-                # Extract and save geo-tags
-                logger.debug(f"Extracting geo-tags for article {article_id} ('{article_title}')")
-                geo_fetcher_info_logger.info(f"Extracting geo-tags for article {article_id} ('{article_title}')")
-                geo_tags = nlp.extract_geo_tags(
-                    article.get('content'),
-                    title=article.get('title'),
-                    summary=summary,
-                    db_manager=self.db
-                )
-                logger.debug(f"Geo-tags for article {article_id}: {geo_tags}")
-                geo_fetcher_info_logger.info(f"Geo-tags for article {article_id}: {geo_tags}")
-                if geo_tags:
-                    logger.debug(f"Saving geo-tags for article {article_id}")
-                    geo_fetcher_info_logger.info(f"Saving geo-tags for article {article_id}")
-                    self.db.save_geo_tags(article_id, geo_tags)
-
-                logger.debug(f"Saved new article: '{article_title}' (ID: {article_id})")
+                status, article_id = self.persist_article(article)
+                if status == 'duplicate':
+                    duplicate_count += 1
+                    continue
                 saved_count += 1
+                if status == 'near_duplicate':
+                    near_duplicate_count += 1
+                elif nlp is not None:
+                    to_tag.append((article_id, article))
 
             except Exception as e:
                 error_count += 1
                 logger.error(f"Failed to save article '{article.get('title', 'unknown')[:30]}...': {e}")
 
-        logger.info(f"Database save complete: {saved_count} new articles saved, {duplicate_count} duplicates skipped, {error_count} errors")
+        for offset in range(0, len(to_tag), self.geo_batch_size):
+            batch = to_tag[offset:offset + self.geo_batch_size]
+            try:
+                self.geo_tag_articles(nlp, batch)
+            except Exception as e:
+                error_count += len(batch)
+                logger.error(f"Failed to geo-tag {len(batch)} articles: {e}")
+
+        logger.info(f"Database save complete: {saved_count} new articles saved ({near_duplicate_count} near-duplicates flagged), {duplicate_count} duplicates skipped, {error_count} errors")
         return saved_count
 
     def generate_simple_summary(self, content: str, max_sentences: int = 3) -> str:
         """Generate a simple summary by taking first few sentences"""
-        if not content:
-            return ""
-
-        sentences = content.split('.')
-        summary_sentences = []
-
-        for sentence in sentences[:max_sentences]:
-            sentence = sentence.strip()
-            if sentence:
-                summary_sentences.append(sentence)
-
-        return '. '.join(summary_sentences) + ('.' if summary_sentences else '')
-
-    def fetch_all_sources(self, max_articles_per_source: Optional[int] = None):
-        """Fetch articles from all configured sources"""
+        return simple_summary(content, max_sentences)
+
+    def enrich_articles(self, limit: int = 500) -> int:
+        """Background enrichment stage: fill in summaries deferred by the fetch path.
+
+        Works through the backlog ``limit`` rows at a time until none are left. Articles
+        that yield no summary get an empty one so they are not selected again.
+        """
+        enriched = 0
+        attempted = 0
+        while True:
+            pending = self.db.get_articles_missing_summary(limit=limit)
+            if not pending:
+                break
+            for article in pending:
+                summary = self.generate_simple_summary(article.get('content') or '')
+                self.db.update_article_summary(article['id'], summary or '')
+                enriched += bool(summary)
+            attempted += len(pending)
+        if attempted:
+            logger.info(f"Enrichment complete: {enriched}/{attempted} summaries generated")
+        return enriched
+
+    def fetch_all_sources(self, max_articles_per_source: Optional[int] = None, sources: Optional[List[Dict]] = None) -> Dict:
+        """Fetch articles from all configured sources (or just ``sources``).
+
+        Runs the streaming ingest pipeline (see ``pipeline.IngestPipeline``): each article
+        is persisted, geo-tagged and scored as soon as it is parsed. Returns the number of
+        new articles saved, in total and per source, plus per-stage counts and the names
+        of sources that failed or were capped (see ``source_outcomes``).
+        """
         # Use config value if no parameter provided
         if max_articles_per_source is None:
             max_articles_per_source = self.config.get('max_articles_per_source', 10)
 
-        total_start_time = time.time()
-        logger.info(f"Starting news fetch from {len(self.sources)} sources (max {max_articles_per_source} articles per source)")
-
-        total_articles = 0
-        successful_sources = 0
-        failed_sources = 0
-
-        for i, source in enumerate(self.sources, 1):
-            source_name = source['name']
-            source_start_time = time.time()
+        if sources is None:
+            sources = self.sources
 
-            logger.info(f"Processing source {i}/{len(self.sources)}: {source_name}")
-
-            try:
-                articles = self.fetch_source_articles(source, max_articles_per_source)
-                saved_count = self.save_articles_to_db(articles) if articles else 0
-
-                if articles and saved_count > 0:
-                    total_articles += saved_count
-                    successful_sources += 1
-
-                    source_time = time.time() - source_start_time
-                    logger.info(f"[{source_name}] Source complete: {len(articles)} fetched, {saved_count} saved, time: {source_time:.2f}s")
-                elif articles and saved_count == 0:
-                    # Articles fetched but all were duplicates
-                    successful_sources += 1
-                    source_time = time.time() - source_start_time
-                    logger.info(f"[{source_name}] Source complete: {len(articles)} fetched, {saved_count} saved (all duplicates), time: {source_time:.2f}s")
-                else:
-                    failed_sources += 1
-                    source_time = time.time() - source_start_time
-                    logger.warning(f"[{source_name}] Source failed or returned no articles (time: {source_time:.2f}s)")
-
-            except Exception as e:
-                failed_sources += 1
-                source_time = time.time() - source_start_time
-                logger.error(f"[{source_name}] Source error: {e} (time: {source_time:.2f}s)")
-
-            # Add delay between sources to be respectful
-            if i < len(self.sources):  # Don't sleep after the last source
-                time.sleep(2)
+        total_start_time = time.time()
+        self.article_latencies = []
+        self.source_outcomes = {}
+        logger.info(f"Starting news fetch from {len(sources)} sources (max {max_articles_per_source} articles per source)")
+
+        pipeline = IngestPipeline(
+            self,
+            geo_workers=self.config.get('geo_tag_workers', 1),
+            persist_queue_size=self.config.get('persist_queue_size', 32),
+            geo_queue_size=self.config.get('geo_queue_size', 64),
+        )
+        result = pipeline.run(sources, max_articles_per_source)
+        result['failed_sources'] = sorted(name for name, outcome in self.source_outcomes.items() if outcome == 'failed')
+        result['capped_sources'] = sorted(name for name, outcome in self.source_outcomes.items() if outcome == 'capped')
+
+        for source_name, saved_count in result['saved_by_source'].items():
+            logger.info(f"[{source_name}] Source complete: {saved_count} saved")
 
         total_time = time.time() - total_start_time
-        avg_time_per_source = total_time / len(self.sources) if self.sources else 0
+        avg_time_per_source = total_time / len(sources) if sources else 0
 
-        logger.info(f"News fetch completed: {total_articles} total articles saved, {successful_sources} sources successful, {failed_sources} sources failed")
+        logger.info(f"News fetch completed: {result['saved']} total articles saved, {result['duplicates']} duplicates skipped, "
+                    f"{result['geo_tagged']} geo-tagged, {result['scored']} scored, {result['errors']} errors")
         logger.info(f"Total time: {total_time:.2f}s, average {avg_time_per_source:.2f}s per source")
+        return result
 
     def update_article_scores(self):
         """Update scores for all articles (to be called after fetching)"""
@@ -343,8 +547,7 @@ class NewsFetcher:
         return stats
 
     def cleanup_old_articles(self, days_to_keep: int = 30):
-        """Remove articles older than specified days"""
-        from datetime import timedelta
+        """Remove articles older than specified days, and raw pages archived before then"""
         cutoff_date = datetime.now() - timedelta(days=days_to_keep)
 
         logger.info(f"Starting cleanup of articles older than {days_to_keep} days (cutoff: {cutoff_date.date()})")
@@ -357,8 +560,15 @@ class NewsFetcher:
 
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
+            # Geo-tags first, so none (and no heat-map rollup rows) outlive their article
+            cursor.execute(
+                "DELETE FROM geo_tags WHERE article_id IN (SELECT id FROM articles WHERE fetched_at < ?)",
+                (cutoff_date,)
+            )
             cursor.execute("DELETE FROM articles WHERE fetched_at < ?", (cutoff_date,))
             deleted_count = cursor.rowcount
+            cursor.execute("UPDATE articles SET duplicate_of = NULL WHERE duplicate_of NOT IN (SELECT id FROM articles)")
+            cursor.execute("DELETE FROM article_fingerprints WHERE article_id NOT IN (SELECT id FROM articles)")
             conn.commit()
 
         # Get stats about what was cleaned up
@@ -373,7 +583,19 @@ class NewsFetcher:
             for source, count in deleted_by_source.items():
                 logger.info(f"  {source}: {count} articles")
 
+        self.prune_raw_archive(days_to_keep)
         return deleted_count
+
+    def prune_raw_archive(self, days_to_keep: int) -> int:
+        """Delete archived raw pages fetched more than ``days_to_keep`` days ago."""
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days_to_keep)
+        digests = self.db.delete_raw_pages_before(cutoff)
+        if not digests:
+            return 0
+        store = self.raw_store or RawPageStore(get_settings().raw_archive_dir)
+        removed = sum(1 for digest in digests if store.delete(digest))
+        logger.info(f"Pruned {removed} archived raw pages older than {days_to_keep} days")
+        return removed
     
 
 if __name__ == "__main__":
@@ -9,14 +9,23 @@ SETTINGS = get_settings()
 
 
 from flask import abort
-from flask import Flask, render_template, redirect, url_for, request, session, flash
+from flask import Flask, render_template, redirect, url_for, request, session, flash, send_file, stream_with_context
+from functools import partial, wraps
 import logging
 from .database import DatabaseManager
-from .scorer import ArticleScorer
+from .scorer import ArticleScorer, describe_word_matches
 from .auth import AuthManager
 from .fetcher import NewsFetcher
 from .nlp_processor import NLPProcessor
+from .thumbnails import get_thumbnail_cache
+from .jobs import CANCELLED, FAILED, SUCCEEDED, JobRunner
+from .response_cache import ResponseCache
+from .serialization import UnsupportedFormat, choose_encoding, choose_format, compress, dumps_json, encode
+from .geo_grid import DEFAULT_MAX_POINTS, cell_size_for_zoom, merge_cells, parse_bbox, rollup_level_for_zoom, split_bbox
+from datetime import datetime, timedelta, timezone
 import os
+import re
+import time
 
 
 app = Flask(__name__, template_folder=str(SETTINGS.templates_dir))
@@ -34,6 +43,78 @@ info_logger.setLevel(logging.INFO)
 db = DatabaseManager()
 auth = AuthManager(db)
 scorer = ArticleScorer(db)
+# Worker threads for long admin operations (purge/refresh, geo-tag re-run, score recalculation)
+job_runner = JobRunner(workers=int(os.environ.get('NEWSREADER_JOB_WORKERS', '2')))
+
+THUMBNAIL_MAX_AGE = 30 * 24 * 3600
+_THUMBNAIL_KEY_RE = re.compile(r'^[0-9a-f]{64}$')
+# Rendered read-only responses, keyed by route, query string and table versions
+response_cache = ResponseCache(max_bytes=int(os.environ.get('NEWSREADER_RESPONSE_CACHE_MB', '32')) * 1024 * 1024)
+
+
+def cached_response(tables, anonymous_only=False, max_age=0, variant=None, vary=()):
+    """Serve the view from ``response_cache`` while ``tables`` are unchanged, with ETag/304 support.
+
+    ``anonymous_only`` views are cached only for visitors who are not logged in and
+    have no pending flash messages. ``variant`` returns the negotiated representation
+    (e.g. format and content coding) that is added to the key, and the request headers
+    it depends on are listed in ``vary``.
+    """
+    tables = tuple(tables)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if anonymous_only and (session.get('user_id') or session.get('_flashes')):
+                return view(*args, **kwargs)
+            key = (request.path, request.query_string, str(db.db_path), tables, db.get_change_token(tables),
+                   variant() if variant else None)
+            entry = response_cache.get(key)
+            if entry is None:
+                response = app.make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.direct_passthrough:
+                    return response
+                entry = response_cache.put(key, response.get_data(), response.mimetype,
+                                           response.headers.get('Content-Encoding'))
+            response = app.response_class(entry.body, mimetype=entry.mimetype)
+            if entry.encoding:
+                response.headers['Content-Encoding'] = entry.encoding
+            response.set_etag(entry.etag)
+            response.vary.update(vary)
+            if anonymous_only:
+                response.cache_control.private = True
+                response.vary.add('Cookie')
+            else:
+                response.cache_control.public = True
+            if max_age:
+                response.cache_control.max_age = max_age
+            else:
+                response.cache_control.no_cache = True
+            return response.make_conditional(request)
+        return wrapper
+    return decorator
+
+
+@app.template_global()
+def thumbnail_src(url):
+    """Local cached thumbnail URL when available, else the original remote URL."""
+    key = get_thumbnail_cache().lookup(url)
+    if key:
+        return url_for('thumbnail', key=key)
+    return url
+
+
+@app.route('/thumbnails/<key>.jpg')
+def thumbnail(key):
+    if not _THUMBNAIL_KEY_RE.match(key):
+        abort(404)
+    path = get_thumbnail_cache().path_for_key(key)
+    if not path.exists():
+        abort(404)
+    response = send_file(path, mimetype='image/jpeg', max_age=THUMBNAIL_MAX_AGE, conditional=True)
+    # Keys are content-addressed by source URL, so a cached thumbnail never changes
+    response.headers['Cache-Control'] = f'public, max-age={THUMBNAIL_MAX_AGE}, immutable'
+    return response
 
 
 def _get_admin_user_or_redirect():
@@ -81,6 +162,7 @@ def heatmap():
 
 # --- API: Geo-tags for heat-map ---
 @app.route('/api/geo_tags')
+@cached_response(('geo_tags', 'excluded_tags'))
 def api_geo_tags():
     """Return all geo-tags with coordinates for heat-map visualization. Excludes tags in excluded_tags table."""
     excluded = db.get_excluded_tags()
@@ -108,6 +190,52 @@ def api_geo_tags():
     return {'geo_tags': geo_tags}
 
 
+# --- API: Aggregated heat-map points for the visible map area ---
+def _parse_day(value):
+    return datetime.strptime(value, '%Y-%m-%d').date().isoformat() if value else None
+
+
+@app.route('/api/geo_heatmap')
+@cached_response(('geo_tags', 'excluded_tags'))
+def api_geo_heatmap():
+    """Geo-tags in ``bbox`` (west,south,east,north) bucketed into a grid sized for ``zoom``.
+
+    ``start``/``end`` (``YYYY-MM-DD``, inclusive) or ``days`` (the last N days) select a
+    time window. Returns at most ``max_points`` weighted points, however many geo-tags
+    are stored.
+    """
+    try:
+        bbox = parse_bbox(request.args.get('bbox', ''))
+        zoom = int(request.args.get('zoom', 2))
+        start_day = _parse_day(request.args.get('start'))
+        end_day = _parse_day(request.args.get('end'))
+        days = request.args.get('days', type=int)
+        max_points = max(1, min(DEFAULT_MAX_POINTS, request.args.get('max_points', DEFAULT_MAX_POINTS, type=int)))
+    except ValueError as exc:
+        return {'error': f'Invalid parameters: {exc}'}, 400
+    if days and days > 0 and not start_day:
+        start_day = (datetime.now(timezone.utc) - timedelta(days=days - 1)).date().isoformat()
+
+    boxes = split_bbox(bbox)
+    level = rollup_level_for_zoom(zoom)
+    if level is not None:
+        cell_size = cell_size_for_zoom(level)
+        rows = db.get_geo_rollup_cells(level, boxes, start_day=start_day, end_day=end_day)
+    else:
+        cell_size = cell_size_for_zoom(zoom)
+        rows = db.get_geo_tag_cells(boxes, cell_size, start_day=start_day, end_day=end_day)
+    points, truncated = merge_cells(rows, max_points=max_points)
+    return {'points': points, 'cell_size': cell_size, 'zoom': zoom, 'start': start_day, 'end': end_day,
+            'truncated': truncated}
+
+
+@app.route('/api/geo_timeline')
+@cached_response(('geo_tags', 'excluded_tags'))
+def api_geo_timeline():
+    """Geo-tag mentions per day, for the heat-map time slider."""
+    return {'days': db.get_geo_timeline()}
+
+
 # --- Admin: Excluded Tags Management ---
 @app.route('/excluded-tags', methods=['GET', 'POST'])
 def excluded_tags():
@@ -140,6 +268,7 @@ def admin_dashboard():
 
     user_stats = db.get_user_usage_stats()
     latest_login = max((stat['last_login_at'] for stat in user_stats if stat['last_login_at']), default=None)
+    source_health = db.get_source_health()
 
     return render_template(
         'admin_dashboard.html',
@@ -147,6 +276,7 @@ def admin_dashboard():
         geo_tag_count=geo_tag_count,
         user_stats=user_stats,
         latest_login=latest_login,
+        source_health=source_health,
         user_id=admin_user['id'],
         username=admin_user['username']
     )
@@ -167,23 +297,73 @@ def admin_delete_article(article_id):
     return redirect(request.referrer or url_for('index'))
 
 
+def _submit_job(kind, func, created_by, describe_result, failure_prefix):
+    """Run ``func`` as a background job and flash its outcome (or that it has started).
+
+    With ``JOBS_INLINE`` (default under ``TESTING``) the job runs inside the request.
+    """
+    job = job_runner.submit(db, kind, func, created_by=created_by,
+                            inline=app.config.get('JOBS_INLINE', app.testing))
+    if job['status'] == SUCCEEDED:
+        flash(describe_result(job['result']), 'success')
+    elif job['status'] == FAILED:
+        flash(f"{failure_prefix}: {job['error']}", 'danger')
+    elif job['status'] == CANCELLED:
+        flash(f'Job #{job["id"]} was cancelled.', 'warning')
+    elif session.get('username') == 'admin':
+        flash(f'Started background job #{job["id"]} ({kind}); follow it on the jobs page.', 'info')
+    else:
+        status_url = url_for('api_job_status', job_id=job['id'])
+        flash(f'Started background job #{job["id"]} ({kind}); reload this page when it has finished '
+              f'(status: {status_url}).', 'info')
+    return job
+
+
+def _purge_refresh_job(job):
+    deleted = job.db.delete_all_articles()
+    job.progress(1, 4, 'Fetching all sources')
+    fetcher = NewsFetcher(job.db)
+    fetcher.fetch_all_sources()
+    job.progress(2, 4, 'Enriching articles')
+    if hasattr(fetcher, 'enrich_articles'):
+        fetcher.enrich_articles()
+    job.progress(3, 4, 'Scoring articles')
+    ArticleScorer(job.db).score_all_articles()
+    job.progress(4, 4, 'Done')
+    return {'deleted': deleted, 'fetched': job.db.get_article_count()}
+
+
+def _geo_refresh_job(job):
+    cleared = job.db.clear_geo_tags(reset_not_found=True)
+    job.progress(0, None, 'Geo-tagging articles')
+    nlp = NLPProcessor()
+    # Every tag was just cleared, so run in-process: worker processes are offline-only and
+    # would drop each place that needs Nominatim (see geo_bulk)
+    stats = job.db.geo_tag_all_articles(nlp, workers=1, progress=job.progress)
+    with job.db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM geo_tags")
+        new_total = cursor.fetchone()[0]
+    return {**stats, 'cleared': cleared, 'geo_tags': new_total}
+
+
+def _recalc_scores_job(job, user_id):
+    job.progress(0, None, 'Scoring articles')
+    scorer.score_all_articles(user_id=user_id)
+    return {'user_id': user_id}
+
+
 @app.route('/admin/articles/purge-refresh', methods=['POST'])
 def admin_purge_refresh_articles():
     admin_user, redirect_response = _get_admin_user_or_redirect()
     if redirect_response:
         return redirect_response
 
-    deleted = db.delete_all_articles()
-    try:
-        fetcher = NewsFetcher(db)
-        fetcher.fetch_all_sources()
-        scorer.score_all_articles()
-        new_total = db.get_article_count()
-        flash(f'Deleted {deleted} articles and fetched {new_total} fresh articles.', 'success')
-    except Exception as exc:
-        logging.getLogger(__name__).exception('Failed to refresh articles')
-        flash(f'Failed to refresh articles: {exc}', 'danger')
-
+    _submit_job(
+        'purge_refresh', _purge_refresh_job, admin_user['id'],
+        lambda result: f"Deleted {result['deleted']} articles and fetched {result['fetched']} fresh articles.",
+        'Failed to refresh articles'
+    )
     return redirect(url_for('admin_dashboard'))
 
 
@@ -193,21 +373,58 @@ def admin_rerun_geo_tags():
     if redirect_response:
         return redirect_response
 
-    cleared = db.clear_geo_tags(reset_not_found=True)
-    try:
-        nlp = NLPProcessor()
-        db.geo_tag_all_articles(nlp)
-        with db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM geo_tags")
-            new_total = cursor.fetchone()[0]
-        flash(f'Regenerated geo-tags for {new_total} entries (cleared {cleared}).', 'success')
-    except Exception as exc:
-        logging.getLogger(__name__).exception('Failed to regenerate geo-tags')
-        flash(f'Failed to regenerate geo-tags: {exc}', 'danger')
-
+    _submit_job(
+        'geo_refresh', _geo_refresh_job, admin_user['id'],
+        lambda result: f"Regenerated geo-tags for {result['geo_tags']} entries (cleared {result['cleared']}).",
+        'Failed to regenerate geo-tags'
+    )
     return redirect(url_for('admin_dashboard'))
 
+
+# --- Background jobs ---
+@app.route('/admin/jobs', methods=['GET'])
+def admin_jobs():
+    admin_user, redirect_response = _get_admin_user_or_redirect()
+    if redirect_response:
+        return redirect_response
+    jobs = job_runner.list_jobs(db, limit=100)
+    return render_template('admin_jobs.html', jobs=jobs, user_id=admin_user['id'], username=admin_user['username'])
+
+
+@app.route('/admin/jobs/<int:job_id>/cancel', methods=['POST'])
+def admin_cancel_job(job_id):
+    admin_user, redirect_response = _get_admin_user_or_redirect()
+    if redirect_response:
+        return redirect_response
+    if job_runner.cancel(db, job_id):
+        flash(f'Cancellation requested for job #{job_id}.', 'info')
+    else:
+        flash(f'Job #{job_id} is not running.', 'warning')
+    return redirect(url_for('admin_jobs'))
+
+
+def _get_visible_job(job_id):
+    """The job if the session user may see it (admin, or the user who started it)."""
+    user_id = session.get('user_id')
+    if not user_id:
+        abort(401)
+    job = db.get_job(job_id)
+    if not job or (session.get('username') != 'admin' and job['created_by'] != user_id):
+        abort(404)
+    return job
+
+
+@app.route('/api/jobs/<int:job_id>', methods=['GET'])
+def api_job_status(job_id):
+    return _get_visible_job(job_id)
+
+
+@app.route('/api/jobs/<int:job_id>/cancel', methods=['POST'])
+def api_cancel_job(job_id):
+    _get_visible_job(job_id)
+    cancelled = job_runner.cancel(db, job_id)
+    return {'cancel_requested': cancelled, 'job': db.get_job(job_id)}, (202 if cancelled else 409)
+
 # --- Recalculate Scores Route ---
 
 @app.route('/recalc_scores', methods=['POST'])
@@ -216,8 +433,11 @@ def recalc_scores():
     if not user_id:
         flash('You must be logged in to recalculate scores.', 'danger')
         return redirect(url_for('login'))
-    scorer.score_all_articles(user_id=user_id)
-    flash('Scores recalculated for your preferences.', 'success')
+    _submit_job(
+        'recalc_scores', partial(_recalc_scores_job, user_id=user_id), user_id,
+        lambda result: 'Scores recalculated for your preferences.',
+        'Failed to recalculate scores'
+    )
     return redirect(url_for('index'))
 
 
@@ -309,26 +529,21 @@ def register():
     return render_template('register.html')
 
 @app.route('/')
+# 'thumbnails' is bumped when a background download lands, since thumbnail_src() depends on it
+@cached_response(('articles', 'geo_tags', 'excluded_tags', 'thumbnails'), anonymous_only=True)
 def index():
     user_id = session.get('user_id')
-    articles = db.get_articles(limit=50, user_id=user_id)
-    # Add matched score words for tooltip
-    score_words = db.get_score_words(user_id) if user_id else db.get_default_score_words()
+    articles = db.get_articles(limit=50, user_id=user_id, include_content=False)
+    # Matched score words for the tooltip, as stored by the scorer with the score
     for article in articles:
-        text = (article.get('title', '') + ' ' + article.get('summary', '') + ' ' + article.get('content', '')).lower()
-        matched = []
-        for entry in score_words:
-            word = entry.get('word', '').lower()
-            if word and word in text:
-                count = text.count(word)
-                matched.append(f"{word} (x{count})")
-        article['matched_words'] = ', '.join(matched) if matched else 'No score words found'
+        article['matched_words'] = describe_word_matches(article['word_matches'])
 
     return render_template('index.html', articles=articles, user_id=user_id, username=session.get('username'))
 
 
 # --- API: Articles by Geo-tag ---
 @app.route('/api/articles_by_tag')
+@cached_response(('articles', 'geo_tags'))
 def api_articles_by_tag():
     tag = request.args.get('tag', '').strip()
     if not tag:
@@ -356,6 +571,183 @@ def api_articles_by_tag():
     return {'articles': articles}
 
 
+# --- API v1: compact article feed ---
+FEED_LIST_FIELDS = ('id', 'title', 'url', 'source', 'published_date', 'score', 'thumbnail_url')
+FEED_DETAIL_FIELDS = FEED_LIST_FIELDS + ('summary', 'content', 'geo_tags')
+FEED_ALL_FIELDS = frozenset(DatabaseManager.FEED_COLUMNS) | {'geo_tags'}
+FEED_DEFAULT_LIMIT = 50
+FEED_MAX_LIMIT = 200
+FEED_TABLES = ('articles', 'geo_tags', 'excluded_tags')
+FEED_VARY = ('Accept', 'Accept-Encoding')
+
+
+def _feed_variant():
+    try:
+        fmt = choose_format(request.args.get('format'), request.accept_mimetypes)
+    except UnsupportedFormat:
+        return None
+    return fmt, choose_encoding(request.accept_encodings)
+
+
+def _feed_fields(default):
+    """Requested ``?fields=`` as a tuple, or None if any of them is unknown."""
+    raw = request.args.get('fields', '').strip()
+    if not raw:
+        return default
+    fields = tuple(dict.fromkeys(field.strip() for field in raw.split(',') if field.strip()))
+    if not fields or not FEED_ALL_FIELDS.issuperset(fields):
+        return None
+    return fields
+
+
+def _feed_response(payload):
+    """Encode ``payload`` in the negotiated format and content coding."""
+    try:
+        fmt = choose_format(request.args.get('format'), request.accept_mimetypes)
+    except UnsupportedFormat as e:
+        return {'error': str(e)}, 406
+    body, mimetype = encode(payload, fmt)
+    body, encoding = compress(body, choose_encoding(request.accept_encodings))
+    response = app.response_class(body, mimetype=mimetype)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.update(FEED_VARY)
+    return response
+
+
+def _feed_list(source=None, tag=None):
+    fields = _feed_fields(FEED_LIST_FIELDS)
+    if fields is None:
+        return {'error': f"Unknown field; choose from {', '.join(sorted(FEED_ALL_FIELDS))}"}, 400
+    try:
+        limit = int(request.args.get('limit', FEED_DEFAULT_LIMIT))
+        offset = int(request.args.get('offset', 0))
+    except ValueError:
+        return {'error': 'limit and offset must be integers'}, 400
+    limit = max(1, min(limit, FEED_MAX_LIMIT))
+    offset = max(0, offset)
+    articles = db.get_article_feed(fields, limit=limit, offset=offset, source=source, tag=tag)
+    next_offset = offset + limit if len(articles) == limit else None
+    return _feed_response({'articles': articles, 'next_offset': next_offset})
+
+
+@app.route('/api/v1/articles')
+@cached_response(FEED_TABLES, variant=_feed_variant, vary=FEED_VARY)
+def api_v1_articles():
+    source = request.args.get('source', '').strip() or None
+    tag = request.args.get('tag', '').strip() or None
+    return _feed_list(source=source, tag=tag)
+
+
+@app.route('/api/v1/articles/<int:article_id>')
+@cached_response(FEED_TABLES, variant=_feed_variant, vary=FEED_VARY)
+def api_v1_article(article_id):
+    fields = _feed_fields(FEED_DETAIL_FIELDS)
+    if fields is None:
+        return {'error': f"Unknown field; choose from {', '.join(sorted(FEED_ALL_FIELDS))}"}, 400
+    articles = db.get_article_feed(fields, limit=1, article_id=article_id)
+    if not articles:
+        return {'error': 'Article not found'}, 404
+    return _feed_response({'article': articles[0]})
+
+
+@app.route('/api/v1/articles/by-tag/<tag>')
+@cached_response(FEED_TABLES, variant=_feed_variant, vary=FEED_VARY)
+def api_v1_articles_by_tag(tag):
+    return _feed_list(tag=tag)
+
+
+@app.route('/api/v1/articles/by-source/<source>')
+@cached_response(FEED_TABLES, variant=_feed_variant, vary=FEED_VARY)
+def api_v1_articles_by_source(source):
+    return _feed_list(source=source)
+
+
+# --- API: live ingest stream (Server-Sent Events) ---
+STREAM_POLL_SECONDS = 1.0
+STREAM_HEARTBEAT_SECONDS = 15.0
+# Connections are closed after this long; EventSource reconnects with Last-Event-ID
+STREAM_MAX_SECONDS = 300.0
+STREAM_RETRY_MS = 3000
+STREAM_BATCH_SIZE = 500
+
+
+def _sse(event, data, event_id=None):
+    lines = [] if event_id is None else [f'id: {event_id}']
+    lines.append(f'event: {event}')
+    lines.append('data: ' + dumps_json(data).decode('utf-8'))
+    return '\n'.join(lines) + '\n\n'
+
+
+def _stream_messages(events, last_id):
+    """SSE messages for one batch: an 'article' card per new article, then the batch's
+    'duplicate' ids and 'geo' deltas (grouped by tag) under the id of the last event."""
+    messages = []
+    duplicate_ids = []
+    geo = {}
+    for event in events:
+        if event['kind'] == 'article':
+            card = dict(event['article'])
+            # Only the locally cached copy, never the third-party URL (no hotlinking)
+            key = get_thumbnail_cache().lookup(card.pop('thumbnail_url'))
+            card['thumbnail'] = url_for('thumbnail', key=key) if key else None
+            messages.append(_sse('article', card, event['id']))
+        elif event['kind'] == 'duplicate':
+            duplicate_ids.append(event['article_id'])
+        elif event['kind'] == 'geo':
+            entry = geo.setdefault(event['tag'], {'tag': event['tag'], 'lat': event['lat'], 'lon': event['lon'], 'count': 0})
+            entry['count'] += 1
+    if duplicate_ids:
+        messages.append(_sse('duplicate', {'ids': duplicate_ids}, last_id))
+    if geo:
+        messages.append(_sse('geo', {'tags': list(geo.values())}, last_id))
+    return messages
+
+
+@app.route('/api/stream')
+def api_stream():
+    """Push newly ingested articles and geo-tag deltas to the browser.
+
+    Tails ``ingest_events`` (filled by triggers whichever process ingests) from the
+    ``Last-Event-ID`` header or ``?since=``, or from now for a fresh connection.
+    """
+    resume_from = request.headers.get('Last-Event-ID') or request.args.get('since')
+    if resume_from:
+        try:
+            last_id = max(0, int(resume_from))
+        except ValueError:
+            return {'error': 'Last-Event-ID must be an integer'}, 400
+    else:
+        last_id = db.get_latest_ingest_event_id()
+    stream_db = db
+    poll = app.config.get('STREAM_POLL_SECONDS', STREAM_POLL_SECONDS)
+    heartbeat = app.config.get('STREAM_HEARTBEAT_SECONDS', STREAM_HEARTBEAT_SECONDS)
+    max_seconds = app.config.get('STREAM_MAX_SECONDS', STREAM_MAX_SECONDS)
+
+    def generate(last_id):
+        started = last_sent = time.monotonic()
+        yield f'retry: {STREAM_RETRY_MS}\n\n'
+        while True:
+            events, last_id = stream_db.get_ingest_events(last_id, limit=STREAM_BATCH_SIZE)
+            messages = _stream_messages(events, last_id)
+            if messages:
+                yield ''.join(messages)
+                last_sent = time.monotonic()
+            now = time.monotonic()
+            if now - started >= max_seconds:
+                return
+            if now - last_sent >= heartbeat:
+                yield ': keep-alive\n\n'
+                last_sent = now
+            time.sleep(poll)
+
+    response = app.response_class(stream_with_context(generate(last_id)), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Stop reverse proxies (nginx) from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
 
 
 if __name__ == '__main__':
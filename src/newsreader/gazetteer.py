@@ -0,0 +1,183 @@
+"""Process-wide geo-place gazetteer shared by every geo-tagging code path.
+
+``data/geo_places.json`` (generated by ``scripts/generate_geo_places.py``) can hold tens
+of thousands of places. Instead of parsing it for every article, it is compiled once
+into a ``Gazetteer`` (places de-duplicated case-insensitively plus a
+``PlaceMatcher`` automaton over all of them) and pickled to
+``SETTINGS.gazetteer_cache_path``. Later processes load the pickle directly; it is
+rebuilt whenever the JSON's path, size or mtime no longer match.
+
+Entries are either plain names or objects carrying coordinates for the offline
+geocoder::
+
+    ["Aarhus", {"name": "Odense", "lat": 55.3959, "lon": 10.3883, "population": 180302, "country": "Denmark"}]
+
+When a name occurs more than once (e.g. Paris, France and Paris, Texas) the most
+populous entry wins.
+
+``get_gazetteer()`` returns the shared instance and reloads it when the JSON changes,
+so ``NLPProcessor`` and ``DatabaseManager.geo_tag_all_articles`` always agree.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from .place_matcher import PlaceMatcher
+
+logger = logging.getLogger(__name__)
+
+# Bump when the pickled layout changes so stale caches are rebuilt
+CACHE_FORMAT_VERSION = 3
+
+
+class PlaceInfo(NamedTuple):
+    name: str
+    lat: Optional[float] = None
+    lon: Optional[float] = None
+    population: Optional[int] = None
+    country: Optional[str] = None
+
+
+def _place_info(entry: Union[str, Dict]) -> Optional[PlaceInfo]:
+    if isinstance(entry, str):
+        name = entry.strip()
+        return PlaceInfo(name) if name else None
+    if not isinstance(entry, dict) or not str(entry.get('name') or '').strip():
+        return None
+
+    def number(key, cast):
+        try:
+            value = entry.get(key)
+            return cast(value) if value not in (None, '') else None
+        except (TypeError, ValueError):
+            return None
+
+    lon = number('lon', float)
+    return PlaceInfo(
+        name=str(entry['name']).strip(),
+        lat=number('lat', float),
+        lon=lon if lon is not None else number('lng', float),
+        population=number('population', lambda value: int(float(value))),
+        country=entry.get('country') or None,
+    )
+
+
+def _fingerprint(path: Path) -> Tuple[str, int, int]:
+    stat = path.stat()
+    return str(path.resolve()), stat.st_size, stat.st_mtime_ns
+
+
+class Gazetteer:
+    def __init__(self, places: Iterable[Union[str, Dict]], fingerprint: Optional[Tuple[str, int, int]] = None):
+        unique: Dict[str, PlaceInfo] = {}
+        for entry in places:
+            info = _place_info(entry)
+            if info is None:
+                continue
+            current = unique.get(info.name.lower())
+            if current is None or (info.lat is not None and (current.lat is None or (info.population or 0) > (current.population or 0))):
+                # Keep the first spelling seen, but the best-located entry's details
+                unique[info.name.lower()] = info if current is None else info._replace(name=current.name)
+        self.entries: Dict[str, PlaceInfo] = unique
+        self.places: Tuple[str, ...] = tuple(info.name for info in unique.values())
+        self.fingerprint = fingerprint
+        self.matcher = PlaceMatcher(self.places)
+
+    def __len__(self) -> int:
+        return len(self.places)
+
+    def lookup(self, place: str) -> Optional[PlaceInfo]:
+        """Gazetteer entry for ``place`` (case-insensitive)."""
+        return self.entries.get(place.lower())
+
+    def find_matches(self, text: str) -> List[Tuple[int, int, str]]:
+        """Every mention of a place in ``text`` as ``(start, end, place)``."""
+        return self.matcher.find_all(text)
+
+    def find_places(self, text: str) -> List[str]:
+        """Distinct places mentioned in ``text`` (case-insensitive, whole words), in order of first mention."""
+        return list(dict.fromkeys(place for _, _, place in self.matcher.find_all(text)))
+
+    # -- loading -------------------------------------------------------------------
+
+    @classmethod
+    def from_json(cls, path: Path) -> 'Gazetteer':
+        path = Path(path)
+        fingerprint = _fingerprint(path)
+        with path.open('r', encoding='utf-8') as fh:
+            return cls(json.load(fh), fingerprint)
+
+    @classmethod
+    def load(cls, path: Path, cache_path: Optional[Path] = None) -> 'Gazetteer':
+        """Load the compiled gazetteer for ``path``, rebuilding ``cache_path`` if it is stale."""
+        path = Path(path)
+        fingerprint = _fingerprint(path)
+        if cache_path is not None:
+            cached = cls._read_cache(Path(cache_path), fingerprint)
+            if cached is not None:
+                return cached
+        gazetteer = cls.from_json(path)
+        logger.info(f"Compiled gazetteer with {len(gazetteer)} places from {path}")
+        if cache_path is not None:
+            gazetteer._write_cache(Path(cache_path))
+        return gazetteer
+
+    @staticmethod
+    def _read_cache(cache_path: Path, fingerprint: Tuple[str, int, int]) -> Optional['Gazetteer']:
+        try:
+            with cache_path.open('rb') as fh:
+                version, cached_fingerprint, gazetteer = pickle.load(fh)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable gazetteer cache {cache_path}: {e}")
+            return None
+        if version != CACHE_FORMAT_VERSION or tuple(cached_fingerprint) != fingerprint:
+            return None
+        return gazetteer
+
+    def _write_cache(self, cache_path: Path) -> None:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=str(cache_path.parent), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as fh:
+                    pickle.dump((CACHE_FORMAT_VERSION, self.fingerprint, self), fh, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_name, cache_path)
+            except Exception:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+                raise
+        except OSError as e:
+            logger.warning(f"Could not write gazetteer cache {cache_path}: {e}")
+
+
+_GAZETTEER: Optional[Gazetteer] = None
+_GAZETTEER_LOCK = threading.Lock()
+
+
+def get_gazetteer(path: Optional[Path] = None) -> Gazetteer:
+    """Return the process-wide gazetteer for ``path`` (default: ``SETTINGS.default_geo_places_path``).
+
+    The JSON is only stat()ed on each call; it is re-read when it has changed on disk.
+    """
+    global _GAZETTEER
+    from .settings import get_settings
+
+    settings = get_settings()
+    path = Path(path or settings.default_geo_places_path)
+    with _GAZETTEER_LOCK:
+        fingerprint = _fingerprint(path)
+        if _GAZETTEER is None or _GAZETTEER.fingerprint != fingerprint:
+            _GAZETTEER = Gazetteer.load(path, settings.gazetteer_cache_path)
+        return _GAZETTEER
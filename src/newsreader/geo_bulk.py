@@ -0,0 +1,162 @@
+"""Resumable bulk geo-tagging of the article archive.
+
+Untagged articles are streamed from one anti-join query in id order, ``batch_size`` at
+a time, tagged either in-process or by a pool of worker processes, and written back
+one chunk per transaction together with a checkpoint (the last article id done). An
+interrupted run resumes after the checkpoint; a completed run clears it.
+
+Worker processes build their own ``NLPProcessor`` and ``DatabaseManager`` (read-only
+use) and load the compiled gazetteer from its pickle cache. They resolve places
+offline and from the geocode cache only: parallel workers would break Nominatim's
+one-request-per-second policy, so places that still need an online lookup are left
+for a single-process run (``workers=1``).
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_NAME = 'geo_tag_all_articles'
+
+ProgressCallback = Callable[[int, int], None]
+
+
+def _tag_rows(nlp_processor, db, rows: List[Dict], not_found_callback=None) -> List[List[Dict]]:
+    """Geo-tags for each row, batched through ``enrich_many`` when the processor has it."""
+    if hasattr(nlp_processor, 'enrich_many'):
+        results = nlp_processor.enrich_many(rows, db_manager=db, batch_size=len(rows), not_found_callback=not_found_callback)
+        return [result['geo_tags'] for result in results]
+    return [
+        nlp_processor.extract_geo_tags(row['content'] or "", title=row['title'], summary=row['summary'],
+                                       db_manager=db, not_found_callback=not_found_callback)
+        for row in rows
+    ]
+
+
+# -- worker processes ----------------------------------------------------------------
+
+_WORKER: Optional[Tuple[object, object]] = None
+
+
+def offline_processor(offline_geocoding: bool = True):
+    from .nlp_processor import NLPProcessor
+
+    return NLPProcessor(offline_geocoding=offline_geocoding, nominatim_fallback=False)
+
+
+def _init_worker(db_path: str, processor_factory: Callable[[], object]) -> None:
+    global _WORKER
+    from .database import DatabaseManager
+    from .gazetteer import get_gazetteer
+
+    try:
+        get_gazetteer()
+    except (OSError, ValueError) as e:
+        logger.warning(f"Geo places list unavailable in worker: {e}")
+    _WORKER = (processor_factory(), DatabaseManager(db_path))
+
+
+def _tag_chunk_in_worker(rows: List[Dict]) -> Tuple[List[List[Dict]], List[str]]:
+    nlp_processor, db = _WORKER
+    not_found: List[str] = []
+    return _tag_rows(nlp_processor, db, rows, not_found.append), not_found
+
+
+# -- driver --------------------------------------------------------------------------
+
+def _iter_chunks(db, start_after: int, batch_size: int) -> Iterator[List[Dict]]:
+    last_id = start_after
+    while True:
+        rows = db.get_untagged_articles(after_id=last_id, limit=batch_size)
+        if not rows:
+            return
+        last_id = rows[-1]['id']
+        yield rows
+
+
+def _tag_in_pool(db, chunks: Iterator[List[Dict]], workers: int, processor_factory,
+                 not_found_callback) -> Iterator[Tuple[List[Dict], List[List[Dict]]]]:
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                             initargs=(str(db.db_path), processor_factory)) as executor:
+        in_flight = deque()
+        for rows in chunks:
+            in_flight.append((rows, executor.submit(_tag_chunk_in_worker, rows)))
+            # Keep every worker busy without reading the whole archive ahead
+            if len(in_flight) >= workers * 2:
+                yield _collect(in_flight.popleft(), not_found_callback)
+        while in_flight:
+            yield _collect(in_flight.popleft(), not_found_callback)
+
+
+def _collect(entry, not_found_callback):
+    rows, future = entry
+    tag_lists, not_found = future.result()
+    if not_found_callback:
+        for place in not_found:
+            not_found_callback(place)
+    return rows, tag_lists
+
+
+def run_geo_tagging(db, nlp_processor, batch_size: int = 32, workers: int = 1,
+                    progress: Optional[ProgressCallback] = None, not_found_callback=None,
+                    processor_factory: Optional[Callable[[], object]] = None) -> Dict:
+    """Tag every untagged article, resuming from the last checkpoint. Returns run statistics.
+
+    ``workers > 1`` fans chunks out to worker processes built by ``processor_factory``
+    (default: an offline-only ``NLPProcessor``); this needs a processor with
+    ``enrich_many`` (or an explicit factory), otherwise tagging stays in-process.
+    With the default factory, places that need Nominatim are skipped; the returned
+    ``offline_only`` flag says so and a warning is logged.
+    """
+    batch_size = max(1, int(batch_size))
+    checkpoint = db.get_bulk_job_checkpoint(CHECKPOINT_NAME)
+    start_after = checkpoint['last_id'] if checkpoint else 0
+    processed = checkpoint['processed'] if checkpoint else 0
+    total = processed + db.count_untagged_articles(after_id=start_after)
+    if checkpoint:
+        logger.info(f"Resuming geo-tagging after article {start_after} ({processed} already done)")
+    logger.info(f"Geo-tagging {total - processed} untagged articles with {workers} worker(s)")
+
+    chunks = _iter_chunks(db, start_after, batch_size)
+    offline_only = False
+    if workers > 1 and (processor_factory or hasattr(nlp_processor, 'enrich_many')):
+        offline_only = processor_factory is None and getattr(nlp_processor, 'nominatim_fallback', True)
+        if offline_only:
+            logger.warning(
+                f"Geo-tagging with {workers} offline-only workers: places that need Nominatim are "
+                "skipped; run with workers=1 to resolve them online"
+            )
+        factory = processor_factory or partial(offline_processor, getattr(nlp_processor, 'offline_geocoding', True))
+        results = _tag_in_pool(db, chunks, workers, factory, not_found_callback)
+    else:
+        results = ((rows, _tag_rows(nlp_processor, db, rows, not_found_callback)) for rows in chunks)
+
+    started = time.time()
+    tagged_articles = tags_written = 0
+    for rows, tag_lists in results:
+        processed += len(rows)
+        pairs = list(zip((row['id'] for row in rows), tag_lists))
+        tags_written += db.save_geo_tag_chunk(pairs, CHECKPOINT_NAME, rows[-1]['id'], processed)
+        tagged_articles += sum(1 for _, tags in pairs if tags)
+        logger.info(f"Geo-tagged {processed}/{total} articles ({time.time() - started:.1f}s)")
+        if progress:
+            progress(processed, total)
+
+    db.clear_bulk_job_checkpoint(CHECKPOINT_NAME)
+    return {
+        'processed': processed,
+        'tagged_articles': tagged_articles,
+        'tags': tags_written,
+        'resumed_after': start_after,
+        'seconds': round(time.time() - started, 3),
+        'offline_only': offline_only,
+    }
@@ -0,0 +1,116 @@
+"""Grid bucketing of geo-tags for the heat-map.
+
+``/api/geo_tags`` returns one row per geo-tag, so its payload grows with the archive.
+The heat-map instead asks ``/api/geo_heatmap`` for the visible bounding box at the
+current zoom level and gets one weighted point per square cell of roughly
+``CELL_PIXELS`` screen pixels, so the response size depends on the viewport, not on
+how many articles have been tagged.
+
+Cells are read from the ``geo_cell_daily`` rollup, which holds per-day weights for
+every cell at each of ``ROLLUP_LEVELS`` and is maintained by triggers on ``geo_tags``.
+A request uses the finest rollup level not finer than its zoom; beyond the finest
+level the raw geo-tags in the box are bucketed instead (via the ``geo_tags_rtree``
+index), which is cheap because the box is small.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+# Approximate on-screen size of one grid cell, and the size of a map tile, in pixels
+CELL_PIXELS = 32
+TILE_PIXELS = 256
+MAX_ZOOM = 18
+DEFAULT_MAX_POINTS = 1000
+# Zoom levels whose grids are kept in the geo_cell_daily rollup
+ROLLUP_LEVELS = (0, 2, 4, 6, 8, 10, 12)
+
+WORLD = (-180.0, -90.0, 180.0, 90.0)
+
+
+class BBox(NamedTuple):
+    west: float
+    south: float
+    east: float
+    north: float
+
+
+def cell_size_for_zoom(zoom: int) -> float:
+    """Cell edge in degrees at ``zoom`` (Web-Mercator tile zoom levels 0..18)."""
+    zoom = max(0, min(MAX_ZOOM, int(zoom)))
+    return 360.0 / (2 ** zoom) * CELL_PIXELS / TILE_PIXELS
+
+
+def rollup_level_for_zoom(zoom: int):
+    """The rollup level to serve ``zoom`` from, or None if it needs the raw geo-tags."""
+    zoom = max(0, int(zoom))
+    if zoom > ROLLUP_LEVELS[-1]:
+        return None
+    return max(level for level in ROLLUP_LEVELS if level <= zoom)
+
+
+def cell_range(bbox: BBox, cell_size: float) -> Tuple[int, int, int, int]:
+    """Inclusive ``(min_y, max_y, min_x, max_x)`` cell indexes covering a normalised box."""
+    return (int((bbox.south + 90.0) // cell_size), int((bbox.north + 90.0) // cell_size),
+            int((bbox.west + 180.0) // cell_size), int((bbox.east + 180.0) // cell_size))
+
+
+def parse_bbox(raw: str) -> BBox:
+    """Parse ``west,south,east,north`` (Leaflet's ``getBounds().toBBoxString()``).
+
+    Raises ``ValueError`` for malformed input.
+    """
+    if not raw:
+        return BBox(*WORLD)
+    parts = [float(part) for part in raw.split(',')]
+    if len(parts) != 4:
+        raise ValueError('bbox must be west,south,east,north')
+    west, south, east, north = parts
+    if south > north:
+        raise ValueError('bbox south must not exceed north')
+    return BBox(west, max(-90.0, south), east, min(90.0, north))
+
+
+def split_bbox(bbox: BBox) -> List[BBox]:
+    """Normalise longitudes into [-180, 180], splitting boxes that cross the antimeridian."""
+    if bbox.east - bbox.west >= 360.0:
+        return [BBox(-180.0, bbox.south, 180.0, bbox.north)]
+    west = (bbox.west + 180.0) % 360.0 - 180.0
+    east = (bbox.east + 180.0) % 360.0 - 180.0
+    if west <= east:
+        return [BBox(west, bbox.south, east, bbox.north)]
+    return [BBox(west, bbox.south, 180.0, bbox.north), BBox(-180.0, bbox.south, east, bbox.north)]
+
+
+def merge_cells(rows: Iterable[Tuple], max_points: int = DEFAULT_MAX_POINTS) -> Tuple[List[Dict], bool]:
+    """Fold ``(cell_y, cell_x, tag, weight, lat_sum, lon_sum)`` rows into one point per cell.
+
+    Each point sits at the mean position of its geo-tags and carries the total weight,
+    the most frequent tag and the number of distinct tags. Returns the ``max_points``
+    heaviest points and whether any were dropped.
+    """
+    cells: Dict[Tuple[int, int], Dict] = {}
+    for cell_y, cell_x, tag, weight, lat_sum, lon_sum in rows:
+        cell = cells.get((cell_y, cell_x))
+        if cell is None:
+            cell = cells[(cell_y, cell_x)] = {'weight': 0, 'lat_sum': 0.0, 'lon_sum': 0.0,
+                                              'tag': tag, 'tag_weight': 0, 'tags': 0}
+        cell['weight'] += weight
+        cell['lat_sum'] += lat_sum
+        cell['lon_sum'] += lon_sum
+        cell['tags'] += 1
+        if weight > cell['tag_weight'] or (weight == cell['tag_weight'] and tag < cell['tag']):
+            cell['tag'], cell['tag_weight'] = tag, weight
+
+    ranked = sorted(cells.values(), key=lambda cell: (-cell['weight'], cell['tag']))
+    points = [
+        {
+            'lat': round(cell['lat_sum'] / cell['weight'], 5),
+            'lon': round(cell['lon_sum'] / cell['weight'], 5),
+            'weight': cell['weight'],
+            'tag': cell['tag'],
+            'tags': cell['tags'],
+        }
+        for cell in ranked[:max_points]
+    ]
+    return points, len(ranked) > max_points
@@ -0,0 +1,95 @@
+"""Positive geocode cache: an in-memory LRU in front of the ``geo_cache`` table.
+
+``extract_geo_tags`` used to remember only failures (``geo_tag_not_found``), so every
+mention of a known place went back to Nominatim, followed by the mandatory 1s pause.
+Successful lookups are now stored per place (lower-cased) with their coordinates,
+importance and a TTL. Lookups check the process-local LRU first and the table second,
+so a warmed-up process geo-tags without any network calls or, mostly, any queries.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional
+
+DEFAULT_TTL_SECONDS = 90 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+class GeoCodeResult(NamedTuple):
+    lat: float
+    lon: float
+    importance: Optional[float]
+
+
+class GeoCache:
+    def __init__(self, db, max_entries: int = DEFAULT_MAX_ENTRIES, ttl_seconds: int = DEFAULT_TTL_SECONDS):
+        self.db = db
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = int(ttl_seconds)
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, place: str) -> Optional[GeoCodeResult]:
+        """Cached coordinates for ``place``, or None if unknown or expired."""
+        key = place.lower()
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                result, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return result
+                del self._entries[key]
+
+        row = self.db.get_geo_cache(key)
+        if row is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        result = GeoCodeResult(row['lat'], row['lon'], row['importance'])
+        self._remember(key, result, row['expires_at'])
+        with self._lock:
+            self.hits += 1
+        return result
+
+    def put(self, place: str, lat: float, lon: float, importance: Optional[float] = None) -> GeoCodeResult:
+        key = place.lower()
+        result = GeoCodeResult(lat, lon, importance)
+        self.db.save_geo_cache(key, lat, lon, importance, self.ttl_seconds)
+        self._remember(key, result, time.time() + self.ttl_seconds)
+        return result
+
+    def _remember(self, key: str, result: GeoCodeResult, expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (result, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Forget the in-memory entries (the table is left alone)."""
+        with self._lock:
+            self._entries.clear()
+
+
+_CACHES: Dict[str, GeoCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_geo_cache(db) -> Optional[GeoCache]:
+    """Return the process-wide cache for ``db``'s database file (None if ``db`` has no geo_cache table)."""
+    if not hasattr(db, 'get_geo_cache'):
+        return None
+    key = str(getattr(db, 'db_path', id(db)))
+    with _CACHES_LOCK:
+        cache = _CACHES.get(key)
+        if cache is None:
+            cache = _CACHES[key] = GeoCache(db)
+        return cache
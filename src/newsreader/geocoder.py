@@ -0,0 +1,62 @@
+"""Geocoder backends used by ``NLPProcessor.extract_geo_tags``.
+
+``OfflineGeocoder`` resolves a matched place from the coordinates carried by the
+gazetteer itself (``scripts/generate_geo_places.py`` keeps lat/lon, population and
+country from the world-cities CSV), so it needs no network and has no rate limit.
+``NominatimGeocoder`` is the original online lookup; it is only consulted for places
+the gazetteer has no coordinates for, and can be switched off entirely with
+``"nominatim_fallback": false`` in ``sources.json``.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import time
+from typing import Optional
+
+from .gazetteer import Gazetteer, get_gazetteer
+from .geocache import GeoCodeResult
+
+logger = logging.getLogger(__name__)
+
+
+def population_confidence(population: Optional[int]) -> Optional[float]:
+    """Map a population onto the 0..1 range Nominatim uses for ``importance``."""
+    if not population:
+        return None
+    return round(min(1.0, math.log10(population + 1) / 8.0), 3)
+
+
+class OfflineGeocoder:
+    def __init__(self, gazetteer: Optional[Gazetteer] = None):
+        # None: always use the shared gazetteer, so a regenerated geo_places.json is picked up
+        self.gazetteer = gazetteer
+
+    def geocode(self, place: str) -> Optional[GeoCodeResult]:
+        info = (self.gazetteer or get_gazetteer()).lookup(place)
+        if info is None or info.lat is None or info.lon is None:
+            return None
+        return GeoCodeResult(info.lat, info.lon, population_confidence(info.population))
+
+
+class NominatimGeocoder:
+    def __init__(self, user_agent: str = 'newsreader-geo', timeout: int = 10, delay: float = 1.0):
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.delay = delay
+        self._client = None
+
+    def geocode(self, place: str) -> Optional[GeoCodeResult]:
+        """Look ``place`` up online (None if Nominatim has no result); waits ``delay`` afterwards."""
+        if self._client is None:
+            from geopy.geocoders import Nominatim
+            self._client = Nominatim(user_agent=self.user_agent)
+        try:
+            location = self._client.geocode(place, addressdetails=True, timeout=self.timeout)
+        finally:
+            # Nominatim's usage policy allows at most one request per second
+            time.sleep(self.delay)
+        if not location:
+            return None
+        return GeoCodeResult(location.latitude, location.longitude, location.raw.get('importance'))
@@ -0,0 +1,187 @@
+"""Background jobs for long-running admin operations.
+
+Purging and re-fetching every source, re-running geo-tagging over the archive and
+re-scoring all articles take minutes. Instead of running inside the HTTP request, the
+routes submit them to a ``JobRunner``: a small pool of worker threads that records each
+job in the ``jobs`` table (status, progress, result or error) so it can be polled,
+listed on ``/admin/jobs`` and cancelled, and keeps running when the browser goes away.
+
+Job functions take a ``JobContext`` and return a JSON-serialisable result. Cancelling
+is cooperative: ``JobContext.progress()`` raises ``JobCancelled`` once a cancel has
+been requested, so a job stops at its next progress report. Jobs left ``queued`` or
+``running`` by a process that no longer exists are marked failed when jobs are next
+listed or submitted on the same host.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+# Progress is written to the jobs table at most this often (seconds)
+PROGRESS_INTERVAL = 0.5
+
+JobFunction = Callable[['JobContext'], Optional[Dict]]
+
+
+class JobCancelled(Exception):
+    """Raised inside a job once a cancel has been requested."""
+
+
+def _owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobContext:
+    """Handle passed to a running job for progress reports and cancel checks."""
+
+    def __init__(self, db, job_id: int, cancel_event: threading.Event):
+        self.db = db
+        self.job_id = job_id
+        self._cancel_event = cancel_event
+        self._last_flush = 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        if not self._cancel_event.is_set() and self.db.is_job_cancel_requested(self.job_id):
+            # Cancelled from another process sharing the database
+            self._cancel_event.set()
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self) -> None:
+        if self.cancelled:
+            raise JobCancelled()
+
+    def progress(self, done: int, total: Optional[int] = None, message: Optional[str] = None) -> None:
+        """Record progress (throttled) and stop the job if it has been cancelled."""
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+        now = time.monotonic()
+        if message is None and now - self._last_flush < PROGRESS_INTERVAL and (total is None or done < total):
+            return
+        self._last_flush = now
+        fields = {'progress': done}
+        if total is not None:
+            fields['total'] = total
+        if message is not None:
+            fields['message'] = message
+        self.db.update_job(self.job_id, **fields)
+        self.check_cancelled()
+
+
+class JobRunner:
+    def __init__(self, workers: int = 2):
+        self.workers = max(1, int(workers))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._cancel_events: Dict[int, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='newsreader-job')
+            return self._executor
+
+    def submit(self, db, kind: str, func: JobFunction, created_by: Optional[int] = None,
+               inline: bool = False) -> Dict:
+        """Queue ``func`` as a job of ``kind`` and return the job row.
+
+        An active job of the same kind for the same user is returned instead of starting a
+        second one (enforced by a unique index, so concurrent submits from other threads or
+        processes cannot both start). ``inline`` runs the job in the calling thread (tests, scripts).
+        """
+        self.recover_interrupted(db)
+        cancel_event = threading.Event()
+        with self._lock:
+            job_id = db.create_job(kind, created_by=created_by, owner=_owner())
+            if job_id is None:
+                return db.get_active_job(kind, created_by)
+            self._cancel_events[job_id] = cancel_event
+        if inline:
+            self._run(db, job_id, func, cancel_event)
+        else:
+            self._get_executor().submit(self._run, db, job_id, func, cancel_event)
+        return db.get_job(job_id)
+
+    def _run(self, db, job_id: int, func: JobFunction, cancel_event: threading.Event) -> None:
+        context = JobContext(db, job_id, cancel_event)
+        try:
+            if context.cancelled:
+                db.finish_job(job_id, CANCELLED, message='Cancelled before start')
+                return
+            db.start_job(job_id)
+            result = func(context)
+            db.finish_job(job_id, SUCCEEDED, result=result or {})
+        except JobCancelled:
+            logger.info(f"Job {job_id} cancelled")
+            db.finish_job(job_id, CANCELLED, message='Cancelled')
+        except Exception as exc:
+            logger.exception(f"Job {job_id} failed")
+            db.finish_job(job_id, FAILED, error=str(exc) or exc.__class__.__name__)
+        finally:
+            with self._lock:
+                self._cancel_events.pop(job_id, None)
+
+    def cancel(self, db, job_id: int) -> bool:
+        """Request cancellation; False if the job does not exist or has already finished."""
+        if not db.request_job_cancel(job_id):
+            return False
+        with self._lock:
+            event = self._cancel_events.get(job_id)
+        if event:
+            event.set()
+        return True
+
+    def recover_interrupted(self, db) -> int:
+        """Mark active jobs whose owning process on this host has exited as failed."""
+        host, own_pid = _owner().rsplit(':', 1)
+        recovered = 0
+        for job in db.get_jobs(statuses=ACTIVE_STATUSES):
+            job_host, _, pid = (job['owner'] or '').rpartition(':')
+            if job_host != host or not pid.isdigit():
+                continue
+            if pid == own_pid:
+                with self._lock:
+                    orphaned = job['id'] not in self._cancel_events
+            else:
+                orphaned = not _pid_alive(int(pid))
+            if orphaned:
+                db.finish_job(job['id'], FAILED, error='Interrupted: the process running this job exited')
+                recovered += 1
+        if recovered:
+            logger.warning(f"Marked {recovered} interrupted job(s) as failed")
+        return recovered
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=wait)
+
+    def list_jobs(self, db, limit: int = 50) -> List[Dict]:
+        self.recover_interrupted(db)
+        return db.get_jobs(limit=limit)
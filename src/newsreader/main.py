@@ -15,6 +15,7 @@ Usage:
     python main.py --daemon           # Run background daemon
     python main.py --stack            # Run web and daemon together with supervision
     python main.py --fetch            # Fetch articles once
+    python main.py --reparse          # Re-run extraction from the raw HTML archive
     python main.py --help             # Show help
 """
 
@@ -31,7 +32,6 @@ from .auth import AuthManager
 from .daemon import NewsDaemon
 from .database import DatabaseManager
 from .fetcher import NewsFetcher
-from .scorer import ArticleScorer
 from .settings import get_settings
 
 SETTINGS = get_settings()
@@ -298,13 +298,10 @@ def fetch_articles_once():
     try:
         db = DatabaseManager()
         fetcher = NewsFetcher(db)
-        scorer = ArticleScorer(db)
 
-        # Fetch articles
+        # Fetch articles (the ingest pipeline scores each new article as it is saved)
         fetcher.fetch_all_sources()
-
-        # Update scores
-        scorer.score_all_articles()
+        fetcher.enrich_articles()
 
         # Show stats
         article_count = db.get_article_count()
@@ -320,6 +317,23 @@ def fetch_articles_once():
         logging.exception("Article fetch error")
         sys.exit(1)
 
+def reparse_articles():
+    """Re-run extraction over the raw HTML archive without touching the network"""
+    print("Re-parsing archived pages...")
+    try:
+        db = DatabaseManager()
+        fetcher = NewsFetcher(db)
+        stats = fetcher.reparse_archive()
+        fetcher.enrich_articles()
+
+        print(f"Re-parse completed! {stats['updated']} articles updated from {stats['pages']} archived pages "
+              f"({stats['missing']} missing, {stats['failed']} failed).")
+
+    except Exception as e:
+        print(f"Error re-parsing articles: {e}")
+        logging.exception("Article re-parse error")
+        sys.exit(1)
+
 def show_stats():
     """Show database statistics"""
     try:
@@ -384,6 +398,7 @@ Examples:
   python main.py --daemon     # Run background daemon
   python main.py --stack      # Run web + daemon with supervision
   python main.py --fetch      # Fetch articles once
+  python main.py --reparse    # Re-run extraction from the raw HTML archive
   python main.py --stats      # Show database statistics
   python main.py --cleanup    # Clear all articles from database
   python main.py --create-admin  # Create admin user
@@ -434,6 +449,12 @@ Examples:
         help='Fetch articles once and exit'
     )
 
+    parser.add_argument(
+        '--reparse',
+        action='store_true',
+        help='Re-run article extraction from the raw HTML archive (no network) and exit'
+    )
+
     parser.add_argument(
         '--stats', '-s',
         action='store_true',
@@ -498,6 +519,10 @@ Examples:
         fetch_articles_once()
         return
 
+    if args.reparse:
+        reparse_articles()
+        return
+
     if args.stack:
         exit_code = launch_stack(
             host=args.host,
@@ -1,12 +1,20 @@
+import logging
 import nltk
 import re
 from typing import List, Dict, Tuple, Optional
 from collections import Counter
 import math
+from .gazetteer import get_gazetteer
+from .geocache import get_geo_cache
+from .geocoder import NominatimGeocoder, OfflineGeocoder
 from .settings import get_settings
+from .spacy_models import get_ner_model
 
 SETTINGS = get_settings()
 
+# spaCy entity labels that denote places (GPE: English models; LOC: Danish and English)
+NER_PLACE_LABELS = ('GPE', 'LOC')
+
 
 # Download required NLTK data
 try:
@@ -20,11 +28,8 @@ except LookupError:
     nltk.download('stopwords', quiet=True)
 
 class NLPProcessor:
-    def __init__(self):
-        import spacy
+    def __init__(self, offline_geocoding: bool = True, nominatim_fallback: bool = True):
         import logging
-        import subprocess
-        import sys
         # Set up logging once for the class
         try:
             logging.basicConfig(level=logging.DEBUG,
@@ -38,41 +43,13 @@ class NLPProcessor:
         self.logger = getattr(self, 'logger', logging.getLogger("geo-debug"))
         self.info_logger = getattr(self, 'info_logger', logging.getLogger("geo-info"))
         self.info_logger.setLevel(logging.INFO)
-        # Ensure spaCy models are loaded (download if missing)
-        def ensure_spacy_model(model_name):
-            try:
-                spacy.load(model_name)
-                return True
-            except OSError:
-                self.logger.info(f"Downloading spaCy model: {model_name}")
-                try:
-                    subprocess.run([sys.executable, "-m", "spacy", "download", model_name], check=True)
-                    spacy.load(model_name)
-                    return True
-                except Exception as exc:
-                    self.logger.warning(f"Unable to download spaCy model {model_name}: {exc}")
-                    return False
-
-        has_da_model = ensure_spacy_model('da_core_news_lg')
-        has_en_model = ensure_spacy_model('en_core_web_sm')
-        # Try Danish model, fallback to English
-        try:
-            if has_da_model:
-                self.nlp = spacy.load('da_core_news_lg')
-                self.model_used = 'da_core_news_lg'
-                self.logger.info("Loaded spaCy model: da_core_news_lg")
-            elif has_en_model:
-                self.nlp = spacy.load('en_core_web_sm')
-                self.model_used = 'en_core_web_sm'
-                self.logger.info("Loaded spaCy model: en_core_web_sm (fallback)")
-            else:
-                raise OSError("No spaCy model available")
-        except Exception:
-            # Absolute fallback to a blank Danish pipeline if model downloads are unavailable.
-            self.logger.warning("Falling back to blank Danish spaCy pipeline; install da_core_news_lg for full NER support.")
-            self.nlp = spacy.blank('da')
-            self.model_used = 'blank_da'
-        self.logger.info(f"spaCy NER model in use: {self.model_used}")
+        # Geo-tags are resolved from gazetteer coordinates; Nominatim is only asked about the rest
+        self.offline_geocoding = offline_geocoding
+        self.nominatim_fallback = nominatim_fallback
+        self.online_geocoder = NominatimGeocoder()
+        # The spaCy pipeline comes from the process-wide registry on first use (see ``nlp``)
+        self._nlp = None
+        self._model_used = None
         import nltk
         # Build a multilingual stop-word set (English + Danish) to improve keyword extraction.
         self.stop_words = set()
@@ -90,90 +67,139 @@ class NLPProcessor:
             'bliver', 'siger', 'jer', 'vi', 'de', 'den', 'som', 'for', 'med', 'hos'
         ])
 
-    def extract_geo_tags(self, text: str, title: str = None, summary: str = None, db_manager=None, not_found_callback=None) -> List[dict]:
-        """Extract location names (geo-tags) from text, title, and summary by direct matching against a list of cities and countries. Only tags if found in the list. Skips all other entity types."""
-        import json
-        import logging
-        from geopy.geocoders import Nominatim
-        import time
+    def _load_nlp(self):
+        if getattr(self, '_nlp', None) is None:
+            self._nlp, self._model_used = get_ner_model()
+            logging.getLogger("geo-debug").info(f"spaCy NER model in use: {self._model_used}")
+        return self._nlp
+
+    @property
+    def nlp(self):
+        """Shared spaCy NER pipeline, loaded once per process on first access."""
+        return self._load_nlp()
+
+    @property
+    def model_used(self) -> str:
+        self._load_nlp()
+        return self._model_used
+
+    def _geo_loggers(self):
         if not hasattr(self, 'logger'):
             self.logger = logging.getLogger("geo-debug")
         if not hasattr(self, 'info_logger'):
             self.info_logger = logging.getLogger("geo-info")
             self.info_logger.setLevel(logging.INFO)
-        logger = self.logger
-        info_logger = self.info_logger
-        # Load city/country list
-        with open(SETTINGS.default_geo_places_path, 'r', encoding='utf-8') as f:
-            geo_places = set(json.load(f))
-        all_texts = []
-        if title:
-            all_texts.append(title)
-        if summary:
-            all_texts.append(summary)
-        if text:
-            all_texts.append(text)
-        combined_text = "\n".join(all_texts)
-        tags = []
-        seen = set()
+        return self.logger, self.info_logger
+
+    @staticmethod
+    def _combine_text(text: str = None, title: str = None, summary: str = None) -> str:
+        return "\n".join(part for part in (title, summary, text) if part)
+
+    def extract_geo_tags(self, text: str, title: str = None, summary: str = None, db_manager=None, not_found_callback=None) -> List[dict]:
+        """Extract location names (geo-tags) from text, title, and summary by direct matching against a list of cities and countries. Only tags if found in the list. Skips all other entity types."""
+        logger, info_logger = self._geo_loggers()
+        # Shared, pre-compiled city/country list (reloaded only when geo_places.json changes)
+        gazetteer = get_gazetteer()
+        combined_text = self._combine_text(text, title, summary)
         logger.debug(f"Extracting geo-tags from text: {combined_text[:200]}...")
         info_logger.info(f"Extracting geo-tags from text (first 200 chars): {combined_text[:200]}...")
         if db_manager is None:
             raise ValueError("db_manager must be provided to extract_geo_tags to avoid DB lock issues during batch operations.")
-        db = db_manager
-        geolocator = Nominatim(user_agent="newsreader-geo")
-        # For each place, check if it appears in the text (case-insensitive, word-boundary)
-        import re
-        for place in geo_places:
+        # Places that appear in the text (case-insensitive, word-boundary)
+        places = [(place, 'CITY_OR_COUNTRY') for place in gazetteer.find_places(combined_text)]
+        tags = self._geocode_places(places, db_manager, not_found_callback)
+        logger.debug(f"Extracted geo-tags: {tags}")
+        info_logger.info(f"Extracted geo-tags: {tags}")
+        return tags
+
+    def _geocode_places(self, places: List[Tuple[str, str]], db, not_found_callback=None) -> List[dict]:
+        """Resolve ``(place, label)`` pairs to geo-tags, skipping known misses and places without coordinates."""
+        logger, info_logger = self._geo_loggers()
+        # Successful geocodes are reused from the LRU/geo_cache table before asking Nominatim
+        geo_cache = get_geo_cache(db)
+        offline_geocoder = OfflineGeocoder() if getattr(self, 'offline_geocoding', True) else None
+        online_geocoder = None
+        if getattr(self, 'nominatim_fallback', True):
+            online_geocoder = getattr(self, 'online_geocoder', None) or NominatimGeocoder()
+        tags = []
+        seen = set()
+        for place, label in places:
             if place.lower() in seen:
                 continue
-            # Use word boundaries to avoid partial matches
-            pattern = r'\b' + re.escape(place) + r'\b'
-            if re.search(pattern, combined_text, re.IGNORECASE):
-                seen.add(place.lower())
-                # Check not-found cache
-                if db.is_geo_tag_not_found(place):
-                    logger.debug(f"Skipping {place} (previously not found)")
-                    continue
-                lat, lon, osm_conf = None, None, None
+            seen.add(place.lower())
+            # Check not-found cache
+            if db.is_geo_tag_not_found(place):
+                logger.debug(f"Skipping {place} (previously not found)")
+                continue
+            result = offline_geocoder.geocode(place) if offline_geocoder else None
+            if result is not None:
+                logger.debug(f"Offline geocode for '{place}': lat={result.lat}, lon={result.lon}")
+            elif geo_cache and (result := geo_cache.get(place)) is not None:
+                logger.debug(f"Geocode cache hit for '{place}': lat={result.lat}, lon={result.lon}")
+            elif online_geocoder is not None:
                 try:
                     logger.debug(f"Requesting OSM geocode for: {place}")
                     info_logger.info(f"Requesting OSM geocode for: {place}")
-                    location = geolocator.geocode(place, addressdetails=True, timeout=10)
-                    if location:
-                        lat = location.latitude
-                        lon = location.longitude
-                        osm_conf = location.raw.get('importance')
-                        logger.debug(f"OSM result for '{place}': lat={lat}, lon={lon}, importance={osm_conf}")
-                        info_logger.info(f"OSM result for '{place}': lat={lat}, lon={lon}, importance={osm_conf}")
-                    else:
-                        logger.debug(f"No OSM result for '{place}'")
-                        info_logger.info(f"No OSM result for '{place}'")
-                        if not_found_callback:
-                            not_found_callback(place)
-                        else:
-                            db.add_geo_tag_not_found(place)
-                    time.sleep(1)
+                    result = online_geocoder.geocode(place)
                 except Exception as e:
                     logger.error(f"Error geocoding '{place}': {e}")
                     info_logger.info(f"Error geocoding '{place}': {e}")
+                if result is not None:
+                    logger.debug(f"OSM result for '{place}': lat={result.lat}, lon={result.lon}, importance={result.importance}")
+                    info_logger.info(f"OSM result for '{place}': lat={result.lat}, lon={result.lon}, importance={result.importance}")
+                    if geo_cache:
+                        try:
+                            geo_cache.put(place, result.lat, result.lon, result.importance)
+                        except Exception as e:
+                            logger.warning(f"Could not cache geocode for '{place}': {e}")
+                else:
+                    info_logger.info(f"No OSM result for '{place}'")
                     if not_found_callback:
                         not_found_callback(place)
                     else:
                         db.add_geo_tag_not_found(place)
-                # Only add tag if lat/lon found
-                if lat is not None and lon is not None:
-                    tags.append({
-                        'tag': place,
-                        'label': 'CITY_OR_COUNTRY',
-                        'confidence': osm_conf,
-                        'lat': lat,
-                        'lon': lon
-                    })
-        logger.debug(f"Extracted geo-tags: {tags}")
-        info_logger.info(f"Extracted geo-tags: {tags}")
+            # Only add tag if lat/lon found
+            if result is not None:
+                tags.append({
+                    'tag': place,
+                    'label': label,
+                    'confidence': result.importance,
+                    'lat': result.lat,
+                    'lon': result.lon
+                })
         return tags
 
+    def enrich_many(self, articles: List[Dict], db_manager=None, batch_size: int = 32, n_process: int = 1,
+                    not_found_callback=None, max_keywords: int = 10) -> List[Dict]:
+        """Geo-tag and keyword a batch of articles in one ``nlp.pipe`` pass.
+
+        ``articles`` are dicts with ``title``, ``summary`` and ``content``. For each one the
+        result holds ``geo_tags`` (gazetteer matches plus place entities found by NER),
+        ``entities`` (the GPE/LOC entity texts) and ``keywords`` (``(word, count)`` pairs).
+        """
+        logger, _ = self._geo_loggers()
+        if db_manager is None:
+            raise ValueError("db_manager must be provided to enrich_many to avoid DB lock issues during batch operations.")
+        gazetteer = get_gazetteer()
+        stop_words = getattr(self, 'stop_words', set())
+        texts = [self._combine_text(a.get('content'), a.get('title'), a.get('summary')) for a in articles]
+        results = []
+        for text, doc in zip(texts, self.nlp.pipe(texts, batch_size=max(1, int(batch_size)), n_process=max(1, int(n_process)))):
+            entities = list(dict.fromkeys(ent.text.strip() for ent in doc.ents if ent.label_ in NER_PLACE_LABELS and ent.text.strip()))
+            places = [(place, 'CITY_OR_COUNTRY') for place in gazetteer.find_places(text)]
+            places += [(entity, 'NER_PLACE') for entity in entities]
+            words = Counter(
+                token.lower_ for token in doc
+                if token.is_alpha and len(token) > 2 and token.lower_ not in stop_words
+            )
+            results.append({
+                'geo_tags': self._geocode_places(places, db_manager, not_found_callback),
+                'entities': entities,
+                'keywords': words.most_common(max_keywords),
+            })
+        logger.debug(f"Enriched {len(results)} articles with {self.model_used}")
+        return results
+
     def preprocess_text(self, text: str) -> str:
         """Clean and preprocess text for analysis"""
         if not text:
@@ -0,0 +1,113 @@
+"""Process-pool parse stage kept separate from the network-bound download stage.
+
+HTML parsing and text extraction (lxml + newspaper) is CPU-bound, so it runs in a
+``ProcessPoolExecutor`` that lives for the whole process and is reused across fetch
+cycles; workers import newspaper/lxml once at start-up. Submissions go through a
+bounded semaphore so downloaders block (backpressure) instead of queueing unbounded
+HTML in memory when the parse workers fall behind.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from .extraction import DEFAULT_EXTRACTION_PROFILE, extract_article_data
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_worker() -> None:
+    """Pay the newspaper/lxml import cost once per worker process."""
+    import newspaper  # noqa: F401
+    import lxml.html  # noqa: F401
+
+
+def parse_article_html(url: str, html: str, profile: str = DEFAULT_EXTRACTION_PROFILE) -> Optional[Dict]:
+    """Parse already-downloaded article HTML into the article dict (runs in a worker)."""
+    from newspaper import Article
+
+    article = Article(url)
+    article.download(input_html=html)
+    article.parse()
+    return extract_article_data(article, url, profile)
+
+
+def default_parse_workers() -> int:
+    return max(1, os.cpu_count() or 1)
+
+
+class ParsePool:
+    """Bounded submission front-end for the parse workers.
+
+    ``workers=0`` parses inline in the calling thread, which keeps single-core hosts,
+    debuggers and tests free of subprocesses.
+    """
+
+    def __init__(self, workers: int, max_pending: Optional[int] = None):
+        self.workers = max(0, int(workers))
+        self.max_pending = max(1, int(max_pending or max(self.workers, 1) * 2))
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                logger.info(f"Starting parse pool with {self.workers} worker processes (queue size {self.max_pending})")
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+            return self._executor
+
+    def submit(self, url: str, html: str, profile: str = DEFAULT_EXTRACTION_PROFILE) -> Future:
+        """Queue HTML for parsing; blocks while ``max_pending`` parses are outstanding."""
+        if self.workers == 0:
+            future: Future = Future()
+            try:
+                future.set_result(parse_article_html(url, html, profile))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        self._slots.acquire()
+        try:
+            future = self._get_executor().submit(parse_article_html, url, html, profile)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=True)
+                self._executor = None
+
+
+_POOLS: Dict[Tuple[int, int], ParsePool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_parse_pool(workers: Optional[int] = None, max_pending: Optional[int] = None) -> ParsePool:
+    """Return the process-wide parse pool for this configuration, creating it once."""
+    if workers is None:
+        workers = default_parse_workers()
+    pool = ParsePool(workers, max_pending)
+    key = (pool.workers, pool.max_pending)
+    with _POOLS_LOCK:
+        if key not in _POOLS:
+            _POOLS[key] = pool
+        return _POOLS[key]
+
+
+@atexit.register
+def shutdown_parse_pools() -> None:
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.shutdown(wait=False)
@@ -0,0 +1,184 @@
+"""Streaming ingest pipeline: discover -> download -> parse -> dedupe/persist -> geo-tag -> score.
+
+Every article flows through the stages on its own instead of waiting for the rest of
+its source's batch, so it is on the site as soon as the persist stage commits it and
+geo-tags/scores follow moments later. Stages are connected by bounded queues, so a
+slow stage applies backpressure upstream and peak memory is set by the queue sizes,
+not by ``max_articles_per_source``.
+
+Concurrency per stage:
+
+- discover + download: ``download_workers`` threads, one source per thread (keeps the
+  per-host politeness delay);
+- parse: the shared process pool from ``parse_pool`` (bounded by ``parse_queue_size``);
+- dedupe + persist: one writer thread (SQLite has a single writer anyway);
+- geo-tag: ``geo_tag_workers`` threads, each with its own ``NLPProcessor``, tagging up to
+  ``geo_batch_size`` queued articles per ``nlp.pipe`` pass;
+- score: one thread, scoring each new article with the default score words.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class IngestPipeline:
+    def __init__(self, fetcher, scorer=None, geo_workers: int = 1, persist_queue_size: int = 32,
+                 geo_queue_size: int = 64, score_queue_size: int = 64):
+        self.fetcher = fetcher
+        self.db = fetcher.db
+        self.scorer = scorer
+        self.geo_workers = max(1, int(geo_workers)) if fetcher.geo_tag_on_ingest else 0
+        self.score_on_ingest = fetcher.config.get('score_on_ingest', True)
+        self._persist_q: queue.Queue = queue.Queue(maxsize=max(1, int(persist_queue_size)))
+        self._geo_q: queue.Queue = queue.Queue(maxsize=max(1, int(geo_queue_size)))
+        self._score_q: queue.Queue = queue.Queue(maxsize=max(1, int(score_queue_size)))
+        self._lock = threading.Lock()
+        self._geo_running = self.geo_workers
+        self.counts: Counter = Counter()
+        self.saved_by_source: Counter = Counter()
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.counts[key] += 1
+
+    # -- stage workers -------------------------------------------------------------
+
+    def _persist_stage(self) -> None:
+        downstream = self._geo_q if self.geo_workers else self._score_q
+        while True:
+            article = self._persist_q.get()
+            if article is _STOP:
+                break
+            try:
+                status, article_id = self.fetcher.persist_article(article)
+            except Exception as e:
+                self._count('errors')
+                logger.error(f"Failed to save article '{article.get('title', 'unknown')[:30]}...': {e}")
+                continue
+            self._count(status)
+            if status == 'duplicate':
+                continue
+            self.saved_by_source[article.get('source')] += 1
+            if status == 'saved':
+                downstream.put((article_id, article))
+        for _ in range(self.geo_workers or 1):
+            downstream.put(_STOP)
+
+    def _geo_stage(self) -> None:
+        nlp = None
+        try:
+            from .nlp_processor import NLPProcessor
+
+            stopped = False
+            while not stopped:
+                item = self._geo_q.get()
+                if item is _STOP:
+                    break
+                # Take whatever else is already queued (up to geo_batch_size) for one nlp.pipe pass
+                batch = [item]
+                while len(batch) < self.fetcher.geo_batch_size:
+                    try:
+                        item = self._geo_q.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stopped = True
+                        break
+                    batch.append(item)
+                try:
+                    if nlp is None:
+                        nlp = NLPProcessor(nominatim_fallback=self.fetcher.config.get('nominatim_fallback', True))
+                    self.fetcher.geo_tag_articles(nlp, batch)
+                    for _ in batch:
+                        self._count('geo_tagged')
+                except Exception as e:
+                    for _ in batch:
+                        self._count('errors')
+                    logger.error(f"Failed to geo-tag articles {[article_id for article_id, _ in batch]}: {e}")
+                for item in batch:
+                    self._score_q.put(item)
+        finally:
+            with self._lock:
+                self._geo_running -= 1
+                last = self._geo_running == 0
+            if last:
+                self._score_q.put(_STOP)
+
+    def _score_stage(self) -> None:
+        score_words = None
+        while True:
+            item = self._score_q.get()
+            if item is _STOP:
+                break
+            if not self.score_on_ingest:
+                continue
+            article_id, article = item
+            try:
+                if self.scorer is None:
+                    from .scorer import ArticleScorer
+                    self.scorer = ArticleScorer(self.db)
+                if score_words is None:
+                    score_words = self.db.get_default_score_words()
+                self.scorer.score_article(article_id, article, score_words)
+                self._count('scored')
+            except Exception as e:
+                self._count('errors')
+                logger.error(f"Failed to score article {article_id}: {e}")
+
+    # -- driver --------------------------------------------------------------------
+
+    def _fetch_source(self, source: Dict, max_articles: int) -> None:
+        started = time.time()
+        try:
+            self.fetcher.fetch_source_articles(source, max_articles, emit=self._persist_q.put)
+        except Exception as e:
+            logger.error(f"[{source['name']}] Source error: {e} (time: {time.time() - started:.2f}s)")
+        else:
+            logger.info(f"[{source['name']}] Downloads complete (time: {time.time() - started:.2f}s)")
+
+    def run(self, sources: List[Dict], max_articles_per_source: int, download_workers: Optional[int] = None) -> Dict:
+        """Push ``sources`` through every stage and block until the last article is scored."""
+        stages = [threading.Thread(target=self._persist_stage, name='ingest-persist', daemon=True)]
+        stages += [threading.Thread(target=self._geo_stage, name=f'ingest-geo-{i}', daemon=True) for i in range(self.geo_workers)]
+        stages.append(threading.Thread(target=self._score_stage, name='ingest-score', daemon=True))
+        for stage in stages:
+            stage.start()
+
+        try:
+            workers = min(download_workers or self.fetcher.download_workers, len(sources)) if sources else 1
+            if workers <= 1:
+                for i, source in enumerate(sources, 1):
+                    logger.info(f"Processing source {i}/{len(sources)}: {source['name']}")
+                    self._fetch_source(source, max_articles_per_source)
+                    # Add delay between sources to be respectful
+                    if i < len(sources):
+                        time.sleep(self.fetcher.source_delay)
+            else:
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='download') as executor:
+                    for source in sources:
+                        executor.submit(self._fetch_source, source, max_articles_per_source)
+        finally:
+            self._persist_q.put(_STOP)
+            for stage in stages:
+                stage.join()
+
+        return {
+            'saved': self.counts['saved'] + self.counts['near_duplicate'],
+            'saved_by_source': {source['name']: self.saved_by_source[source['name']] for source in sources},
+            'duplicates': self.counts['duplicate'],
+            'near_duplicates': self.counts['near_duplicate'],
+            'geo_tagged': self.counts['geo_tagged'],
+            'scored': self.counts['scored'],
+            'errors': self.counts['errors'],
+        }
@@ -0,0 +1,119 @@
+"""Single-pass multi-pattern place matcher (Aho-Corasick).
+
+Replaces running one ``\\b<place>\\b`` regex per gazetteer entry over every article:
+the automaton is built once from all place names and then finds every occurrence of
+every place in one scan of the text. Matching is case-insensitive (``str.casefold``
+applied per character, so Danish Æ/Ø/Å fold like any other letter and match positions
+still refer to the original text) and only whole words count: a match must not be
+glued to a letter, digit or underscore on either side.
+
+The automaton is plain dicts and tuples so it pickles as part of the gazetteer cache.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Tuple
+
+# goto keys pack (state, character) into one int: state << _CHAR_BITS | ord(char)
+_CHAR_BITS = 21
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+def _fold(text: str) -> Tuple[str, List[int]]:
+    """Case-fold ``text`` and map each folded character back to its index in ``text``."""
+    folded = []
+    origin = []
+    for index, ch in enumerate(text):
+        lowered = ch.casefold()
+        folded.append(lowered)
+        origin.extend([index] * len(lowered))
+    return ''.join(folded), origin
+
+
+class PlaceMatcher:
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: Tuple[str, ...] = tuple(patterns)
+        self._lengths: List[int] = []
+        self._goto: Dict[int, int] = {}
+        self._outputs: Dict[int, Tuple[int, ...]] = {}
+        self._fail: List[int] = [0]
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def _build(self) -> None:
+        goto = self._goto
+        outputs: Dict[int, List[int]] = {}
+        state_count = 1
+        for pattern_id, pattern in enumerate(self.patterns):
+            folded, _ = _fold(pattern)
+            self._lengths.append(len(folded))
+            if not folded:
+                continue
+            state = 0
+            for ch in folded:
+                key = state << _CHAR_BITS | ord(ch)
+                nxt = goto.get(key)
+                if nxt is None:
+                    nxt = goto[key] = state_count
+                    state_count += 1
+                state = nxt
+            outputs.setdefault(state, []).append(pattern_id)
+
+        # Breadth-first failure links; outputs inherit those of their failure state
+        children: Dict[int, List[Tuple[int, int]]] = {}
+        for key, child in goto.items():
+            children.setdefault(key >> _CHAR_BITS, []).append((key & ((1 << _CHAR_BITS) - 1), child))
+        fail = [0] * state_count
+        queue = [child for _, child in children.get(0, ())]
+        for state in queue:
+            for code, child in children.get(state, ()):
+                target = fail[state]
+                while target and (target << _CHAR_BITS | code) not in goto:
+                    target = fail[target]
+                link = goto.get(target << _CHAR_BITS | code, 0)
+                fail[child] = link if link != child else 0
+                if link in outputs:
+                    outputs.setdefault(child, []).extend(outputs[link])
+                queue.append(child)
+        self._fail = fail
+        self._outputs = {state: tuple(ids) for state, ids in outputs.items()}
+
+    def find_all(self, text: str) -> List[Tuple[int, int, str]]:
+        """All whole-word matches as ``(start, end, pattern)``, ordered by start then longest first.
+
+        Overlapping matches are all reported (``"New York"`` yields both ``New York`` and
+        ``York`` if both are patterns).
+        """
+        if not text or not self.patterns:
+            return []
+        folded, origin = _fold(text)
+        goto, fail, outputs, lengths = self._goto, self._fail, self._outputs, self._lengths
+        text_length = len(text)
+        matches = []
+        state = 0
+        for position, ch in enumerate(folded):
+            code = ord(ch)
+            while state and (state << _CHAR_BITS | code) not in goto:
+                state = fail[state]
+            state = goto.get(state << _CHAR_BITS | code, 0)
+            found = outputs.get(state)
+            if not found:
+                continue
+            for pattern_id in found:
+                first = position - lengths[pattern_id] + 1
+                start, end = origin[first], origin[position] + 1
+                # Whole words only; a folded char that expanded (ß -> ss) must be matched in full
+                if (first and origin[first - 1] == start) or (position + 1 < len(origin) and origin[position + 1] == end - 1):
+                    continue
+                if start and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+                    continue
+                if end < text_length and _is_word_char(text[end]) and _is_word_char(text[end - 1]):
+                    continue
+                matches.append((start, end, self.patterns[pattern_id]))
+        matches.sort(key=lambda match: (match[0], -match[1]))
+        return matches
@@ -0,0 +1,112 @@
+"""Content-addressed, compressed store for raw article HTML.
+
+Pages are keyed by the SHA-256 of their UTF-8 bytes and written to sharded
+directories (``ab/cd/<digest>.html.zst`` or ``.html.gz``) so that extraction and
+geo-tagging changes can be re-run from disk without downloading anything again.
+zstd is used when the optional ``zstandard`` package is installed; gzip otherwise.
+The url -> digest index lives in the ``raw_pages`` database table.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+try:  # optional dependency
+    import zstandard
+except ImportError:  # pragma: no cover - depends on environment
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+_GZIP_SUFFIX = '.html.gz'
+_ZSTD_SUFFIX = '.html.zst'
+
+
+class RawPageStore:
+    def __init__(self, root: Path, use_zstd: Optional[bool] = None):
+        self.root = Path(root).expanduser()
+        self.use_zstd = (zstandard is not None) if use_zstd is None else (use_zstd and zstandard is not None)
+
+    @staticmethod
+    def digest(html: str) -> str:
+        return hashlib.sha256(html.encode('utf-8')).hexdigest()
+
+    def _base_path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest[2:4] / digest
+
+    def _existing_path(self, digest: str) -> Optional[Path]:
+        base = self._base_path(digest)
+        for suffix in (_ZSTD_SUFFIX, _GZIP_SUFFIX):
+            path = base.with_name(base.name + suffix)
+            if path.exists():
+                return path
+        return None
+
+    def contains(self, digest: str) -> bool:
+        return self._existing_path(digest) is not None
+
+    def put(self, html: str) -> str:
+        """Store a page (no-op if an identical page is already stored) and return its digest."""
+        digest = self.digest(html)
+        if self.contains(digest):
+            return digest
+
+        raw = html.encode('utf-8')
+        if self.use_zstd:
+            payload = zstandard.ZstdCompressor(level=10).compress(raw)
+            suffix = _ZSTD_SUFFIX
+        else:
+            payload = gzip.compress(raw, compresslevel=6)
+            suffix = _GZIP_SUFFIX
+
+        base = self._base_path(digest)
+        base.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file and rename so readers never see a partial page
+        fd, tmp_name = tempfile.mkstemp(dir=str(base.parent), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                fh.write(payload)
+            os.replace(tmp_name, base.with_name(base.name + suffix))
+        except Exception:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+        return digest
+
+    def delete(self, digest: str) -> bool:
+        """Remove a stored page; returns False if it was not stored."""
+        path = self._existing_path(digest)
+        if path is None:
+            return False
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            return False
+        return True
+
+    def get(self, digest: str) -> Optional[str]:
+        """Return the stored HTML for a digest, or None if it is missing or unreadable."""
+        path = self._existing_path(digest)
+        if path is None:
+            return None
+        try:
+            data = path.read_bytes()
+            if path.name.endswith(_ZSTD_SUFFIX):
+                if zstandard is None:
+                    logger.warning(f"Cannot read {path}: zstandard is not installed")
+                    return None
+                data = zstandard.ZstdDecompressor().decompress(data)
+            else:
+                data = gzip.decompress(data)
+            return data.decode('utf-8')
+        except Exception as e:
+            logger.warning(f"Failed to read archived page {digest}: {e}")
+            return None
@@ -0,0 +1,285 @@
+"""Offline replay of recorded news sources for reproducible fetcher benchmarks.
+
+A corpus is a directory holding ``corpus.json`` plus captured HTML files::
+
+    {"recorded_at": "...", "sources": [
+        {"name": "TV 2 Nyheder", "url": "https://nyheder.tv2.dk",
+         "pages": {"/": "tv-2-nyheder/0000.html", "/samfund/2024-...": "tv-2-nyheder/0001.html"}}]}
+
+Each source is served by its own local HTTP server so relative links keep working;
+absolute links to the recorded origin are rewritten to the local server on the fly.
+Latency, bandwidth and error injection are configurable so fetcher changes can be
+compared on any machine without network access.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import random
+import re
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+CORPUS_MANIFEST = 'corpus.json'
+
+
+@dataclass
+class ReplayConditions:
+    """Network conditions simulated by the replay servers."""
+
+    latency_ms: float = 0.0
+    bandwidth_kbps: float = 0.0  # kilobits per second, 0 = unlimited
+    error_rate: float = 0.0  # fraction of requests answered with 503
+    seed: int = 0
+
+
+def _page_key(url: str) -> str:
+    parts = urlsplit(url)
+    path = parts.path or '/'
+    return f"{path}?{parts.query}" if parts.query else path
+
+
+def _slugify(name: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or 'source'
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Linear-interpolated percentile (pct in 0..100); 0.0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+class ReplaySource:
+    """Serve one recorded source on 127.0.0.1 under the given network conditions."""
+
+    def __init__(self, origin_url: str, pages: Dict[str, Path], conditions: Optional[ReplayConditions] = None):
+        origin = urlsplit(origin_url)
+        self.origin_host = origin.netloc
+        self.origin_path = origin.path.rstrip('/')
+        self.pages = pages
+        self.conditions = conditions or ReplayConditions()
+        self.requests_served = 0
+        self.errors_injected = 0
+        self._random = random.Random(self.conditions.seed)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def origin(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def url(self) -> str:
+        """Replay equivalent of the recorded source URL."""
+        return self.origin + self.origin_path
+
+    def _rewrite(self, html: str) -> str:
+        local = self.origin
+        for prefix in (f"https://{self.origin_host}", f"http://{self.origin_host}"):
+            html = html.replace(prefix, local)
+        return html.replace(f"//{self.origin_host}", '//' + local.split('://', 1)[1])
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            self.requests_served += 1
+            if self.conditions.error_rate and self._random.random() < self.conditions.error_rate:
+                self.errors_injected += 1
+                return True
+            return False
+
+    def _make_handler(self):
+        replay = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if replay.conditions.latency_ms:
+                    time.sleep(replay.conditions.latency_ms / 1000.0)
+                if replay._should_fail():
+                    self.send_error(503, 'Injected replay error')
+                    return
+                page = replay.pages.get(self.path) or replay.pages.get(self.path.rstrip('/') or '/')
+                if page is None:
+                    self.send_error(404)
+                    return
+                body = replay._rewrite(page.read_text(encoding='utf-8')).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                bytes_per_second = replay.conditions.bandwidth_kbps * 1000 / 8
+                chunk_size = 16 * 1024
+                for offset in range(0, len(body), chunk_size):
+                    chunk = body[offset:offset + chunk_size]
+                    self.wfile.write(chunk)
+                    if bytes_per_second:
+                        time.sleep(len(chunk) / bytes_per_second)
+
+            def log_message(self, format, *args):
+                logger.debug("replay %s: %s", replay.origin_host, format % args)
+
+        return Handler
+
+    def start(self) -> str:
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name=f"replay-{self.origin_host}", daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def load_corpus(corpus_dir: Path) -> Dict:
+    corpus_dir = Path(corpus_dir)
+    with (corpus_dir / CORPUS_MANIFEST).open('r', encoding='utf-8') as fh:
+        return json.load(fh)
+
+
+def start_replay(corpus_dir: Path, conditions: Optional[ReplayConditions] = None) -> List[Dict]:
+    """Start one server per recorded source; returns the manifest sources with a running ``replay``."""
+    corpus_dir = Path(corpus_dir)
+    started = []
+    for source in load_corpus(corpus_dir).get('sources', []):
+        pages = {key: corpus_dir / rel for key, rel in source.get('pages', {}).items()}
+        replay = ReplaySource(source['url'], pages, conditions)
+        replay.start()
+        started.append({**source, 'replay': replay})
+    return started
+
+
+def record_corpus(sources: List[Dict], corpus_dir: Path, max_articles: int = 10, timeout: int = 15) -> Dict:
+    """Capture each source's front page and up to ``max_articles`` article pages."""
+    import newspaper
+    import requests
+
+    corpus_dir = Path(corpus_dir)
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    headers = {'User-Agent': 'newsreader-replay-recorder'}
+    manifest = {'recorded_at': datetime.now(timezone.utc).isoformat(), 'sources': []}
+
+    for source in sources:
+        slug = _slugify(source['name'])
+        (corpus_dir / slug).mkdir(exist_ok=True)
+        pages: Dict[str, str] = {}
+
+        def save(url: str) -> bool:
+            try:
+                response = requests.get(url, headers=headers, timeout=timeout)
+                response.raise_for_status()
+            except Exception as e:
+                logger.warning(f"Skipping {url} while recording: {e}")
+                return False
+            rel = f"{slug}/{len(pages):04d}.html"
+            (corpus_dir / rel).write_text(response.text, encoding='utf-8')
+            pages[_page_key(url)] = rel
+            return True
+
+        if not save(source['url']):
+            continue
+        built = newspaper.build(source['url'], memoize_articles=False, language='da')
+        recorded = 0
+        for article in built.articles:
+            if recorded >= max_articles:
+                break
+            if article.url.startswith(source['url']) and _page_key(article.url) not in pages:
+                recorded += save(article.url)
+        logger.info(f"Recorded {recorded} articles for {source['name']}")
+        manifest['sources'].append({'name': source['name'], 'url': source['url'], 'pages': pages})
+
+    with (corpus_dir / CORPUS_MANIFEST).open('w', encoding='utf-8') as fh:
+        json.dump(manifest, fh, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def _cpu_seconds_by_pid() -> Dict[int, float]:
+    """User+system CPU time of this process and its live children (parse workers)."""
+    import psutil
+
+    current = psutil.Process()
+    result = {}
+    for proc in [current] + current.children(recursive=True):
+        try:
+            times = proc.cpu_times()
+            result[proc.pid] = times.user + times.system
+        except psutil.Error:
+            continue
+    return result
+
+
+def run_benchmark(
+    corpus_dir: Path,
+    conditions: Optional[ReplayConditions] = None,
+    max_articles_per_source: Optional[int] = None,
+    fetcher_config: Optional[Dict] = None,
+) -> Dict:
+    """Run ``NewsFetcher.fetch_all_sources`` against a replayed corpus and report throughput,
+    per-article latency percentiles and CPU time. Uses a throw-away database and skips
+    geo-tagging so only the fetch pipeline is measured."""
+    from .database import DatabaseManager
+    from .fetcher import NewsFetcher
+
+    replays = start_replay(corpus_dir, conditions)
+    try:
+        if max_articles_per_source is None:
+            max_articles_per_source = max((len(s['pages']) - 1 for s in replays), default=0)
+        config = {
+            'max_articles_per_source': max_articles_per_source,
+            'article_delay_seconds': 0,
+            'source_delay_seconds': 0,
+            'geo_tag_on_ingest': False,
+            'archive_raw_html': False,
+            'sources': [{'name': s['name'], 'url': s['replay'].url, 'enabled': True} for s in replays],
+        }
+        config.update(fetcher_config or {})
+
+        with tempfile.TemporaryDirectory(prefix='newsreader-bench-') as tmp:
+            sources_file = Path(tmp) / 'sources.json'
+            sources_file.write_text(json.dumps(config), encoding='utf-8')
+            db = DatabaseManager(str(Path(tmp) / 'bench.db'))
+            fetcher = NewsFetcher(db, str(sources_file))
+
+            cpu_before = _cpu_seconds_by_pid()
+            started = time.perf_counter()
+            fetcher.fetch_all_sources(max_articles_per_source)
+            wall = time.perf_counter() - started
+            cpu_after = _cpu_seconds_by_pid()
+
+            article_count = db.get_article_count()
+            latencies = list(fetcher.article_latencies)
+
+        cpu_seconds = sum(max(0.0, t - cpu_before.get(pid, 0.0)) for pid, t in cpu_after.items())
+        return {
+            'sources': len(replays),
+            'articles': article_count,
+            'wall_seconds': round(wall, 3),
+            'articles_per_second': round(article_count / wall, 3) if wall else 0.0,
+            'latency_p50_seconds': round(percentile(latencies, 50), 4),
+            'latency_p95_seconds': round(percentile(latencies, 95), 4),
+            'cpu_seconds': round(cpu_seconds, 3),
+            'requests_served': sum(s['replay'].requests_served for s in replays),
+            'errors_injected': sum(s['replay'].errors_injected for s in replays),
+        }
+    finally:
+        for source in replays:
+            source['replay'].stop()
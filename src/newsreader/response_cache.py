@@ -0,0 +1,74 @@
+"""In-process cache of rendered responses for read-only routes.
+
+The heat-map APIs and the anonymous front page only change when articles or geo-tags
+are written, which mostly happens once per daemon cycle. Triggers on those tables bump
+per-table versions in ``lookup_versions`` (see ``DatabaseManager.get_change_token``),
+so a response can be cached under its route, query string and the current versions of
+the tables it reads. Every cached body carries a strong ETag (a hash of its content):
+a client revalidating with ``If-None-Match`` gets a 304 without the view running, and
+other clients get the stored bytes.
+
+Entries are evicted least-recently-used first once their combined size exceeds
+``max_bytes``. A new data version simply yields new keys; stale ones age out.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Hashable, NamedTuple, Optional
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    mimetype: str
+    etag: str
+    encoding: Optional[str] = None
+
+
+class ResponseCache:
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max(0, int(max_bytes))
+        self._entries: 'OrderedDict[Hashable, CachedResponse]' = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, body: bytes, mimetype: str, encoding: Optional[str] = None) -> CachedResponse:
+        entry = CachedResponse(body, mimetype, hashlib.sha256(body).hexdigest()[:32], encoding)
+        if len(body) > self.max_bytes:
+            # Larger than the whole cache: serve it with an ETag but do not keep it
+            return entry
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous.body)
+            self._entries[key] = entry
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.body)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
@@ -1,23 +1,47 @@
 import math
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from .database import DatabaseManager
 
+
+def describe_word_matches(matches: Optional[Dict[str, int]]) -> str:
+    """Tooltip text for the matched-word counts stored with an article's score"""
+    if matches is None:
+        return 'Not scored yet'
+    if not matches:
+        return 'No score words found'
+    return ', '.join(f"{word} (x{count})" for word, count in matches.items())
+
+
 class ArticleScorer:
-    def calculate_word_score(self, article: Dict, score_words: List[Dict]) -> float:
-        """Score based on user words and weights"""
-        text = (article.get('title', '') + ' ' + article.get('summary', '') + ' ' + article.get('content', '')).lower()
-        score = 0.0
+    def calculate_word_matches(self, article: Dict, score_words: List[Dict]) -> Dict[str, int]:
+        """Occurrences of each score word in the article text (words that do not occur are left out)"""
+        text = ' '.join(article.get(key) or '' for key in ('title', 'summary', 'content')).lower()
+        matches = {}
         for entry in score_words:
             # Defensive: handle missing keys gracefully
             word = entry.get('word')
-            weight = entry.get('weight', 1)
             if not word:
                 continue
             word = word.lower()
-            count = text.count(word)
-            score += count * weight
+            if word not in matches:
+                count = text.count(word)
+                if count:
+                    matches[word] = count
+        return matches
+
+    def score_word_matches(self, matches: Dict[str, int], score_words: List[Dict]) -> float:
+        score = 0.0
+        for entry in score_words:
+            word = entry.get('word')
+            if word:
+                score += matches.get(word.lower(), 0) * entry.get('weight', 1)
         return score
+
+    def calculate_word_score(self, article: Dict, score_words: List[Dict]) -> float:
+        """Score based on user words and weights"""
+        return self.score_word_matches(self.calculate_word_matches(article, score_words), score_words)
+
     def __init__(self, db_manager: DatabaseManager):
         self.db = db_manager
         self.source_reliability = self._load_source_reliability()
@@ -84,19 +108,33 @@ class ArticleScorer:
         """Calculate overall article score based on user words/weights"""
         return self.calculate_word_score(article, score_words)
 
+    def score_with_matches(self, article: Dict, score_words: List[Dict]) -> Tuple[float, Dict[str, int]]:
+        """Overall score plus the matched-word counts it was computed from"""
+        matches = self.calculate_word_matches(article, score_words)
+        return self.score_word_matches(matches, score_words), matches
+
+    def score_article(self, article_id: int, article: Dict, score_words: List[Dict] = None) -> float:
+        """Score a single article with the default words (used by the ingest pipeline)"""
+        if score_words is None:
+            score_words = self.db.get_default_score_words()
+        article = {'title': article.get('title') or '', 'summary': article.get('summary') or '', 'content': article.get('content') or ''}
+        score, matches = self.score_with_matches(article, score_words)
+        self.db.update_article_score(article_id, score, matched_words=matches)
+        return score
+
     def score_all_articles(self, user_id: int = None):
         """Score all articles in database for a specific user or with default words"""
         articles = self.db.get_articles(limit=10000)
         if user_id:
             score_words = self.db.get_score_words(user_id)
             for article in articles:
-                score = self.calculate_overall_score(article, score_words)
-                self.db.update_article_score(article['id'], score, user_id=user_id)
+                score, matches = self.score_with_matches(article, score_words)
+                self.db.update_article_score(article['id'], score, user_id=user_id, matched_words=matches)
         else:
             score_words = self.db.get_default_score_words()
             for article in articles:
-                score = self.calculate_overall_score(article, score_words)
-                self.db.update_article_score(article['id'], score)
+                score, matches = self.score_with_matches(article, score_words)
+                self.db.update_article_score(article['id'], score, matched_words=matches)
 
     def get_scoring_explanation(self, article: Dict, user_preferences: List[Dict]) -> Dict:
         """Get detailed scoring breakdown for an article"""
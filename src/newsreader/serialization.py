@@ -0,0 +1,95 @@
+"""Compact encoding and compression for the ``/api/v1`` endpoints.
+
+JSON is written without whitespace, by ``orjson`` when it is installed and by the
+standard library otherwise. MessagePack is offered when ``msgpack`` is installed
+(``?format=msgpack`` or ``Accept: application/msgpack``). Bodies larger than
+``MIN_COMPRESS_BYTES`` are compressed with brotli (if the ``brotli`` package is
+installed) or gzip, whichever the client accepts.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+from typing import Any, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional, faster JSON encoder
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional binary format
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:  # optional, better compression than gzip
+    brotli = None
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPE = 'application/msgpack'
+MSGPACK_MIMETYPES = (MSGPACK_MIMETYPE, 'application/x-msgpack')
+# Smaller bodies are not worth the compression overhead
+MIN_COMPRESS_BYTES = 512
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+class UnsupportedFormat(ValueError):
+    """The requested serialization format is not available."""
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode('utf-8', 'replace')
+    return str(value)
+
+
+def dumps_json(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, default=_default)
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':'), default=_default).encode('utf-8')
+
+
+def choose_format(format_param: Optional[str], accept_mimetypes) -> str:
+    """``json`` or ``msgpack`` from an explicit ``?format=`` or the ``Accept`` header.
+
+    Raises ``UnsupportedFormat`` for unknown formats or MessagePack without ``msgpack``.
+    """
+    if format_param:
+        requested = format_param.lower()
+        if requested not in ('json', 'msgpack'):
+            raise UnsupportedFormat(f"Unknown format: {format_param}")
+    else:
+        best = accept_mimetypes.best_match((JSON_MIMETYPE,) + MSGPACK_MIMETYPES, default=JSON_MIMETYPE)
+        requested = 'msgpack' if best in MSGPACK_MIMETYPES else 'json'
+    if requested == 'msgpack' and msgpack is None:
+        raise UnsupportedFormat("MessagePack is not available on this server")
+    return requested
+
+
+def encode(payload: Any, fmt: str) -> Tuple[bytes, str]:
+    """Serialize ``payload``; returns ``(body, mimetype)``."""
+    if fmt == 'msgpack':
+        return msgpack.packb(payload, default=_default, use_bin_type=True), MSGPACK_MIMETYPE
+    return dumps_json(payload), JSON_MIMETYPE
+
+
+def choose_encoding(accept_encodings) -> Optional[str]:
+    """Preferred content coding the client accepts: ``br``, ``gzip`` or None."""
+    if brotli is not None and accept_encodings['br']:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress(body: bytes, encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """Compress ``body`` with ``encoding`` if worthwhile; returns ``(body, encoding used)``."""
+    if encoding is None or len(body) < MIN_COMPRESS_BYTES:
+        return body, None
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY), 'br'
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0), 'gzip'
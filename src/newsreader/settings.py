@@ -24,6 +24,9 @@ class Settings:
     default_sources_path: Path
     default_geo_places_path: Path
     daemon_log_path: Path
+    raw_archive_dir: Path
+    thumbnail_cache_dir: Path
+    gazetteer_cache_path: Path
 
 
 def _resolve_path(environment_key: str, default: Path) -> Path:
@@ -51,6 +54,9 @@ def get_settings() -> Settings:
     default_sources_path = _resolve_path('NEWSREADER_SOURCES_PATH', data_dir / 'sources.json')
     default_geo_places_path = _resolve_path('NEWSREADER_GEO_PLACES_PATH', data_dir / 'geo_places.json')
     daemon_log_path = _resolve_path('NEWSREADER_DAEMON_LOG', log_dir / 'news_daemon.log')
+    raw_archive_dir = _resolve_path('NEWSREADER_RAW_ARCHIVE_DIR', var_dir / 'raw_pages')
+    thumbnail_cache_dir = _resolve_path('NEWSREADER_THUMBNAIL_DIR', var_dir / 'thumbnails')
+    gazetteer_cache_path = _resolve_path('NEWSREADER_GAZETTEER_CACHE', var_dir / 'gazetteer.pickle')
 
     # Ensure directories exist so docker mounts work out of the box.
     for path in (config_dir, data_dir, var_dir, log_dir):
@@ -72,4 +78,7 @@ def get_settings() -> Settings:
         default_sources_path=default_sources_path,
         default_geo_places_path=default_geo_places_path,
         daemon_log_path=daemon_log_path,
+        raw_archive_dir=raw_archive_dir,
+        thumbnail_cache_dir=thumbnail_cache_dir,
+        gazetteer_cache_path=gazetteer_cache_path,
     )
@@ -0,0 +1,143 @@
+"""Per-source health tracking: circuit breaker plus retry-with-backoff helpers.
+
+A source whose fetch fails ``failure_threshold`` cycles in a row is *opened* and
+skipped until its cool-down has passed; the next cycle then runs a single *half-open*
+probe. A successful probe closes the breaker, a failed one re-opens it with twice the
+cool-down (capped at ``breaker_max_cooldown_seconds``). State is kept in the
+``source_health`` table so the web process can show it on the admin dashboard.
+
+Config keys in ``sources.json``: ``breaker_failure_threshold`` (3),
+``breaker_cooldown_seconds`` (600), ``breaker_max_cooldown_seconds`` (21600),
+``download_retries`` (2), ``retry_base_delay_seconds`` (1.0) and
+``source_time_budget_seconds`` (300).
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+T = TypeVar('T')
+
+# Failures worth retrying: timeouts, dropped connections, throttling and 5xx responses
+_TRANSIENT_RE = re.compile(
+    r'timed? ?out|timeout|connection (?:reset|aborted|refused|error)|max retries|temporarily|'
+    r'\b(?:429|500|502|503|504)\b',
+    re.IGNORECASE,
+)
+
+
+class TransientError(Exception):
+    """A failure that is likely to succeed if retried shortly."""
+
+
+def is_transient(error: BaseException) -> bool:
+    if isinstance(error, TransientError):
+        return True
+    try:
+        import requests
+        if isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+            return True
+    except ImportError:  # pragma: no cover - requests ships with newspaper
+        pass
+    return bool(_TRANSIENT_RE.search(str(error)))
+
+
+def retry_with_backoff(func: Callable[[], T], attempts: int = 3, base_delay: float = 1.0, max_delay: float = 30.0,
+                       deadline: Optional[float] = None, sleep: Callable[[float], None] = time.sleep) -> T:
+    """Call ``func``, retrying transient errors with jittered exponential backoff.
+
+    Non-transient errors are raised immediately, as is the last error once ``attempts``
+    are used up or the next wait would run past ``deadline`` (a ``time.monotonic()`` value).
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            return func()
+        except Exception as e:
+            if attempt >= attempts or not is_transient(e):
+                raise
+            delay = min(max_delay, base_delay * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                raise
+            logger.debug(f"Transient error (attempt {attempt}/{attempts}), retrying in {delay:.1f}s: {e}")
+            sleep(delay)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class SourceHealth:
+    """Circuit breakers for all sources, persisted through ``DatabaseManager``."""
+
+    def __init__(self, db, config: Optional[Dict] = None):
+        config = config or {}
+        self.db = db
+        self.failure_threshold = max(1, int(config.get('breaker_failure_threshold', 3)))
+        self.cooldown = float(config.get('breaker_cooldown_seconds', 600))
+        self.max_cooldown = max(self.cooldown, float(config.get('breaker_max_cooldown_seconds', 6 * 3600)))
+        self._lock = threading.Lock()
+        self._states: Dict[str, Dict] = {row['source']: row for row in db.get_source_health()}
+
+    def _state(self, source: str) -> Dict:
+        return self._states.setdefault(source, {
+            'source': source, 'state': CLOSED, 'consecutive_failures': 0, 'trips': 0,
+            'opened_at': None, 'retry_at': None, 'last_success_at': None, 'last_failure_at': None, 'last_error': None,
+        })
+
+    def _save(self, state: Dict) -> None:
+        self.db.save_source_health(state)
+
+    def allow(self, source: str, now: Optional[datetime] = None) -> bool:
+        """Whether the source may be fetched this cycle (moves open -> half-open when due)."""
+        now = now or _utcnow()
+        with self._lock:
+            state = self._state(source)
+            if state['state'] != OPEN:
+                return True
+            if state['retry_at'] and now < state['retry_at']:
+                return False
+            state['state'] = HALF_OPEN
+            self._save(state)
+        logger.info(f"[{source}] Circuit half-open, sending probe fetch")
+        return True
+
+    def record_success(self, source: str, now: Optional[datetime] = None) -> None:
+        now = now or _utcnow()
+        with self._lock:
+            state = self._state(source)
+            if state['state'] != CLOSED:
+                logger.info(f"[{source}] Circuit closed after successful fetch")
+            state.update(state=CLOSED, consecutive_failures=0, trips=0, opened_at=None, retry_at=None, last_success_at=now)
+            self._save(state)
+
+    def record_failure(self, source: str, error: str, now: Optional[datetime] = None) -> None:
+        now = now or _utcnow()
+        with self._lock:
+            state = self._state(source)
+            state['consecutive_failures'] += 1
+            state['last_failure_at'] = now
+            state['last_error'] = (error or '')[:500]
+            if state['state'] == HALF_OPEN or state['consecutive_failures'] >= self.failure_threshold:
+                state['trips'] += 1
+                cooldown = min(self.max_cooldown, self.cooldown * 2 ** (state['trips'] - 1))
+                state.update(state=OPEN, opened_at=now, retry_at=now + timedelta(seconds=cooldown))
+                logger.warning(f"[{source}] Circuit open for {cooldown:.0f}s after {state['consecutive_failures']} failures: {error}")
+            self._save(state)
+
+    def snapshot(self) -> List[Dict]:
+        with self._lock:
+            return [dict(state) for state in self._states.values()]
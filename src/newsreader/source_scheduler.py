@@ -0,0 +1,149 @@
+"""Adaptive per-source polling for the daemon.
+
+Each source gets its own polling interval derived from how many new articles it has
+been yielding per hour (an exponentially weighted moving average seeded from the
+articles already in the database). The interval aims to collect
+``target_new_articles`` per fetch, is clamped to the configured min/max and jittered
+so sources don't fire in lockstep. State survives restarts in ``source_fetch_state``.
+A fetch that hit ``max_articles_per_source`` only gives a lower bound on the rate, so it
+can raise the average but never lower it; a failed fetch is not an observation at all
+and just retries after the current interval (``defer``).
+
+Enabled with ``"adaptive_scheduling": true`` in ``sources.json``; tuning keys:
+``min_fetch_interval_minutes`` (5), ``max_fetch_interval_minutes`` (240),
+``target_new_articles`` (3) and ``schedule_jitter`` (0.1, fraction of the interval).
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest observation in the publish-rate average
+RATE_SMOOTHING = 0.3
+# Hours of article history used to seed the rate for sources without state
+BOOTSTRAP_HOURS = 72
+
+
+@dataclass
+class SourceState:
+    source: str
+    rate_per_hour: float
+    interval_minutes: float
+    last_fetch_at: Optional[datetime] = None
+    next_fetch_at: Optional[datetime] = None
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class SourceScheduler:
+    def __init__(self, db, sources: List[Dict], config: Dict, rng: Optional[random.Random] = None):
+        self.db = db
+        self.sources = sources
+        self.min_interval = float(config.get('min_fetch_interval_minutes', 5))
+        self.max_interval = max(self.min_interval, float(config.get('max_fetch_interval_minutes', 240)))
+        self.default_interval = float(config.get('fetch_interval_minutes', 30))
+        self.target_new = max(1.0, float(config.get('target_new_articles', 3)))
+        self.jitter = max(0.0, min(0.5, float(config.get('schedule_jitter', 0.1))))
+        self._rng = rng or random.Random()
+        self.states: Dict[str, SourceState] = {}
+        self._load()
+
+    def _load(self) -> None:
+        stored = self.db.get_source_fetch_states()
+        history = None
+        for source in self.sources:
+            name = source['name']
+            if name in stored:
+                self.states[name] = SourceState(**stored[name])
+                continue
+            if history is None:
+                history = self.db.get_source_article_rates(BOOTSTRAP_HOURS)
+            rate = history.get(name)
+            interval = self._interval_for(rate) if rate else self._clamp(self.default_interval)
+            # Unknown sources are due immediately so the first cycle establishes a baseline
+            self.states[name] = SourceState(name, rate or 0.0, interval)
+            logger.info(f"Scheduler: {name} starts at {interval:.1f} min (seed rate {rate or 0:.2f}/h)")
+
+    def _clamp(self, minutes: float) -> float:
+        return max(self.min_interval, min(self.max_interval, minutes))
+
+    def _interval_for(self, rate_per_hour: float) -> float:
+        if rate_per_hour <= 0:
+            return self.max_interval
+        return self._clamp(60.0 * self.target_new / rate_per_hour)
+
+    def _jittered(self, minutes: float) -> float:
+        if not self.jitter:
+            return minutes
+        return minutes * (1 + self._rng.uniform(-self.jitter, self.jitter))
+
+    def due_sources(self, now: Optional[datetime] = None) -> List[Dict]:
+        """Sources whose next fetch time has passed (or that were never fetched)."""
+        now = now or _utcnow()
+        return [
+            source for source in self.sources
+            if self.states[source['name']].next_fetch_at is None or self.states[source['name']].next_fetch_at <= now
+        ]
+
+    def seconds_until_next(self, now: Optional[datetime] = None) -> float:
+        now = now or _utcnow()
+        pending = [s.next_fetch_at for s in self.states.values()]
+        if not pending or any(t is None for t in pending):
+            return 0.0
+        return max(0.0, (min(pending) - now).total_seconds())
+
+    def _state(self, source_name: str) -> SourceState:
+        state = self.states.get(source_name)
+        if state is None:
+            state = self.states[source_name] = SourceState(source_name, 0.0, self._clamp(self.default_interval))
+        return state
+
+    def record_fetch(self, source_name: str, new_articles: int, now: Optional[datetime] = None,
+                     capped: bool = False) -> SourceState:
+        """Fold a fetch result into the source's rate and schedule its next fetch.
+
+        ``capped`` marks a fetch that stopped at the per-source article limit: its count is
+        a lower bound, so the rate becomes at least the observed one instead of averaging.
+        """
+        now = now or _utcnow()
+        state = self._state(source_name)
+
+        if state.last_fetch_at is not None:
+            elapsed_hours = max((now - state.last_fetch_at).total_seconds() / 3600.0, 1 / 60.0)
+            observed = new_articles / elapsed_hours
+            if capped:
+                state.rate_per_hour = max(state.rate_per_hour, observed)
+            else:
+                state.rate_per_hour = RATE_SMOOTHING * observed + (1 - RATE_SMOOTHING) * state.rate_per_hour
+        elif new_articles and not state.rate_per_hour:
+            # First fetch without history: treat the backlog as one default interval's worth
+            state.rate_per_hour = new_articles * 60.0 / self.default_interval
+
+        state.interval_minutes = self._interval_for(state.rate_per_hour)
+        state.last_fetch_at = now
+        state.next_fetch_at = now + timedelta(minutes=self._jittered(state.interval_minutes))
+        self.db.save_source_fetch_state(state.source, state.rate_per_hour, state.interval_minutes,
+                                        state.last_fetch_at, state.next_fetch_at)
+        logger.info(f"Scheduler: {source_name} yielded {new_articles}{'+' if capped else ''} new, "
+                    f"rate {state.rate_per_hour:.2f}/h, "
+                    f"next fetch in {(state.next_fetch_at - now).total_seconds() / 60:.1f} min")
+        return state
+
+    def defer(self, source_name: str, now: Optional[datetime] = None) -> SourceState:
+        """Reschedule a source whose fetch failed, leaving its rate and last fetch time alone."""
+        now = now or _utcnow()
+        state = self._state(source_name)
+        state.next_fetch_at = now + timedelta(minutes=self._jittered(state.interval_minutes))
+        self.db.save_source_fetch_state(state.source, state.rate_per_hour, state.interval_minutes,
+                                        state.last_fetch_at, state.next_fetch_at)
+        logger.info(f"Scheduler: {source_name} fetch failed, retrying in "
+                    f"{(state.next_fetch_at - now).total_seconds() / 60:.1f} min")
+        return state
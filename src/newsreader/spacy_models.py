@@ -0,0 +1,86 @@
+"""Process-wide registry of loaded spaCy pipelines.
+
+``da_core_news_lg`` is several hundred MB and takes seconds to load, so every model is
+loaded at most once per process (on first use) and shared by all ``NLPProcessor``
+instances. Components the app never uses (dependency parser, lemmatizer) are excluded
+at load time, which saves both memory and per-document time.
+
+A missing model is downloaded once (``python -m spacy download``); if that fails the
+next preferred model is tried, and finally a blank Danish pipeline is used.
+"""
+
+from __future__ import annotations
+
+import logging
+import subprocess
+import sys
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Preferred NER pipelines, best first
+PREFERRED_MODELS = ('da_core_news_lg', 'en_core_web_sm')
+# Not needed for entity recognition
+EXCLUDED_COMPONENTS = ('parser', 'lemmatizer')
+BLANK_MODEL = 'blank_da'
+
+_MODELS: Dict[Tuple[str, Tuple[str, ...]], object] = {}
+_UNAVAILABLE = set()
+_LOCK = threading.RLock()
+
+
+def _download(model_name: str) -> bool:
+    logger.info(f"Downloading spaCy model: {model_name}")
+    try:
+        subprocess.run([sys.executable, "-m", "spacy", "download", model_name], check=True)
+        return True
+    except Exception as exc:
+        logger.warning(f"Unable to download spaCy model {model_name}: {exc}")
+        return False
+
+
+def load_model(model_name: str, exclude: Iterable[str] = EXCLUDED_COMPONENTS, download: bool = True):
+    """Return the shared pipeline for ``model_name``, loading (and downloading) it on first use.
+
+    Raises ``OSError`` if the model is not installed and cannot be downloaded.
+    """
+    import spacy
+
+    key = (model_name, tuple(sorted(exclude)))
+    with _LOCK:
+        if key in _MODELS:
+            return _MODELS[key]
+        if model_name in _UNAVAILABLE:
+            raise OSError(f"spaCy model {model_name} is not available")
+        if model_name == BLANK_MODEL:
+            nlp = spacy.blank('da')
+        else:
+            try:
+                nlp = spacy.load(model_name, exclude=list(exclude))
+            except OSError:
+                if not download or not _download(model_name):
+                    _UNAVAILABLE.add(model_name)
+                    raise
+                nlp = spacy.load(model_name, exclude=list(exclude))
+            logger.info(f"Loaded spaCy model {model_name} with components {nlp.pipe_names}")
+        _MODELS[key] = nlp
+        return nlp
+
+
+def get_ner_model(preferred: Optional[Iterable[str]] = None) -> Tuple[object, str]:
+    """Return ``(nlp, model_name)`` for the best available NER pipeline."""
+    for model_name in preferred or PREFERRED_MODELS:
+        try:
+            return load_model(model_name), model_name
+        except OSError:
+            continue
+    logger.warning("Falling back to blank Danish spaCy pipeline; install da_core_news_lg for full NER support.")
+    return load_model(BLANK_MODEL), BLANK_MODEL
+
+
+def clear() -> None:
+    """Drop all loaded models (tests)."""
+    with _LOCK:
+        _MODELS.clear()
+        _UNAVAILABLE.clear()
@@ -0,0 +1,210 @@
+"""Local cache of downsized article thumbnails.
+
+Thumbnails are downloaded in the background after an article is saved, shrunk to
+``THUMBNAIL_SIZE`` and stored as JPEG under ``SETTINGS.thumbnail_cache_dir`` keyed by
+the SHA-256 of the remote URL. The web app serves them from ``/thumbnails/<key>.jpg``
+with long-lived cache headers, so pages never wait on third-party image hosts. The
+cache is capped in size; the least recently used files are evicted first. A hit
+refreshes the file mtime at most once per ``TOUCH_INTERVAL``, and the cache size is
+tracked as files are stored, so the directory is only scanned when the cap is exceeded
+(evicting down to ``LOW_WATER`` of it).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SIZE = (320, 320)
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+# Refuse to decode anything larger than this many bytes (guards against huge originals)
+MAX_SOURCE_BYTES = 15 * 1024 * 1024
+# Seconds between mtime refreshes of a cached thumbnail (LRU resolution)
+TOUCH_INTERVAL = 3600
+# Fraction of max_bytes the cache is trimmed to once it overflows
+LOW_WATER = 0.9
+_SUFFIX = '.jpg'
+
+
+def thumbnail_key(url: str) -> str:
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+
+class ThumbnailCache:
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_MAX_BYTES, workers: int = 2, timeout: float = 10.0):
+        self.root = Path(root).expanduser()
+        self.max_bytes = max(0, int(max_bytes))
+        self.timeout = timeout
+        self._workers = max(1, int(workers))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._inflight = set()
+        self._lock = threading.Lock()
+        # Bytes on disk; None until the first store scans the directory
+        self._size: Optional[int] = None
+
+    def path_for_key(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}{_SUFFIX}"
+
+    def lookup(self, url: Optional[str]) -> Optional[str]:
+        """Return the cache key for ``url`` if its thumbnail is cached, touching it for LRU."""
+        if not url:
+            return None
+        key = thumbnail_key(url)
+        path = self.path_for_key(key)
+        try:
+            mtime = path.stat().st_mtime
+            if time.time() - mtime > TOUCH_INTERVAL:
+                os.utime(path)
+        except OSError:
+            return None
+        return key
+
+    def schedule(self, url: Optional[str], on_stored: Optional[Callable[[], None]] = None) -> None:
+        """Queue a background download of ``url`` unless it is cached or already queued.
+
+        ``on_stored`` is called from the worker thread once the thumbnail is on disk.
+        """
+        if not url or not url.startswith(('http://', 'https://')):
+            return
+        key = thumbnail_key(url)
+        with self._lock:
+            if key in self._inflight or self.path_for_key(key).exists():
+                return
+            self._inflight.add(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix='thumbnail')
+            executor = self._executor
+        executor.submit(self._fetch_and_release, url, key, on_stored)
+
+    def _fetch_and_release(self, url: str, key: str, on_stored: Optional[Callable[[], None]] = None) -> None:
+        try:
+            self.fetch(url)
+            if on_stored is not None:
+                on_stored()
+        except Exception as e:
+            logger.debug(f"Thumbnail download failed for {url}: {e}")
+        finally:
+            with self._lock:
+                self._inflight.discard(key)
+
+    def fetch(self, url: str) -> Path:
+        """Download, downsize and store one thumbnail (blocking). Returns its path."""
+        import requests
+
+        response = requests.get(url, timeout=self.timeout, stream=True, headers={'User-Agent': 'newsreader-thumbnailer'})
+        response.raise_for_status()
+        data = response.raw.read(MAX_SOURCE_BYTES + 1, decode_content=True)
+        if len(data) > MAX_SOURCE_BYTES:
+            raise ValueError('image too large')
+        return self.store(url, data)
+
+    def store(self, url: str, data: bytes) -> Path:
+        from PIL import Image
+
+        with Image.open(io.BytesIO(data)) as image:
+            image.thumbnail(THUMBNAIL_SIZE)
+            if image.mode not in ('RGB', 'L'):
+                image = image.convert('RGB')
+            buffer = io.BytesIO()
+            image.save(buffer, format='JPEG', quality=80, optimize=True)
+
+        path = self.path_for_key(thumbnail_key(url))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            replaced = path.stat().st_size
+        except OSError:
+            replaced = 0
+        fd, tmp_name = tempfile.mkstemp(dir=str(path.parent), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                fh.write(buffer.getvalue())
+            os.replace(tmp_name, path)
+        except Exception:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan()[1]
+            else:
+                self._size += len(buffer.getvalue()) - replaced
+            over = self.max_bytes and self._size > self.max_bytes
+        if over:
+            self.enforce_limit(int(self.max_bytes * LOW_WATER))
+        return path
+
+    def _scan(self):
+        entries = []
+        total = 0
+        if self.root.exists():
+            for path in self.root.glob(f'*/*{_SUFFIX}'):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+        return entries, total
+
+    def enforce_limit(self, target: Optional[int] = None) -> int:
+        """Evict least recently used thumbnails until the cache fits ``target`` (default ``max_bytes``)."""
+        if not self.max_bytes or not self.root.exists():
+            return 0
+        target = self.max_bytes if target is None else target
+        entries, total = self._scan()
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                path.unlink()
+                total -= size
+                evicted += 1
+            except OSError:
+                continue
+        with self._lock:
+            self._size = total
+        return evicted
+
+    def wait(self, timeout: float = 30.0) -> None:
+        """Block until queued downloads have finished (tests and one-shot CLI runs)."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                if not self._inflight:
+                    return
+            time.sleep(0.05)
+
+
+_CACHE: Optional[ThumbnailCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_thumbnail_cache(max_bytes: Optional[int] = None) -> ThumbnailCache:
+    """Return the process-wide thumbnail cache rooted at the current ``thumbnail_cache_dir`` setting.
+
+    The root is resolved on every call, so a changed ``NEWSREADER_THUMBNAIL_DIR``/``VAR_DIR``
+    (e.g. per test) gets its own cache instead of the one created at import time.
+    """
+    global _CACHE
+    from .settings import get_settings
+
+    root = get_settings().thumbnail_cache_dir
+    with _CACHE_LOCK:
+        if _CACHE is None or _CACHE.root != Path(root).expanduser():
+            _CACHE = ThumbnailCache(root)
+        if max_bytes is not None:
+            _CACHE.max_bytes = max(0, int(max_bytes))
+        return _CACHE
@@ -0,0 +1,95 @@
+"""URL canonicalization used by every "have we already got this article?" check.
+
+Sources link the same story under many spellings: tracking parameters, fragments,
+trailing slashes, ``http`` vs ``https``, ``www.`` and AMP variants. ``canonicalize_url``
+folds these into one key that is stored in ``articles.canonical_url`` (unique index).
+
+Rules can be tuned per source in ``sources.json`` via a ``canonical_rules`` object::
+
+    {"name": "DR Nyheder", "url": "https://www.dr.dk/nyheder",
+     "canonical_rules": {"keep_params": ["page"], "strip_params": ["ref"], "keep_query": false}}
+
+``keep_query: false`` drops the whole query string (default: drop only tracking params).
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+# Query parameters that never change what page is served
+TRACKING_PARAMS = frozenset({
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'igshid', 'ocid',
+    'ref', 'ref_src', 'referrer', 'share', 'cmpid', 'amp',
+})
+TRACKING_PREFIXES = ('utm_', 'at_', 'pk_', 'xtor')
+
+_AMP_SEGMENT_RE = re.compile(r'/amp(?=/|$)', re.IGNORECASE)
+_AMP_SUFFIX_RE = re.compile(r'\.amp(?=$)', re.IGNORECASE)
+_CANONICAL_LINK_RE = re.compile(r'<link\b[^>]*>', re.IGNORECASE)
+_REL_CANONICAL_RE = re.compile(r'\brel\s*=\s*["\']?canonical\b', re.IGNORECASE)
+_HREF_RE = re.compile(r'\bhref\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+
+
+def _is_tracking_param(name: str, rules: Dict) -> bool:
+    name = name.lower()
+    if name in {p.lower() for p in rules.get('keep_params', ())}:
+        return False
+    if name in {p.lower() for p in rules.get('strip_params', ())}:
+        return True
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url: Optional[str], rules: Optional[Dict] = None) -> Optional[str]:
+    """Return the canonical form of ``url`` (None for an empty URL, the URL itself if unparseable)."""
+    if not url:
+        return None
+    rules = rules or {}
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        # Unparseable netloc or port (page-controlled canonical links can be garbage)
+        return url.strip()
+    if not parts.netloc:
+        return url.strip()
+
+    scheme = parts.scheme.lower()
+    if scheme in ('http', 'https') and rules.get('force_https', True):
+        scheme = 'https'
+
+    host = (parts.hostname or '').lower()
+    if host.startswith('amp.'):
+        host = host[4:]
+    if rules.get('strip_www', True) and host.startswith('www.'):
+        host = host[4:]
+    if port and not ((scheme == 'https' and port == 443) or (scheme == 'http' and port == 80)):
+        host = f"{host}:{port}"
+
+    path = _AMP_SEGMENT_RE.sub('', parts.path)
+    path = _AMP_SUFFIX_RE.sub('', path)
+    path = re.sub(r'/{2,}', '/', path)
+    if len(path) > 1:
+        path = path.rstrip('/')
+    path = path or '/'
+
+    query = ''
+    if rules.get('keep_query', True) and parts.query:
+        params = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _is_tracking_param(k, rules)]
+        query = urlencode(sorted(params))
+
+    return urlunsplit((scheme, host, path, query, ''))
+
+
+def find_canonical_link(html: Optional[str], base_url: str) -> Optional[str]:
+    """Return the absolute ``<link rel="canonical">`` target of a page, if it declares one."""
+    if not html:
+        return None
+    head = html[:200_000]
+    for tag in _CANONICAL_LINK_RE.findall(head):
+        if _REL_CANONICAL_RE.search(tag):
+            match = _HREF_RE.search(tag)
+            if match:
+                return urljoin(base_url, match.group(1).strip())
+    return None
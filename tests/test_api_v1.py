@@ -0,0 +1,78 @@
+import gzip
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from newsreader import serialization
+
+
+def _geo(tag):
+    return [{"tag": tag, "confidence": 0.9, "label": "test", "lat": 55.4, "lon": 10.4}]
+
+
+def test_list_returns_only_requested_fields(flask_app_client, article_factory):
+    article_factory(title="Første", published_date=datetime(2024, 1, 1, tzinfo=timezone.utc))
+    article_factory(title="Anden", published_date=datetime(2024, 1, 2, tzinfo=timezone.utc))
+
+    payload = flask_app_client.get("/api/v1/articles?fields=title,url&limit=1").get_json()
+
+    assert payload["articles"] == [{"title": "Anden", "url": payload["articles"][0]["url"]}]
+    assert payload["next_offset"] == 1
+    assert flask_app_client.get("/api/v1/articles?fields=title,password").status_code == 400
+
+
+def test_detail_includes_geo_tags_and_404(flask_app_client, article_factory, db_manager):
+    article_id = article_factory(title="Odense nyt", content="Brødtekst")
+    db_manager.save_geo_tags(article_id, _geo("Odense"))
+
+    article = flask_app_client.get(f"/api/v1/articles/{article_id}").get_json()["article"]
+    missing = flask_app_client.get("/api/v1/articles/99999")
+
+    assert article["content"] == "Brødtekst"
+    assert article["geo_tags"] == [{"tag": "Odense", "lat": 55.4, "lon": 10.4}]
+    assert missing.status_code == 404 and missing.get_json()["error"]
+
+
+def test_by_tag_and_by_source(flask_app_client, article_factory, db_manager):
+    tagged = article_factory(title="Tagged", source="DR")
+    article_factory(title="Other", source="TV2")
+    db_manager.save_geo_tags(tagged, _geo("Aarhus"))
+
+    by_tag = flask_app_client.get("/api/v1/articles/by-tag/Aarhus?fields=title").get_json()
+    by_source = flask_app_client.get("/api/v1/articles/by-source/TV2?fields=title").get_json()
+
+    assert by_tag["articles"] == [{"title": "Tagged"}]
+    assert by_source["articles"] == [{"title": "Other"}]
+    assert by_source["next_offset"] is None
+
+
+def test_gzip_and_etag_revalidation(flask_app_client, article_factory):
+    for index in range(20):
+        article_factory(title=f"Artikel {index}")
+
+    plain = flask_app_client.get("/api/v1/articles")
+    compressed = flask_app_client.get("/api/v1/articles", headers={"Accept-Encoding": "gzip"})
+    revalidated = flask_app_client.get(
+        "/api/v1/articles", headers={"Accept-Encoding": "gzip", "If-None-Match": compressed.headers["ETag"]}
+    )
+
+    assert "Content-Encoding" not in plain.headers
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(compressed.data)) == plain.get_json()
+    assert compressed.headers["ETag"] != plain.headers["ETag"]
+    assert "Accept-Encoding" in compressed.headers["Vary"]
+    assert revalidated.status_code == 304
+
+
+def test_msgpack_negotiation(flask_app_client, article_factory):
+    article_factory(title="Binær")
+
+    response = flask_app_client.get("/api/v1/articles?format=msgpack&fields=title")
+
+    if serialization.msgpack is None:
+        assert response.status_code == 406
+        assert flask_app_client.get("/api/v1/articles?format=xml").status_code == 406
+        pytest.skip("msgpack is not installed")
+    assert response.mimetype == serialization.MSGPACK_MIMETYPE
+    assert serialization.msgpack.unpackb(response.data)["articles"] == [{"title": "Binær"}]
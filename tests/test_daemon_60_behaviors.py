@@ -53,7 +53,7 @@ class DummyFetcher:
         self.stats_exception = None
         self._type_error_emitted = False
 
-    def fetch_all_sources(self, max_articles=None):
+    def fetch_all_sources(self, max_articles=None, sources=None):
         self.fetch_all_sources_calls.append(max_articles)
         if self.fetch_exception == "type_error_once":
             if not self._type_error_emitted:
@@ -307,7 +307,7 @@ def test_daemon_71_fetch_news_job_uses_configured_limits(daemon_builder, caplog)
     with caplog.at_level(logging.INFO, logger="newsreader.daemon"):
         ctx.daemon.fetch_news_job()
     assert ctx.fetcher.fetch_all_sources_calls == [7]
-    assert ctx.scorer.calls == 1
+    assert ctx.scorer.calls == 0
     assert any("Articles in DB before fetch: 5" in message for message in caplog.messages)
 
 
@@ -404,7 +404,7 @@ def test_daemon_81_run_once_invokes_all_jobs(daemon_builder):
     assert ctx.fetcher.fetch_all_sources_calls == [expected]
     expected_cleanup = ctx.daemon.config["cleanup_days"]
     assert ctx.fetcher.cleanup_calls == [expected_cleanup]
-    assert ctx.scorer.calls == 1
+    assert ctx.scorer.calls == 0
 
 
 def test_daemon_82_run_skips_when_disabled(daemon_builder):
@@ -571,3 +571,29 @@ def test_daemon_92_main_passes_config_path_argument(daemon_builder):
     daemon_module.main()
     assert Path(instances[-1].config_path) == Path(custom_config)
     assert instances[-1].run_once_called is True
+
+
+def test_daemon_93_adaptive_fetch_records_outcomes_without_rescoring(daemon_builder):
+    ctx = daemon_builder.build()
+    recorded = []
+
+    class FakeScheduler:
+        def due_sources(self):
+            return [{"name": "Ok"}, {"name": "Full"}, {"name": "Down"}]
+
+        def record_fetch(self, name, new_articles, capped=False):
+            recorded.append(("record", name, new_articles, capped))
+
+        def defer(self, name):
+            recorded.append(("defer", name))
+
+    ctx.daemon.source_scheduler = FakeScheduler()
+    ctx.fetcher.fetch_all_sources_result = {
+        "saved_by_source": {"Ok": 2, "Full": 5},
+        "failed_sources": ["Down"],
+        "capped_sources": ["Full"],
+    }
+    ctx.daemon.adaptive_fetch_job()
+
+    assert recorded == [("record", "Ok", 2, False), ("record", "Full", 5, True), ("defer", "Down")]
+    assert ctx.scorer.calls == 0
@@ -0,0 +1,59 @@
+from newsreader.dedupe import article_fingerprint, hamming_distance, simhash
+
+STORY = (
+    "Regeringen har i dag præsenteret en ny klimaplan der skal reducere udledningerne "
+    "fra landbruget med en tredjedel inden 2030 og samtidig sikre arbejdspladser i "
+    "landdistrikterne ifølge ministeren der talte på et pressemøde i Aarhus i eftermiddag. "
+    "Planen indeholder blandt andet en afgift på drivhusgasser fra husdyr, støtte til "
+    "omlægning af lavbundsjorde og en fond til skovrejsning som skal finansieres over "
+    "finansloven. Oppositionen kalder udspillet for utilstrækkeligt mens landbrugets "
+    "organisationer advarer om at afgiften kan koste tusindvis af job i de kommende år. "
+    "Forhandlingerne med partierne begynder allerede i næste uge på Christiansborg hvor "
+    "regeringen håber at kunne samle et bredt flertal bag aftalen inden sommerferien"
+)
+OTHER = (
+    "Fodboldlandsholdet vandt aftenens kamp i Parken efter et sent mål i overtiden og "
+    "sikrede dermed adgang til slutrunden næste sommer hvor holdet skal spille i gruppe "
+    "med blandt andre Tyskland og Spanien oplyser forbundet i en pressemeddelelse"
+)
+
+
+def test_simhash_is_close_for_near_identical_text():
+    variant = STORY.replace("i eftermiddag", "i formiddag")
+
+    assert hamming_distance(simhash(STORY), simhash(variant)) <= 3
+    assert hamming_distance(simhash(STORY), simhash(OTHER)) > 3
+
+
+def test_simhash_skips_short_text():
+    assert simhash("Kort tekst") is None
+
+
+def test_find_near_duplicate_and_hide_from_listing(db_manager, article_factory):
+    original_id = article_factory(title="Ny klimaplan", content=STORY, url="https://nyheder.tv2.dk/klima")
+    copy_id = article_factory(title="Ny klimaplan", content=STORY, url="https://www.dr.dk/nyheder/klima")
+    other_id = article_factory(title="Landsholdet", content=OTHER)
+
+    for article_id, content in ((original_id, STORY), (other_id, OTHER)):
+        db_manager.save_article_fingerprint(article_id, article_fingerprint("Ny klimaplan", content))
+
+    fingerprint = article_fingerprint("Ny klimaplan", STORY)
+    assert db_manager.find_near_duplicate(fingerprint, exclude_id=copy_id) == original_id
+
+    db_manager.save_article_fingerprint(copy_id, fingerprint)
+    db_manager.mark_article_duplicate(copy_id, original_id)
+
+    listed_ids = {article["id"] for article in db_manager.get_articles(limit=10)}
+    assert copy_id not in listed_ids
+    assert {original_id, other_id} <= listed_ids
+
+
+def test_deleting_canonical_article_restores_duplicate(db_manager, article_factory):
+    original_id = article_factory(content=STORY)
+    copy_id = article_factory(content=STORY)
+    db_manager.mark_article_duplicate(copy_id, original_id)
+
+    db_manager.delete_article(original_id)
+
+    listed_ids = {article["id"] for article in db_manager.get_articles(limit=10)}
+    assert copy_id in listed_ids
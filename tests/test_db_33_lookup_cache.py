@@ -0,0 +1,41 @@
+from newsreader.database import DatabaseManager
+
+
+def test_lookup_tables_are_served_from_memory(db_manager, monkeypatch):
+    db_manager.add_geo_tag_not_found("Atlantis")
+    assert db_manager.is_geo_tag_not_found("atlantis")
+    assert "Man" in db_manager.get_excluded_tag_set()
+
+    connections = []
+    original = db_manager.get_connection
+    monkeypatch.setattr(db_manager, "get_connection", lambda: connections.append(1) or original())
+    for _ in range(100):
+        db_manager.is_geo_tag_not_found("Atlantis")
+        db_manager.get_excluded_tags()
+
+    assert connections == []
+
+
+def test_local_writes_invalidate_immediately(db_manager):
+    assert not db_manager.is_geo_tag_not_found("Lemuria")
+    assert "Aarhus" not in db_manager.get_excluded_tags()
+
+    db_manager.add_geo_tag_not_found("Lemuria")
+    db_manager.add_excluded_tag("Aarhus")
+    assert db_manager.is_geo_tag_not_found("Lemuria")
+    assert "Aarhus" in db_manager.get_excluded_tags()
+
+    db_manager.clear_geo_tags(reset_not_found=True)
+    assert not db_manager.is_geo_tag_not_found("Lemuria")
+
+
+def test_changes_from_another_connection_are_picked_up(db_manager):
+    other = DatabaseManager(str(db_manager.db_path))
+    db_manager.LOOKUP_RECHECK_SECONDS = 0
+    assert "Odense" not in db_manager.get_excluded_tag_set()
+
+    other.add_excluded_tag("Odense")
+    other._bulk_add_geo_tag_not_found({"Mu"})
+
+    assert "Odense" in db_manager.get_excluded_tag_set()
+    assert db_manager.is_geo_tag_not_found("Mu")
@@ -0,0 +1,84 @@
+from newsreader.fetcher import NewsFetcher
+
+
+class _StubArticle:
+    instances = []
+
+    def __init__(self, url: str):
+        self.url = url
+        self.top_image = None
+        self.meta_img_url = "https://example.com/og.png"
+        self.meta_description = ""
+        self.html = ""
+        self.title = "Stub Title"
+        self.text = "First sentence. Second sentence. Third sentence. Fourth sentence."
+        self.summary = "NLP summary"
+        self.publish_date = None
+        self.authors = []
+        self.nlp_calls = 0
+        _StubArticle.instances.append(self)
+
+    def download(self):
+        return None
+
+    def parse(self):
+        return None
+
+    def nlp(self):
+        self.nlp_calls += 1
+
+
+def _fetcher(monkeypatch, db_manager, profile):
+    _StubArticle.instances = []
+    monkeypatch.setattr("newsreader.fetcher.Article", _StubArticle)
+    fetcher = NewsFetcher(db_manager)
+    fetcher.extraction_profile = profile
+    return fetcher
+
+
+def test_minimal_profile_skips_nlp_and_defers_summary(monkeypatch, db_manager):
+    fetcher = _fetcher(monkeypatch, db_manager, "minimal")
+    article = fetcher.fetch_article_content("https://example.com/minimal")
+
+    assert _StubArticle.instances[0].nlp_calls == 0
+    assert article["summary"] is None
+    assert article["thumbnail_url"] == "https://example.com/og.png"
+
+
+def test_standard_profile_generates_summary_inline(monkeypatch, db_manager):
+    fetcher = _fetcher(monkeypatch, db_manager, "standard")
+    article = fetcher.fetch_article_content("https://example.com/standard")
+
+    assert _StubArticle.instances[0].nlp_calls == 0
+    assert article["summary"] == "First sentence. Second sentence. Third sentence."
+
+
+def test_full_profile_runs_nlp(monkeypatch, db_manager):
+    fetcher = _fetcher(monkeypatch, db_manager, "full")
+    article = fetcher.fetch_article_content("https://example.com/full")
+
+    assert _StubArticle.instances[0].nlp_calls == 1
+    assert article["summary"] == "NLP summary"
+
+
+def test_enrich_articles_fills_deferred_summaries(monkeypatch, db_manager):
+    fetcher = _fetcher(monkeypatch, db_manager, "minimal")
+    article_id = db_manager.save_article(
+        "Deferred", "One. Two. Three. Four.", None, "https://example.com/deferred", "Src"
+    )
+
+    assert fetcher.enrich_articles() == 1
+    assert db_manager.get_article_by_id(article_id)["summary"] == "One. Two. Three."
+    assert fetcher.enrich_articles() == 0
+
+
+def test_enrich_articles_drains_backlog_and_marks_empty_summaries(monkeypatch, db_manager):
+    fetcher = _fetcher(monkeypatch, db_manager, "minimal")
+    for index in range(3):
+        db_manager.save_article(f"Deferred {index}", "One. Two.", None, f"https://example.com/d{index}", "Src")
+    empty_id = db_manager.save_article("Empty", "", None, "https://example.com/empty", "Src")
+
+    assert fetcher.enrich_articles(limit=2) == 3
+    assert db_manager.get_article_by_id(empty_id)["summary"] == ""
+    assert db_manager.get_articles_missing_summary() == []
+
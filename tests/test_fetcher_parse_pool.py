@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+
+import pytest
+
+from newsreader.fetcher import NewsFetcher
+from newsreader.parse_pool import ParsePool, parse_article_html
+
+
+def _article_html(title: str) -> str:
+    first = " ".join(["Stormen væltede træer i hele byen og lukkede flere veje i aftes."] * 8)
+    second = " ".join(["Beboerne opfordres til at blive indendørs indtil vinden lægger sig igen."] * 8)
+    return (
+        f"<html><head><title>{title}</title>"
+        '<meta property="og:image" content="https://example.com/og.jpg">'
+        '<meta name="description" content="Kort resume."></head>'
+        f"<body><article><h1>{title}</h1><p>{first}</p><p>{second}</p></article></body></html>"
+    )
+
+
+def test_parse_article_html_extracts_fields():
+    data = parse_article_html("https://example.com/nyheder/storm", _article_html("Storm rammer Odense"))
+
+    assert data["title"] == "Storm rammer Odense"
+    assert "Stormen væltede" in data["content"]
+    assert data["summary"] == "Kort resume."
+    assert data["thumbnail_url"] == "https://example.com/og.jpg"
+
+
+def test_parse_pool_runs_in_worker_processes():
+    pool = ParsePool(workers=1, max_pending=1)
+    try:
+        futures = [pool.submit(f"https://example.com/nyheder/{i}", _article_html(f"Titel {i}")) for i in range(3)]
+        assert [future.result(timeout=60)["title"] for future in futures] == ["Titel 0", "Titel 1", "Titel 2"]
+    finally:
+        pool.shutdown()
+
+
+def test_fetch_source_articles_feeds_downloads_through_parse_stage(monkeypatch, db_manager):
+    base = "https://example.com"
+    candidates = [SimpleNamespace(url=f"{base}/nyheder/artikel-{i}") for i in range(5)]
+    monkeypatch.setattr("newsreader.fetcher.newspaper.build", lambda *a, **k: SimpleNamespace(articles=candidates))
+    monkeypatch.setattr("newsreader.fetcher.time.sleep", lambda _: None)
+
+    fetcher = NewsFetcher(db_manager)
+    fetcher.parse_pool = ParsePool(workers=0)
+    downloaded = []
+
+    def fake_download(url, deadline=None):
+        downloaded.append(url)
+        return None if url.endswith("-1") else _article_html(url.rsplit("/", 1)[-1])
+
+    monkeypatch.setattr(fetcher, "download_article_html", fake_download)
+
+    articles = fetcher.fetch_source_articles({"name": "Example", "url": base}, max_articles=3)
+
+    assert [a["title"] for a in articles] == ["artikel-0", "artikel-2", "artikel-3"]
+    assert all(a["source"] == "Example" for a in articles)
+    assert len(downloaded) == 4
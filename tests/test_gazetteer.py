@@ -0,0 +1,57 @@
+import json
+import os
+
+from newsreader import gazetteer as gazetteer_module
+from newsreader.gazetteer import Gazetteer, get_gazetteer
+
+
+def _write_places(path, places):
+    path.write_text(json.dumps(places), encoding="utf-8")
+
+
+def test_find_places_matches_whole_words_case_insensitively():
+    gazetteer = Gazetteer(["Copenhagen", "New York", "York", "Paris", "paris", "Aarhus"])
+
+    found = gazetteer.find_places("Flights from COPENHAGEN to new york, not to Parisian cafés.")
+
+    assert found == ["Copenhagen", "New York", "York"]
+    assert len(gazetteer) == 5
+
+
+def test_load_reuses_pickled_cache_until_json_changes(tmp_path, monkeypatch):
+    places_path = tmp_path / "geo_places.json"
+    cache_path = tmp_path / "cache" / "gazetteer.pickle"
+    _write_places(places_path, ["Odense", "Aalborg"])
+
+    first = Gazetteer.load(places_path, cache_path)
+    assert cache_path.exists()
+
+    def fail_from_json(path):
+        raise AssertionError("JSON should not be parsed when the cache is fresh")
+
+    monkeypatch.setattr(Gazetteer, "from_json", classmethod(lambda cls, path: fail_from_json(path)))
+    second = Gazetteer.load(places_path, cache_path)
+    assert second.places == first.places
+    monkeypatch.undo()
+
+    _write_places(places_path, ["Odense", "Aalborg", "Esbjerg"])
+    stat = places_path.stat()
+    os.utime(places_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    rebuilt = Gazetteer.load(places_path, cache_path)
+    assert "Esbjerg" in rebuilt.places
+
+
+def test_get_gazetteer_is_shared_and_reloads_on_change(tmp_path, monkeypatch):
+    places_path = tmp_path / "places.json"
+    _write_places(places_path, ["Berlin"])
+    monkeypatch.setattr(gazetteer_module, "_GAZETTEER", None)
+
+    first = get_gazetteer(places_path)
+    assert get_gazetteer(places_path) is first
+
+    _write_places(places_path, ["Berlin", "Hamburg"])
+    stat = places_path.stat()
+    os.utime(places_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    reloaded = get_gazetteer(places_path)
+    assert reloaded is not first
+    assert reloaded.find_places("Hamburg harbour") == ["Hamburg"]
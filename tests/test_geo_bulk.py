@@ -0,0 +1,96 @@
+import os
+
+import pytest
+
+from newsreader.geo_bulk import CHECKPOINT_NAME
+
+
+class OdenseTagger:
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.seen = []
+
+    def extract_geo_tags(self, content, title=None, summary=None, db_manager=None, not_found_callback=None):
+        self.seen.append(title)
+        if title == self.fail_on:
+            raise RuntimeError("tagger crashed")
+        if "Odense" not in f"{title} {content}":
+            return []
+        return [{"tag": "Odense", "confidence": 0.9, "label": "stub", "lat": 55.4, "lon": 10.4, "pid": os.getpid()}]
+
+
+def make_tagger():
+    return OdenseTagger()
+
+
+def test_bulk_geo_tagging_resumes_from_checkpoint(db_manager, article_factory):
+    ids = [article_factory(title=f"Odense {i}", url=f"https://example.com/bulk-{i}") for i in range(5)]
+    empty_id = article_factory(title="Nothing here", url="https://example.com/bulk-empty")
+
+    crashing = OdenseTagger(fail_on="Odense 3")
+    with pytest.raises(RuntimeError):
+        db_manager.geo_tag_all_articles(crashing, batch_size=2)
+    checkpoint = db_manager.get_bulk_job_checkpoint(CHECKPOINT_NAME)
+    assert checkpoint["last_id"] == ids[1] and checkpoint["processed"] == 2
+
+    progress = []
+    tagger = OdenseTagger()
+    stats = db_manager.geo_tag_all_articles(tagger, batch_size=2, progress=lambda done, total: progress.append((done, total)))
+
+    assert tagger.seen == ["Odense 2", "Odense 3", "Odense 4", "Nothing here"]
+    assert progress == [(4, 6), (6, 6)]
+    assert stats["processed"] == 6 and stats["tagged_articles"] == 3 and stats["resumed_after"] == ids[1]
+    assert db_manager.get_bulk_job_checkpoint(CHECKPOINT_NAME) is None
+    assert all(len(db_manager.get_geo_tags_for_article(article_id)) == 1 for article_id in ids)
+    assert db_manager.get_geo_tags_for_article(empty_id) == []
+
+
+def test_bulk_geo_tagging_in_worker_processes(db_manager, article_factory):
+    from newsreader.geo_bulk import run_geo_tagging
+
+    ids = [article_factory(title=f"Odense {i}", url=f"https://example.com/pool-{i}") for i in range(4)]
+
+    stats = run_geo_tagging(db_manager, None, batch_size=1, workers=2, processor_factory=make_tagger)
+
+    assert stats["processed"] == 4 and stats["tags"] == 4
+    assert all(len(db_manager.get_geo_tags_for_article(article_id)) == 1 for article_id in ids)
+
+
+def test_admin_geo_refresh_resolves_places_online(db_manager, monkeypatch):
+    from newsreader import flask_app as flask_module
+
+    calls = []
+    monkeypatch.setattr(flask_module, "NLPProcessor", lambda: "nlp")
+    monkeypatch.setattr(db_manager, "geo_tag_all_articles", lambda nlp, **kwargs: calls.append(kwargs) or {"processed": 0})
+
+    class Job:
+        db = db_manager
+
+        @staticmethod
+        def progress(done, total=None, message=None):
+            pass
+
+    flask_module._geo_refresh_job(Job())
+
+    assert calls[0]["workers"] == 1
+
+
+def test_offline_worker_pool_reports_skipped_online_lookups(db_manager, article_factory, monkeypatch, caplog):
+    from newsreader import geo_bulk
+
+    article_factory(title="Odense 0", url="https://example.com/offline-0")
+    monkeypatch.setattr(geo_bulk, "_tag_in_pool", lambda db, chunks, workers, factory, callback: (
+        (rows, [[] for _ in rows]) for rows in chunks
+    ))
+
+    class OnlineProcessor(OdenseTagger):
+        nominatim_fallback = True
+
+        def enrich_many(self, *args, **kwargs):
+            raise AssertionError("runs in the pool")
+
+    with caplog.at_level("WARNING", logger="newsreader.geo_bulk"):
+        stats = geo_bulk.run_geo_tagging(db_manager, OnlineProcessor(), workers=2)
+
+    assert stats["offline_only"] is True
+    assert "workers=1" in caplog.text
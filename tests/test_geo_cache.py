@@ -0,0 +1,65 @@
+import json
+import time
+
+import geopy.geocoders
+
+from newsreader import gazetteer as gazetteer_module
+from newsreader.geocache import GeoCache, get_geo_cache
+from newsreader.nlp_processor import NLPProcessor
+from newsreader.settings import get_settings
+
+
+class FakeLocation:
+    def __init__(self, lat, lon):
+        self.latitude = lat
+        self.longitude = lon
+        self.raw = {"importance": 0.8}
+
+
+class FakeNominatim:
+    calls = []
+
+    def __init__(self, user_agent=None):
+        pass
+
+    def geocode(self, place, addressdetails=True, timeout=10):
+        FakeNominatim.calls.append(place)
+        return FakeLocation(55.6761, 12.5683)
+
+
+def test_geo_cache_reads_through_to_table(db_manager):
+    cache = GeoCache(db_manager, max_entries=1)
+
+    assert cache.get("København") is None
+    cache.put("København", 55.6761, 12.5683, 0.9)
+    cache.put("Aarhus", 56.1629, 10.2039, 0.7)  # evicts København from the LRU
+
+    assert cache.get("københavn") == (55.6761, 12.5683, 0.9)
+    assert db_manager.get_geo_cache("KØBENHAVN")["lat"] == 55.6761
+
+
+def test_geo_cache_entries_expire(db_manager):
+    cache = GeoCache(db_manager, ttl_seconds=0)
+    cache.put("Odense", 55.4, 10.4)
+    time.sleep(0.01)
+
+    assert cache.get("Odense") is None
+    assert db_manager.get_geo_cache("Odense") is None
+
+
+def test_extract_geo_tags_geocodes_each_place_once(db_manager, monkeypatch):
+    get_settings().default_geo_places_path.write_text(json.dumps(["København", "Aarhus"]), encoding="utf-8")
+    monkeypatch.setattr(gazetteer_module, "_GAZETTEER", None)
+    monkeypatch.setattr(geopy.geocoders, "Nominatim", FakeNominatim)
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    FakeNominatim.calls = []
+    processor = NLPProcessor.__new__(NLPProcessor)
+
+    first = processor.extract_geo_tags("Nyt fra København.", db_manager=db_manager)
+    second = processor.extract_geo_tags("Mere fra københavn i dag.", db_manager=db_manager)
+    get_geo_cache(db_manager).clear()
+    third = processor.extract_geo_tags("København igen.", db_manager=db_manager)
+
+    assert FakeNominatim.calls == ["København"]
+    assert [tag["tag"] for tag in first + second + third] == ["København"] * 3
+    assert third[0]["lat"] == 55.6761 and third[0]["confidence"] == 0.8
@@ -0,0 +1,53 @@
+from datetime import UTC, datetime, timedelta
+
+from newsreader.geo_grid import BBox, cell_size_for_zoom, merge_cells, split_bbox
+
+
+def _tag(tag, lat, lon):
+    return {"tag": tag, "confidence": 0.9, "label": "test", "lat": lat, "lon": lon}
+
+
+def test_split_bbox_handles_antimeridian_and_world():
+    assert split_bbox(BBox(170, -10, 190, 10)) == [BBox(170, -10, 180, 10), BBox(-180, -10, -170, 10)]
+    assert split_bbox(BBox(-400, -90, 400, 90)) == [BBox(-180, -90, 180, 90)]
+    assert cell_size_for_zoom(0) == 45.0
+    assert cell_size_for_zoom(3) == cell_size_for_zoom(0) / 8
+
+
+def test_merge_cells_keeps_heaviest_points():
+    rows = [(0, 0, "Odense", 2, 110.0, 20.0), (0, 0, "Nyborg", 1, 55.0, 10.0), (1, 1, "Aarhus", 1, 56.0, 10.0)]
+
+    points, truncated = merge_cells(rows, max_points=1)
+
+    assert truncated
+    assert points == [{"lat": 55.0, "lon": 10.0, "weight": 3, "tag": "Odense", "tags": 2}]
+
+
+def test_rtree_tracks_geo_tag_writes(db_manager, article_factory):
+    article_id = article_factory()
+    db_manager.save_geo_tags(article_id, [_tag("Odense", 55.4, 10.4), _tag("Nowhere", None, None)])
+
+    with db_manager.get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM geo_tags_rtree").fetchone()[0] == 1
+        db_manager.clear_geo_tags()
+        assert conn.execute("SELECT COUNT(*) FROM geo_tags_rtree").fetchone()[0] == 0
+
+
+def test_geo_heatmap_aggregates_within_bbox(flask_app_client, article_factory, db_manager):
+    for _ in range(3):
+        db_manager.save_geo_tags(article_factory(), [_tag("København", 55.676, 12.568)])
+    db_manager.save_geo_tags(article_factory(), [_tag("Frederiksberg", 55.679, 12.533)])
+    db_manager.save_geo_tags(article_factory(), [_tag("Aarhus", 56.157, 10.211)])
+    old = article_factory(published_date=datetime.now(UTC) - timedelta(days=30))
+    db_manager.save_geo_tags(old, [_tag("New York", 40.71, -74.0)])
+
+    denmark = flask_app_client.get("/api/geo_heatmap?bbox=8,54,13,58&zoom=5").get_json()
+    world = flask_app_client.get("/api/geo_heatmap?zoom=0").get_json()
+    recent = flask_app_client.get("/api/geo_heatmap?zoom=0&days=7").get_json()
+
+    assert [(p["tag"], p["weight"], p["tags"]) for p in denmark["points"]] == [
+        ("København", 4, 2), ("Aarhus", 1, 1)
+    ]
+    assert sum(p["weight"] for p in world["points"]) == 6
+    assert all(p["tag"] != "New York" for p in recent["points"])
+    assert flask_app_client.get("/api/geo_heatmap?bbox=1,2,3").status_code == 400
@@ -0,0 +1,85 @@
+from datetime import UTC, datetime
+
+from newsreader.database import DatabaseManager
+from newsreader.fetcher import NewsFetcher
+
+
+def _tag(tag, lat=55.4038, lon=10.4024):
+    return {"tag": tag, "confidence": 0.9, "label": "test", "lat": lat, "lon": lon}
+
+
+def _rollups(db):
+    with db.get_connection() as conn:
+        tag_days = [tuple(row) for row in conn.execute("SELECT tag, day, mentions FROM geo_tag_daily ORDER BY tag, day")]
+        cells = conn.execute("SELECT COUNT(DISTINCT level), SUM(weight) FROM geo_cell_daily WHERE level = 0").fetchone()
+    return tag_days, tuple(cells)
+
+
+def test_rollups_follow_geo_tag_writes_and_deletes(db_manager, article_factory):
+    may_first = article_factory(published_date=datetime(2024, 5, 1, 8, tzinfo=UTC))
+    may_second = article_factory(published_date=datetime(2024, 5, 2, 8, tzinfo=UTC))
+    db_manager.save_geo_tags(may_first, [_tag("Odense"), _tag("Odense"), {"tag": "Ukendt", "confidence": 0.5}])
+    db_manager.save_geo_tag_chunk([(may_second, [_tag("Odense")])], "test", may_second, 1)
+
+    assert _rollups(db_manager) == (
+        [("Odense", "2024-05-01", 2), ("Odense", "2024-05-02", 1), ("Ukendt", "2024-05-01", 1)],
+        (1, 3),
+    )
+
+    db_manager.delete_article(may_first)
+    assert _rollups(db_manager) == ([("Odense", "2024-05-02", 1)], (1, 1))
+
+    db_manager.clear_geo_tags()
+    assert _rollups(db_manager) == ([], (0, None))
+
+
+def test_cleanup_old_articles_updates_rollups(db_manager, article_factory):
+    article_id = article_factory(published_date=datetime(2024, 5, 1, tzinfo=UTC))
+    db_manager.save_geo_tags(article_id, [_tag("Odense")])
+    with db_manager.get_connection() as conn:
+        conn.execute("UPDATE articles SET fetched_at = '2000-01-01 00:00:00'")
+        conn.commit()
+
+    assert NewsFetcher(db_manager).cleanup_old_articles(days_to_keep=30) == 1
+
+    assert _rollups(db_manager) == ([], (0, None))
+    assert db_manager.get_geo_tags_for_article(article_id) == []
+
+
+def test_rollups_backfilled_for_existing_databases(article_factory, db_manager):
+    article_id = article_factory(published_date=datetime(2024, 5, 1, tzinfo=UTC))
+    db_manager.save_geo_tags(article_id, [_tag("Odense")])
+    with db_manager.get_connection() as conn:
+        conn.executescript("DROP TABLE geo_rollup_levels; DELETE FROM geo_tag_daily; DELETE FROM geo_cell_daily;")
+
+    reopened = DatabaseManager(str(db_manager.db_path))
+
+    assert _rollups(reopened) == ([("Odense", "2024-05-01", 1)], (1, 1))
+
+
+def test_heatmap_time_window_and_timeline(flask_app_client, article_factory, db_manager):
+    for day in (1, 2, 2):
+        article_id = article_factory(published_date=datetime(2024, 5, day, 12, tzinfo=UTC))
+        db_manager.save_geo_tags(article_id, [_tag("Odense")])
+
+    timeline = flask_app_client.get("/api/geo_timeline").get_json()
+    one_day = flask_app_client.get("/api/geo_heatmap?zoom=3&start=2024-05-02&end=2024-05-02").get_json()
+    street = flask_app_client.get("/api/geo_heatmap?zoom=15&bbox=10.3,55.3,10.5,55.5&end=2024-05-01").get_json()
+
+    assert timeline["days"] == [{"day": "2024-05-01", "mentions": 1}, {"day": "2024-05-02", "mentions": 2}]
+    assert [(p["tag"], p["weight"]) for p in one_day["points"]] == [("Odense", 2)]
+    assert [(p["tag"], p["weight"]) for p in street["points"]] == [("Odense", 1)]
+    assert flask_app_client.get("/api/geo_heatmap?start=May").status_code == 400
+
+
+def test_rollups_balance_after_reparse_changes_the_date(db_manager, article_factory):
+    article_id = article_factory(url="https://example.com/reparsed", published_date=datetime(2024, 5, 1, 8, tzinfo=UTC))
+    db_manager.save_geo_tags(article_id, [_tag("Odense")])
+
+    db_manager.update_article_extraction("https://example.com/reparsed", {
+        "title": "Reparsed", "content": "Body", "published_date": datetime(2024, 6, 9, 8, tzinfo=UTC),
+    })
+    assert _rollups(db_manager) == ([("Odense", "2024-05-01", 1)], (1, 1))
+
+    db_manager.delete_article(article_id)
+    assert _rollups(db_manager) == ([], (0, None))
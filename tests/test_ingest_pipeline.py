@@ -0,0 +1,79 @@
+import time
+
+from newsreader.fetcher import NewsFetcher
+
+
+def _article(source: str, index: int) -> dict:
+    return {
+        "title": f"{source} nyhed {index}",
+        "content": f"Indhold om sport og økonomi nummer {index} fra {source}.",
+        "summary": None,
+        "url": f"https://{source.lower()}.example.com/nyheder/{index}",
+        "source": source,
+    }
+
+
+def _fetcher(db_manager) -> NewsFetcher:
+    fetcher = NewsFetcher(db_manager)
+    fetcher.geo_tag_on_ingest = False
+    fetcher.source_delay = 0
+    return fetcher
+
+
+def test_articles_are_persisted_while_the_source_is_still_downloading(monkeypatch, db_manager):
+    fetcher = _fetcher(db_manager)
+    visible_before_source_finished = []
+
+    def fake_fetch_source(source, max_articles=10, emit=None):
+        emit(_article(source["name"], 0))
+        deadline = time.time() + 5
+        while db_manager.get_article_count() == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        visible_before_source_finished.append(db_manager.get_article_count())
+        emit(_article(source["name"], 1))
+        return []
+
+    monkeypatch.setattr(fetcher, "fetch_source_articles", fake_fetch_source)
+
+    result = fetcher.fetch_all_sources(2, sources=[{"name": "Alpha", "url": "https://alpha.example.com"}])
+
+    assert visible_before_source_finished == [1]
+    assert result["saved"] == 2
+    assert result["saved_by_source"] == {"Alpha": 2}
+    assert result["scored"] == 2
+
+
+def test_pipeline_skips_duplicates_and_scores_new_articles(monkeypatch, db_manager, article_factory):
+    article_factory(url=_article("Beta", 0)["url"])
+    fetcher = _fetcher(db_manager)
+
+    def fake_fetch_source(source, max_articles=10, emit=None):
+        for index in range(3):
+            emit(_article(source["name"], index))
+        return []
+
+    monkeypatch.setattr(fetcher, "fetch_source_articles", fake_fetch_source)
+
+    result = fetcher.fetch_all_sources(3, sources=[{"name": "Alpha", "url": "a"}, {"name": "Beta", "url": "b"}])
+
+    assert result["saved_by_source"] == {"Alpha": 3, "Beta": 2}
+    assert result["duplicates"] == 1
+    scored = [a for a in db_manager.get_articles(limit=10) if a["source"] in ("Alpha", "Beta")]
+    assert len(scored) == 5
+    assert all(a["score"] > 0 for a in scored)
+
+
+def test_source_errors_do_not_stall_the_pipeline(monkeypatch, db_manager):
+    fetcher = _fetcher(db_manager)
+
+    def fake_fetch_source(source, max_articles=10, emit=None):
+        if source["name"] == "Broken":
+            raise RuntimeError("boom")
+        emit(_article(source["name"], 0))
+        return []
+
+    monkeypatch.setattr(fetcher, "fetch_source_articles", fake_fetch_source)
+
+    result = fetcher.fetch_all_sources(1, sources=[{"name": "Broken", "url": "x"}, {"name": "Alpha", "url": "a"}])
+
+    assert result["saved_by_source"] == {"Broken": 0, "Alpha": 1}
@@ -0,0 +1,174 @@
+import threading
+from types import SimpleNamespace
+
+from newsreader import flask_app as flask_module
+from newsreader import jobs as jobs_module
+from newsreader.database import DatabaseManager
+from newsreader.jobs import JobRunner
+
+
+def test_job_runs_in_background_and_records_result(db_manager):
+    runner = JobRunner(workers=1)
+
+    def work(job):
+        job.progress(2, 2, "halfway there")
+        return {"answer": 42}
+
+    try:
+        job = runner.submit(db_manager, "demo", work, created_by=7)
+        assert job["status"] in ("queued", "running", "succeeded")
+    finally:
+        runner.shutdown()
+
+    finished = db_manager.get_job(job["id"])
+    assert finished["status"] == "succeeded"
+    assert finished["result"] == {"answer": 42}
+    assert (finished["progress"], finished["total"]) == (2, 2)
+    assert finished["started_at"] and finished["finished_at"]
+
+
+def test_running_job_can_be_cancelled(db_manager):
+    runner = JobRunner(workers=1)
+    started = threading.Event()
+    cancelled = threading.Event()
+
+    def work(job):
+        started.set()
+        cancelled.wait(5)
+        job.progress(1, 10)
+        return {"finished": True}
+
+    try:
+        job = runner.submit(db_manager, "slow", work)
+        assert started.wait(5)
+        # A second submit of the same kind returns the active job
+        assert runner.submit(db_manager, "slow", work)["id"] == job["id"]
+        assert runner.cancel(db_manager, job["id"]) is True
+        cancelled.set()
+    finally:
+        runner.shutdown()
+
+    assert db_manager.get_job(job["id"])["status"] == "cancelled"
+    assert runner.cancel(db_manager, job["id"]) is False
+
+
+def test_failed_job_keeps_error(db_manager):
+    runner = JobRunner()
+
+    def work(job):
+        raise RuntimeError("boom")
+
+    job = runner.submit(db_manager, "broken", work, inline=True)
+
+    assert job["status"] == "failed"
+    assert job["error"] == "boom"
+
+
+def test_jobs_of_exited_processes_are_marked_failed(db_manager, monkeypatch):
+    monkeypatch.setattr(jobs_module, "_pid_alive", lambda pid: False)
+    host = jobs_module._owner().rsplit(":", 1)[0]
+    orphan = db_manager.create_job("purge_refresh", owner=f"{host}:999999")
+    elsewhere = db_manager.create_job("geo_refresh", owner="other-host:1")
+
+    jobs = JobRunner().list_jobs(db_manager)
+
+    statuses = {job["id"]: job["status"] for job in jobs}
+    assert statuses == {orphan: "failed", elsewhere: "queued"}
+
+
+def test_admin_jobs_page_and_status_api(flask_app_client, login_user, db_manager):
+    admin = login_user(username="admin")
+    response = flask_app_client.post("/recalc_scores", follow_redirects=True)
+    assert b"Scores recalculated" in response.data
+    job = db_manager.get_jobs()[0]
+    assert (job["kind"], job["status"], job["created_by"]) == ("recalc_scores", "succeeded", admin["id"])
+
+    page = flask_app_client.get("/admin/jobs")
+    assert page.status_code == 200
+    assert b"recalc_scores" in page.data
+
+    status = flask_app_client.get(f"/api/jobs/{job['id']}")
+    assert status.get_json()["status"] == "succeeded"
+    cancel = flask_app_client.post(f"/api/jobs/{job['id']}/cancel")
+    assert cancel.status_code == 409
+
+
+def test_job_status_hidden_from_other_users(flask_app_client, login_user, db_manager):
+    job_id = db_manager.create_job("purge_refresh", created_by=None, owner="other-host:1")
+    login_user()
+
+    assert flask_app_client.get(f"/api/jobs/{job_id}").status_code == 404
+    assert flask_app_client.get("/admin/jobs").status_code == 403
+
+
+def test_admin_route_runs_in_background_outside_tests(flask_app_client, login_user, db_manager, monkeypatch):
+    login_user(username="admin")
+    release = threading.Event()
+
+    def slow_geo_refresh(job):
+        release.wait(5)
+        return {"geo_tags": 0, "cleared": 0}
+
+    monkeypatch.setattr(flask_module, "_geo_refresh_job", slow_geo_refresh)
+    monkeypatch.setattr(flask_module, "job_runner", JobRunner(workers=1))
+    flask_module.app.config["JOBS_INLINE"] = False
+    try:
+        response = flask_app_client.post("/admin/articles/geo-refresh", follow_redirects=True)
+        assert b"Started background job" in response.data
+        job = db_manager.get_jobs()[0]
+        assert job["status"] in ("queued", "running")
+    finally:
+        flask_module.app.config.pop("JOBS_INLINE")
+        release.set()
+        flask_module.job_runner.shutdown()
+
+    assert db_manager.get_job(job["id"])["status"] == "succeeded"
+
+
+def test_only_one_active_job_per_kind_and_user(db_manager):
+    first = db_manager.create_job("purge_refresh", created_by=None, owner="other-host:1")
+
+    assert db_manager.create_job("purge_refresh", created_by=None, owner="other-host:2") is None
+    assert db_manager.create_job("purge_refresh", created_by=7, owner="other-host:2") is not None
+    assert JobRunner(workers=1).submit(db_manager, "purge_refresh", lambda job: {})["id"] == first
+
+    db_manager.finish_job(first, "succeeded")
+    assert db_manager.create_job("purge_refresh", created_by=None) is not None
+
+
+def test_background_job_flash_links_status_for_regular_users(flask_app_client, login_user, db_manager, monkeypatch):
+    user = login_user()
+    release = threading.Event()
+    monkeypatch.setattr(flask_module, "_recalc_scores_job", lambda job, user_id: release.wait(5) and {})
+    monkeypatch.setattr(flask_module, "job_runner", JobRunner(workers=1))
+    flask_module.app.config["JOBS_INLINE"] = False
+    try:
+        response = flask_app_client.post("/recalc_scores", follow_redirects=True)
+        job = db_manager.get_jobs()[0]
+    finally:
+        flask_module.app.config.pop("JOBS_INLINE")
+        release.set()
+        flask_module.job_runner.shutdown()
+
+    assert f"/api/jobs/{job['id']}".encode() in response.data
+    assert b"jobs page" not in response.data
+    assert flask_app_client.get(f"/api/jobs/{job['id']}").get_json()["created_by"] == user["id"]
+
+
+def test_purge_refresh_job_scores_the_job_database(monkeypatch, tmp_path, db_manager):
+    job_db = DatabaseManager(str(tmp_path / "job.sqlite"))
+
+    class DummyFetcher:
+        def __init__(self, db, sources_file=None):
+            self.db = db
+
+        def fetch_all_sources(self):
+            self.db.save_article("Danmark", "Politik", "", "https://example.com/job", "Src")
+
+    monkeypatch.setattr(flask_module, "NewsFetcher", DummyFetcher)
+
+    result = flask_module._purge_refresh_job(SimpleNamespace(db=job_db, progress=lambda *args: None))
+
+    assert result == {"deleted": 0, "fetched": 1}
+    assert job_db.get_articles(include_content=False)[0]["word_matches"] == {"danmark": 1, "politik": 1}
+    assert db_manager.get_article_count() == 0
@@ -50,3 +50,14 @@ def test_main_invokes_web(monkeypatch):
     main_module.main()
 
     assert captured == {"host": "127.0.0.5", "port": 9012, "debug": True}
+
+
+def test_main_invokes_reparse(monkeypatch):
+    invoked = {}
+
+    monkeypatch.setattr(main_module, "reparse_articles", lambda: invoked.setdefault("reparse", True))
+    monkeypatch.setattr(sys, "argv", ["main.py", "--reparse"])
+
+    main_module.main()
+
+    assert invoked.get("reparse") is True
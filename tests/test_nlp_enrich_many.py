@@ -0,0 +1,73 @@
+import json
+
+import spacy
+
+from newsreader import gazetteer as gazetteer_module
+from newsreader.geocache import GeoCodeResult
+from newsreader.nlp_processor import NLPProcessor
+from newsreader.settings import get_settings
+
+
+class FakeGeocoder:
+    def __init__(self):
+        self.calls = []
+
+    def geocode(self, place):
+        self.calls.append(place)
+        return GeoCodeResult(55.67, 12.55, 0.5) if place == "Vesterbro" else None
+
+
+class CountingPipeline:
+    """Blank Danish pipeline with a rule-based LOC recognizer; counts ``pipe`` calls."""
+
+    def __init__(self):
+        self.inner = spacy.blank("da")
+        ruler = self.inner.add_pipe("entity_ruler")
+        ruler.add_patterns([{"label": "LOC", "pattern": "Vesterbro"}, {"label": "LOC", "pattern": "Mordor"}])
+        self.pipe_calls = 0
+
+    def pipe(self, texts, batch_size=32, n_process=1):
+        self.pipe_calls += 1
+        return self.inner.pipe(texts, batch_size=batch_size, n_process=n_process)
+
+
+def _processor(monkeypatch):
+    places = [{"name": "Odense", "lat": 55.3958, "lon": 10.3886, "population": 180863, "country": "Denmark"}]
+    get_settings().default_geo_places_path.write_text(json.dumps(places), encoding="utf-8")
+    monkeypatch.setattr(gazetteer_module, "_GAZETTEER", None)
+    processor = NLPProcessor.__new__(NLPProcessor)
+    processor._nlp = CountingPipeline()
+    processor._model_used = "test"
+    processor.stop_words = {"og", "fra"}
+    processor.online_geocoder = FakeGeocoder()
+    return processor
+
+
+def test_enrich_many_combines_gazetteer_and_ner_places(db_manager, monkeypatch):
+    processor = _processor(monkeypatch)
+    articles = [
+        {"title": "Odense og Vesterbro", "summary": "", "content": "Cykler fra Odense til Vesterbro. Cykler igen."},
+        {"title": "Mordor", "summary": None, "content": "Intet nyt fra Mordor."},
+    ]
+
+    results = processor.enrich_many(articles, db_manager=db_manager, batch_size=8)
+
+    assert processor._nlp.pipe_calls == 1
+    assert [(tag["tag"], tag["label"]) for tag in results[0]["geo_tags"]] == [("Odense", "CITY_OR_COUNTRY"), ("Vesterbro", "NER_PLACE")]
+    assert results[0]["entities"] == ["Vesterbro"]
+    assert ("cykler", 2) in results[0]["keywords"]
+    assert not {"og", "fra"} & {word for word, _ in results[0]["keywords"]}
+    assert results[1]["geo_tags"] == []
+    assert db_manager.is_geo_tag_not_found("Mordor")
+    assert processor.online_geocoder.calls == ["Vesterbro", "Mordor"]
+
+
+def test_geo_tag_all_articles_uses_batches(db_manager, article_factory, monkeypatch):
+    processor = _processor(monkeypatch)
+    ids = [article_factory(title=f"Nyt fra Odense {i}", url=f"https://example.com/odense-{i}") for i in range(5)]
+
+    db_manager.geo_tag_all_articles(processor, batch_size=2)
+
+    assert processor._nlp.pipe_calls == 3
+    for article_id in ids:
+        assert [tag["tag"] for tag in db_manager.get_geo_tags_for_article(article_id)] == ["Odense"]
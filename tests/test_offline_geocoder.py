@@ -0,0 +1,41 @@
+import json
+
+from newsreader import gazetteer as gazetteer_module
+from newsreader.gazetteer import Gazetteer
+from newsreader.geocoder import OfflineGeocoder, population_confidence
+from newsreader.nlp_processor import NLPProcessor
+from newsreader.settings import get_settings
+
+
+class FailingGeocoder:
+    def geocode(self, place):
+        raise AssertionError(f"{place} should not be geocoded online")
+
+
+def test_gazetteer_keeps_most_populous_entry_per_name():
+    gazetteer = Gazetteer([
+        {"name": "Paris", "lat": 33.66, "lon": -95.55, "population": 24171, "country": "United States"},
+        {"name": "paris", "lat": 48.8567, "lng": 2.3522, "population": "11060000", "country": "France"},
+        "Denmark",
+    ])
+
+    paris = gazetteer.lookup("PARIS")
+    assert (paris.name, paris.country, paris.lon) == ("Paris", "France", 2.3522)
+    assert gazetteer.lookup("Denmark").lat is None
+    assert OfflineGeocoder(gazetteer).geocode("Denmark") is None
+    assert OfflineGeocoder(gazetteer).geocode("Paris") == (48.8567, 2.3522, population_confidence(11060000))
+
+
+def test_extract_geo_tags_resolves_gazetteer_places_offline(db_manager, monkeypatch):
+    places = [{"name": "Odense", "lat": 55.3958, "lon": 10.3886, "population": 180863, "country": "Denmark"}, "Narnia"]
+    get_settings().default_geo_places_path.write_text(json.dumps(places), encoding="utf-8")
+    monkeypatch.setattr(gazetteer_module, "_GAZETTEER", None)
+    processor = NLPProcessor.__new__(NLPProcessor)
+    processor.nominatim_fallback = False
+    processor.online_geocoder = FailingGeocoder()
+
+    tags = processor.extract_geo_tags("Odense og Narnia", db_manager=db_manager)
+
+    assert [(tag["tag"], tag["lat"], tag["lon"]) for tag in tags] == [("Odense", 55.3958, 10.3886)]
+    # A miss without the online fallback is not recorded as "not found"
+    assert not db_manager.is_geo_tag_not_found("Narnia")
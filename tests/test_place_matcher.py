@@ -0,0 +1,43 @@
+import re
+
+from newsreader.place_matcher import PlaceMatcher
+
+
+def test_find_all_reports_positions_and_overlaps():
+    matcher = PlaceMatcher(["New York", "York", "Paris"])
+    text = "From new york to PARIS."
+
+    matches = matcher.find_all(text)
+
+    assert matches == [(5, 13, "New York"), (9, 13, "York"), (17, 22, "Paris")]
+    assert [text[start:end] for start, end, _ in matches] == ["new york", "york", "PARIS"]
+
+
+def test_find_all_requires_whole_words():
+    matcher = PlaceMatcher(["Paris", "Nice", "Oslo"])
+
+    assert matcher.find_all("Parisian nicety, Oslo2 and _Oslo") == []
+    assert [place for _, _, place in matcher.find_all("(Paris) Nice-Oslo")] == ["Paris", "Nice", "Oslo"]
+
+
+def test_find_all_folds_danish_letters():
+    matcher = PlaceMatcher(["Århus", "Køge", "Ærø", "Straße"])
+    text = "Fra ÅRHUS over KØGE til ærø, ikke Køgebugt. STRASSE"
+
+    matches = matcher.find_all(text)
+
+    assert [place for _, _, place in matches] == ["Århus", "Køge", "Ærø", "Straße"]
+    assert [text[start:end] for start, end, _ in matches] == ["ÅRHUS", "KØGE", "ærø", "STRASSE"]
+
+
+def test_find_all_agrees_with_per_place_regex():
+    places = ["Aarhus", "Aalborg", "Aa", "Borg", "Ring", "Ringsted", "Sted", "Rings", "Haderslev", "Lev"]
+    text = "Aalborg og Aarhus, Ringsted; ring sted. aa borg — Haderslev lev RINGS"
+    matcher = PlaceMatcher(places)
+
+    expected = set()
+    for place in places:
+        for match in re.finditer(r"\b" + re.escape(place) + r"\b", text, re.IGNORECASE):
+            expected.add((match.start(), match.end(), place))
+
+    assert set(matcher.find_all(text)) == expected
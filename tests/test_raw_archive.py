@@ -0,0 +1,72 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+from newsreader.fetcher import NewsFetcher
+from newsreader.parse_pool import ParsePool
+from newsreader.raw_archive import RawPageStore
+from newsreader.settings import get_settings
+
+
+def _article_html(title: str) -> str:
+    first = " ".join(["Stormen væltede træer i hele byen og lukkede flere veje i aftes."] * 8)
+    second = " ".join(["Beboerne opfordres til at blive indendørs indtil vinden lægger sig igen."] * 8)
+    return (
+        f"<html><head><title>{title}</title></head>"
+        f"<body><article><h1>{title}</h1><p>{first}</p><p>{second}</p></article></body></html>"
+    )
+
+
+def test_raw_page_store_round_trip_is_content_addressed(tmp_path):
+    store = RawPageStore(tmp_path / "raw", use_zstd=False)
+    html = "<html><body>Hej København</body></html>"
+
+    digest = store.put(html)
+
+    assert store.put(html) == digest
+    assert store.get(digest) == html
+    stored = list((tmp_path / "raw").rglob("*.html.gz"))
+    assert [p.name for p in stored] == [f"{digest}.html.gz"]
+    assert stored[0].parent.parent.name == digest[:2]
+    assert store.get("0" * 64) is None
+
+
+def test_reparse_archive_updates_articles_without_network(tmp_path, db_manager):
+    fetcher = NewsFetcher(db_manager)
+    fetcher.raw_store = RawPageStore(tmp_path / "raw", use_zstd=False)
+    fetcher.parse_pool = ParsePool(workers=0)
+
+    url = "https://example.com/nyheder/storm"
+    db_manager.save_article("Old title", "old body", "old summary", url, "Example")
+    fetcher.archive_html(url, _article_html("Storm rammer Odense"))
+
+    stats = fetcher.reparse_archive()
+
+    assert stats == {"pages": 1, "updated": 1, "missing": 0, "failed": 0}
+    with db_manager.get_connection() as conn:
+        row = conn.execute("SELECT title, content, summary FROM articles WHERE url = ?", (url,)).fetchone()
+    assert row["title"] == "Storm rammer Odense"
+    assert "Stormen væltede" in row["content"]
+    assert row["summary"] == "old summary"
+
+
+def test_archive_dir_follows_settings_and_old_pages_are_pruned(tmp_path, db_manager):
+    sources = tmp_path / "sources.json"
+    sources.write_text(json.dumps({"archive_raw_html": True, "sources": []}))
+    fetcher = NewsFetcher(db_manager, sources_file=str(sources))
+    assert fetcher.raw_store.root == get_settings().raw_archive_dir
+    assert str(fetcher.raw_store.root).startswith(str(tmp_path))
+
+    fetcher.archive_html("https://example.com/old", "<html>gammel</html>")
+    fetcher.archive_html("https://example.com/shared-old", "<html>delt</html>")
+    fetcher.archive_html("https://example.com/shared-new", "<html>delt</html>")
+    with db_manager.get_connection() as conn:
+        conn.execute(
+            "UPDATE raw_pages SET fetched_at = ? WHERE url != ?",
+            (datetime.now(timezone.utc) - timedelta(days=40), "https://example.com/shared-new"),
+        )
+        conn.commit()
+
+    assert fetcher.prune_raw_archive(30) == 1
+    assert [url for url, _ in db_manager.get_raw_pages()] == ["https://example.com/shared-new"]
+    assert fetcher.raw_store.get(RawPageStore.digest("<html>delt</html>")) == "<html>delt</html>"
+    assert not fetcher.raw_store.contains(RawPageStore.digest("<html>gammel</html>"))
@@ -0,0 +1,66 @@
+import json
+
+import requests
+
+from newsreader.replay import ReplayConditions, ReplaySource, percentile, run_benchmark
+
+
+def _write_corpus(root, article_count=4):
+    (root / "nyheder").mkdir(parents=True)
+    pages, links = {}, []
+    for i in range(article_count):
+        path = f"/samfund/storm-rammer-odense-i-nat-del-{i}"
+        links.append(f'<a href="https://nyheder.example.dk{path}">Historie {i}</a>')
+        first = " ".join([f"Stormen væltede træer i hele byen nummer {i} og lukkede flere veje i aftes."] * 8)
+        second = " ".join(["Beboerne opfordres til at blive indendørs indtil vinden lægger sig igen."] * 8)
+        rel = f"nyheder/{i + 1:04d}.html"
+        (root / rel).write_text(
+            f"<html><head><title>Historie {i}</title></head><body><article>"
+            f"<h1>Historie {i}</h1><p>{first}</p><p>{second}</p></article></body></html>",
+            encoding="utf-8",
+        )
+        pages[path] = rel
+    (root / "nyheder" / "0000.html").write_text("<html><body>" + "".join(links) + "</body></html>", encoding="utf-8")
+    pages["/"] = "nyheder/0000.html"
+    manifest = {"sources": [{"name": "Example Nyheder", "url": "https://nyheder.example.dk", "pages": pages}]}
+    (root / "corpus.json").write_text(json.dumps(manifest), encoding="utf-8")
+    return root
+
+
+def test_percentile_interpolates():
+    assert percentile([], 50) == 0.0
+    assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+    assert percentile([1.0, 2.0, 3.0, 4.0], 100) == 4.0
+
+
+def test_replay_source_rewrites_links_and_injects_errors(tmp_path):
+    page = tmp_path / "front.html"
+    page.write_text('<a href="https://nyheder.example.dk/a">A</a>', encoding="utf-8")
+
+    replay = ReplaySource("https://nyheder.example.dk", {"/": page})
+    replay.start()
+    try:
+        body = requests.get(replay.url + "/", timeout=5).text
+        assert f'href="{replay.origin}/a"' in body
+        assert requests.get(replay.url + "/missing", timeout=5).status_code == 404
+    finally:
+        replay.stop()
+
+    failing = ReplaySource("https://nyheder.example.dk", {"/": page}, ReplayConditions(error_rate=1.0))
+    failing.start()
+    try:
+        assert requests.get(failing.url + "/", timeout=5).status_code == 503
+        assert failing.errors_injected == 1
+    finally:
+        failing.stop()
+
+
+def test_run_benchmark_fetches_replayed_corpus(tmp_path):
+    corpus = _write_corpus(tmp_path / "corpus")
+
+    report = run_benchmark(corpus, ReplayConditions(latency_ms=5), fetcher_config={"parse_workers": 0})
+
+    assert report["articles"] == 4
+    assert report["errors_injected"] == 0
+    assert report["latency_p95_seconds"] >= report["latency_p50_seconds"] > 0
+    assert report["articles_per_second"] > 0
@@ -0,0 +1,82 @@
+from newsreader import flask_app as flask_module
+from newsreader.response_cache import ResponseCache
+
+
+def _geo(tag):
+    return [{"tag": tag, "confidence": 0.9, "label": "test", "lat": 55.4, "lon": 10.4}]
+
+
+def test_response_cache_evicts_by_size():
+    cache = ResponseCache(max_bytes=10)
+    cache.put("a", b"12345", "text/plain")
+    cache.put("b", b"12345", "text/plain")
+    cache.get("a")
+    cache.put("c", b"123", "text/plain")  # evicts b, the least recently used
+
+    assert cache.get("b") is None
+    assert cache.get("a").body == b"12345"
+    assert cache.size == 8
+    assert cache.put("big", b"x" * 11, "text/plain").etag
+    assert cache.get("big") is None
+
+
+def test_api_etag_and_304_until_data_changes(flask_app_client, article_factory, db_manager, monkeypatch):
+    article_id = article_factory()
+    db_manager.save_geo_tags(article_id, _geo("Odense"))
+    calls = []
+    original = db_manager.get_excluded_tags
+    monkeypatch.setattr(db_manager, "get_excluded_tags", lambda: calls.append(1) or original())
+
+    first = flask_app_client.get("/api/geo_tags")
+    etag = first.headers["ETag"]
+    revalidated = flask_app_client.get("/api/geo_tags", headers={"If-None-Match": etag})
+    repeated = flask_app_client.get("/api/geo_tags")
+
+    assert not etag.startswith("W/")
+    assert "no-cache" in first.headers["Cache-Control"]
+    assert revalidated.status_code == 304 and revalidated.data == b""
+    assert repeated.data == first.data
+    assert len(calls) == 1
+
+    db_manager.save_geo_tags(article_id, _geo("Nyborg"))
+    changed = flask_app_client.get("/api/geo_tags", headers={"If-None-Match": etag})
+
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert any(entry["tag"] == "Nyborg" for entry in changed.get_json()["geo_tags"])
+
+
+def test_excluding_a_tag_invalidates_geo_responses(flask_app_client, article_factory, db_manager):
+    db_manager.save_geo_tags(article_factory(), _geo("Odense"))
+    assert flask_app_client.get("/api/geo_heatmap?zoom=3").get_json()["points"]
+
+    db_manager.add_excluded_tag("Odense")
+
+    assert flask_app_client.get("/api/geo_heatmap?zoom=3").get_json()["points"] == []
+
+
+def test_index_cached_only_for_anonymous_visitors(flask_app_client, article_factory, login_user):
+    article_factory(title="Cached Headline")
+
+    anonymous = flask_app_client.get("/")
+    assert anonymous.headers.get("ETag")
+    assert "private" in anonymous.headers["Cache-Control"]
+    assert "Cookie" in anonymous.headers["Vary"]
+    hits = flask_module.response_cache.hits
+    assert flask_app_client.get("/").data == anonymous.data
+    assert flask_module.response_cache.hits == hits + 1
+
+    login_user()
+    personal = flask_app_client.get("/")
+    assert personal.status_code == 200
+    assert "ETag" not in personal.headers
+    assert b"Cached Headline" in personal.data
+
+
+def test_index_cache_follows_geo_tags_and_exclusions(flask_app_client, article_factory, db_manager):
+    db_manager.save_geo_tags(article_factory(title="Ringenes Herre"), _geo("Mordor"))
+    assert b"Ringenes Herre" in flask_app_client.get("/").data
+
+    db_manager.add_excluded_tag("Mordor")
+
+    assert b"Ringenes Herre" not in flask_app_client.get("/").data
@@ -0,0 +1,39 @@
+from newsreader.scorer import describe_word_matches
+
+
+def test_scoring_persists_matched_word_counts(db_manager, article_factory, scorer, user_factory):
+    article_id = article_factory(title="Danmark og sport", summary="Mere sport", content="Politik i Danmark")
+    user = user_factory()
+    db_manager.add_score_word(user["id"], "sport", 3)
+
+    scorer.score_all_articles()
+    scorer.score_all_articles(user_id=user["id"])
+
+    default_view = db_manager.get_articles(include_content=False)[0]
+    user_view = db_manager.get_articles(user_id=user["id"])[0]
+    assert default_view["id"] == article_id and default_view["content"] is None
+    assert default_view["word_matches"] == {"danmark": 2, "politik": 1, "sport": 2}
+    assert default_view["score"] == 2 * 5 + 4 + 2 * 2
+    assert user_view["word_matches"]["sport"] == 2
+    assert user_view["content"] == "Politik i Danmark"
+
+
+def test_index_tooltip_reads_stored_matches(flask_app_client, db_manager, article_factory, scorer):
+    article_factory(title="Teknologi nyt", summary="", content="")
+    assert b"Not scored yet" in flask_app_client.get("/").data
+
+    scorer.score_all_articles()
+
+    body = flask_app_client.get("/").data.decode("utf-8")
+    assert "teknologi (x1)" in body
+    assert describe_word_matches({}) == "No score words found"
+
+
+def test_scoring_handles_deferred_null_summary(db_manager, scorer):
+    article_id = db_manager.save_article("Danmark", "Sport i Danmark", None, "https://example.com/null", "Src")
+
+    scorer.score_all_articles()
+
+    article = db_manager.get_articles(include_content=False)[0]
+    assert article["id"] == article_id
+    assert article["word_matches"] == {"danmark": 2, "sport": 1}
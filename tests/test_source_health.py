@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from newsreader.fetcher import NewsFetcher
+from newsreader.source_health import CLOSED, HALF_OPEN, OPEN, SourceHealth, TransientError, retry_with_backoff
+
+NOW = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+CONFIG = {"breaker_failure_threshold": 2, "breaker_cooldown_seconds": 60}
+
+
+def test_breaker_opens_after_threshold_and_probes_after_cooldown(db_manager):
+    health = SourceHealth(db_manager, CONFIG)
+
+    health.record_failure("DR", "timeout", now=NOW)
+    assert health.allow("DR", now=NOW)
+    health.record_failure("DR", "timeout", now=NOW)
+
+    assert not health.allow("DR", now=NOW + timedelta(seconds=30))
+    assert health.allow("DR", now=NOW + timedelta(seconds=61))
+    assert db_manager.get_source_health()[0]["state"] == HALF_OPEN
+
+
+def test_failed_probe_reopens_with_longer_cooldown_and_success_closes(db_manager):
+    health = SourceHealth(db_manager, CONFIG)
+    health.record_failure("DR", "timeout", now=NOW)
+    health.record_failure("DR", "timeout", now=NOW)
+    probe_at = NOW + timedelta(seconds=61)
+    assert health.allow("DR", now=probe_at)
+
+    health.record_failure("DR", "still down", now=probe_at)
+    state = SourceHealth(db_manager, CONFIG).snapshot()[0]
+    assert state["state"] == OPEN
+    assert state["retry_at"] == probe_at + timedelta(seconds=120)
+
+    health.record_success("DR", now=probe_at + timedelta(seconds=121))
+    assert db_manager.get_source_health()[0]["state"] == CLOSED
+
+
+def test_retry_with_backoff_retries_only_transient_errors():
+    calls = []
+    sleeps = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise TransientError("503 Server Error")
+        return "ok"
+
+    assert retry_with_backoff(flaky, attempts=3, base_delay=1, sleep=sleeps.append) == "ok"
+    assert len(sleeps) == 2 and sleeps[1] > sleeps[0] * 0.5
+
+    def broken():
+        raise ValueError("404 Client Error: Not Found")
+
+    with pytest.raises(ValueError):
+        retry_with_backoff(broken, attempts=3, sleep=sleeps.append)
+    assert len(sleeps) == 2
+
+
+def test_open_circuit_skips_source_without_network(monkeypatch, db_manager):
+    built = []
+    monkeypatch.setattr("newsreader.fetcher.newspaper.build", lambda *a, **k: built.append(1) or SimpleNamespace(articles=[]))
+    monkeypatch.setattr("newsreader.source_health.time.sleep", lambda _: None)
+    fetcher = NewsFetcher(db_manager)
+    fetcher.source_health = SourceHealth(db_manager, {"breaker_failure_threshold": 1, "breaker_cooldown_seconds": 600})
+    fetcher.download_retries = 0
+    source = {"name": "Down", "url": "https://down.example.com"}
+
+    assert fetcher.fetch_source_articles(source) == []
+    assert fetcher.fetch_source_articles(source) == []
+
+    assert built == [1]
+    assert db_manager.get_source_health()[0]["state"] == OPEN
+
+
+def test_admin_dashboard_shows_breaker_state(flask_app_client, user_factory, db_manager):
+    admin = user_factory(username="admin")
+    flask_app_client.post("/login", data={"username": "admin", "password": admin["password"]})
+    SourceHealth(db_manager, {"breaker_failure_threshold": 1}).record_failure("DR Nyheder", "Read timed out")
+
+    body = flask_app_client.get("/admin").data.decode("utf-8")
+
+    assert "Source Health" in body
+    assert "DR Nyheder" in body
+    assert "Read timed out" in body
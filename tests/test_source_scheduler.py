@@ -0,0 +1,97 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+from newsreader.source_scheduler import SourceScheduler
+
+SOURCES = [{"name": "Busy"}, {"name": "Quiet"}]
+CONFIG = {
+    "fetch_interval_minutes": 30,
+    "min_fetch_interval_minutes": 5,
+    "max_fetch_interval_minutes": 240,
+    "target_new_articles": 3,
+    "schedule_jitter": 0,
+}
+
+
+def test_unknown_sources_are_due_immediately(db_manager):
+    scheduler = SourceScheduler(db_manager, SOURCES, CONFIG)
+
+    assert [s["name"] for s in scheduler.due_sources()] == ["Busy", "Quiet"]
+
+
+def test_intervals_follow_observed_rate_within_bounds(db_manager):
+    scheduler = SourceScheduler(db_manager, SOURCES, CONFIG)
+    start = datetime(2024, 5, 1, 8, 0, tzinfo=timezone.utc)
+    scheduler.record_fetch("Busy", 10, now=start)
+    scheduler.record_fetch("Quiet", 0, now=start)
+
+    for hour in range(1, 6):
+        now = start + timedelta(hours=hour)
+        scheduler.record_fetch("Busy", 30, now=now)
+        scheduler.record_fetch("Quiet", 0, now=now)
+
+    busy = scheduler.states["Busy"]
+    quiet = scheduler.states["Quiet"]
+    assert busy.interval_minutes < 30
+    assert busy.interval_minutes >= 5
+    assert quiet.interval_minutes == 240
+    assert scheduler.due_sources(now=start + timedelta(hours=5, minutes=busy.interval_minutes)) == [{"name": "Busy"}]
+
+
+def test_jitter_stays_within_fraction(db_manager):
+    config = dict(CONFIG, schedule_jitter=0.2)
+    scheduler = SourceScheduler(db_manager, SOURCES, config, rng=random.Random(1))
+    now = datetime(2024, 5, 1, 8, 0, tzinfo=timezone.utc)
+
+    state = scheduler.record_fetch("Busy", 6, now=now)
+
+    delay = (state.next_fetch_at - now).total_seconds() / 60
+    assert state.interval_minutes * 0.8 <= delay <= state.interval_minutes * 1.2
+
+
+def test_state_persists_across_instances(db_manager):
+    now = datetime(2024, 5, 1, 8, 0, tzinfo=timezone.utc)
+    SourceScheduler(db_manager, SOURCES, CONFIG).record_fetch("Busy", 6, now=now)
+
+    reloaded = SourceScheduler(db_manager, SOURCES, CONFIG)
+
+    assert reloaded.states["Busy"].last_fetch_at == now
+    assert reloaded.due_sources(now=now + timedelta(minutes=1)) == [{"name": "Quiet"}]
+
+
+def test_seed_rate_from_article_history(db_manager, article_factory):
+    for _ in range(12):
+        article_factory(source="Busy")
+
+    scheduler = SourceScheduler(db_manager, SOURCES, CONFIG)
+
+    assert scheduler.states["Busy"].rate_per_hour > 0
+    assert scheduler.states["Busy"].interval_minutes == 15
+
+
+def test_capped_fetch_only_raises_the_rate(db_manager):
+    scheduler = SourceScheduler(db_manager, SOURCES, CONFIG)
+    start = datetime(2024, 5, 1, 8, 0, tzinfo=timezone.utc)
+    scheduler.record_fetch("Busy", 10, now=start)
+    scheduler.record_fetch("Busy", 30, now=start + timedelta(hours=1))
+    rate = scheduler.states["Busy"].rate_per_hour
+
+    scheduler.record_fetch("Busy", 10, now=start + timedelta(hours=3), capped=True)
+    assert scheduler.states["Busy"].rate_per_hour == rate
+
+    scheduler.record_fetch("Busy", 10, now=start + timedelta(hours=3, minutes=10), capped=True)
+    assert scheduler.states["Busy"].rate_per_hour == 60.0
+
+
+def test_defer_keeps_rate_and_last_fetch(db_manager):
+    scheduler = SourceScheduler(db_manager, SOURCES, CONFIG)
+    start = datetime(2024, 5, 1, 8, 0, tzinfo=timezone.utc)
+    before = scheduler.record_fetch("Busy", 10, now=start)
+    rate, last_fetch = before.rate_per_hour, before.last_fetch_at
+
+    later = start + timedelta(hours=2)
+    state = scheduler.defer("Busy", now=later)
+
+    assert state.rate_per_hour == rate
+    assert state.last_fetch_at == last_fetch
+    assert state.next_fetch_at == later + timedelta(minutes=state.interval_minutes)
@@ -0,0 +1,47 @@
+import spacy
+
+from newsreader import spacy_models
+from newsreader.nlp_processor import NLPProcessor
+
+
+class FakePipeline:
+    pipe_names = ["tok2vec", "ner"]
+
+
+def test_models_load_once_per_process_without_unused_components(monkeypatch):
+    spacy_models.clear()
+    calls = []
+
+    def fake_load(name, exclude=()):
+        calls.append((name, tuple(exclude)))
+        return FakePipeline()
+
+    monkeypatch.setattr(spacy, "load", fake_load)
+    first = NLPProcessor.__new__(NLPProcessor)
+    second = NLPProcessor.__new__(NLPProcessor)
+
+    assert calls == []  # nothing is loaded until the pipeline is used
+    assert first.nlp is second.nlp
+    assert first.model_used == "da_core_news_lg"
+    assert calls == [("da_core_news_lg", ("parser", "lemmatizer"))]
+    spacy_models.clear()
+
+
+def test_missing_models_fall_back_to_blank_pipeline(monkeypatch):
+    spacy_models.clear()
+    attempts = []
+
+    def missing(name, exclude=()):
+        attempts.append(name)
+        raise OSError(f"[E050] Can't find model '{name}'")
+
+    monkeypatch.setattr(spacy, "load", missing)
+    monkeypatch.setattr(spacy_models, "_download", lambda name: False)
+
+    nlp, model_name = spacy_models.get_ner_model()
+    again, _ = spacy_models.get_ner_model()
+
+    assert model_name == spacy_models.BLANK_MODEL
+    assert nlp is again
+    assert attempts == ["da_core_news_lg", "en_core_web_sm"]
+    spacy_models.clear()
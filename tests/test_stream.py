@@ -0,0 +1,96 @@
+import json
+
+from newsreader import flask_app as flask_module
+
+
+def _geo(tag, lat=55.4, lon=10.4):
+    return [{"tag": tag, "confidence": 0.9, "label": "test", "lat": lat, "lon": lon}]
+
+
+def _read_stream(client, **headers):
+    flask_module.app.config["STREAM_MAX_SECONDS"] = 0
+    try:
+        response = client.get("/api/stream", headers=headers)
+        return response, response.get_data(as_text=True)
+    finally:
+        flask_module.app.config.pop("STREAM_MAX_SECONDS")
+
+
+def _messages(body):
+    messages = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if "event" in fields:
+            messages.append((fields["event"], int(fields["id"]), json.loads(fields["data"])))
+    return messages
+
+
+def test_triggers_record_ingest_events(db_manager, article_factory):
+    start = db_manager.get_latest_ingest_event_id()
+    first = article_factory(title="Ny artikel")
+    second = article_factory(title="Kopi")
+    db_manager.save_geo_tags(first, _geo("Odense"))
+    db_manager.mark_article_duplicate(second, first)
+
+    events, last_id = db_manager.get_ingest_events(start)
+
+    assert [event["kind"] for event in events] == ["article", "geo", "duplicate"]
+    assert events[0]["article"]["title"] == "Ny artikel"
+    assert events[1]["tag"] == "Odense"
+    assert events[2]["article_id"] == second
+    assert last_id == db_manager.get_latest_ingest_event_id()
+
+    db_manager.add_excluded_tag("Odense")
+    assert [event["kind"] for event in db_manager.get_ingest_events(start)[0]] == ["article", "duplicate"]
+
+
+def test_stream_replays_after_last_event_id(flask_app_client, db_manager, article_factory):
+    start = db_manager.get_latest_ingest_event_id()
+    first = article_factory(title="Første")
+    db_manager.save_geo_tags(first, _geo("Aarhus", 56.15, 10.2))
+    db_manager.save_geo_tags(article_factory(title="Anden"), _geo("Aarhus", 56.15, 10.2))
+
+    response, body = _read_stream(flask_app_client, **{"Last-Event-ID": str(start)})
+    messages = _messages(body)
+
+    assert response.mimetype == "text/event-stream"
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert body.startswith("retry: ")
+    assert [(event, data.get("title")) for event, _, data in messages[:2]] == [("article", "Første"), ("article", "Anden")]
+    event, event_id, data = messages[-1]
+    assert event == "geo" and event_id == db_manager.get_latest_ingest_event_id()
+    assert data["tags"] == [{"tag": "Aarhus", "lat": 56.15, "lon": 10.2, "count": 2}]
+    assert [message[1] for message in messages] == sorted(message[1] for message in messages)
+
+
+def test_fresh_connection_starts_at_now(flask_app_client, article_factory):
+    article_factory(title="Gammel")
+
+    _, body = _read_stream(flask_app_client)
+
+    assert _messages(body) == []
+    assert flask_app_client.get("/api/stream?since=abc").status_code == 400
+
+
+def test_stream_cards_only_use_locally_cached_thumbnails(flask_app_client, db_manager, article_factory, monkeypatch, tmp_path):
+    import io
+
+    from PIL import Image
+
+    from newsreader.thumbnails import ThumbnailCache, thumbnail_key
+
+    cache = ThumbnailCache(tmp_path / "thumbs")
+    buffer = io.BytesIO()
+    Image.new("RGB", (400, 300), (10, 120, 200)).save(buffer, format="PNG")
+    cache.store("https://img.example.com/cached.png", buffer.getvalue())
+    monkeypatch.setattr(flask_module, "get_thumbnail_cache", lambda: cache)
+    start = db_manager.get_latest_ingest_event_id()
+    article_factory(title="Cached", thumbnail_url="https://img.example.com/cached.png")
+    article_factory(title="Remote", thumbnail_url="https://img.example.com/remote.png")
+
+    _, body = _read_stream(flask_app_client, **{"Last-Event-ID": str(start)})
+    cards = {data["title"]: data for event, _, data in _messages(body) if event == "article"}
+
+    assert cards["Cached"]["thumbnail"] == f"/thumbnails/{thumbnail_key('https://img.example.com/cached.png')}.jpg"
+    assert cards["Remote"]["thumbnail"] is None
+    assert "img.example.com" not in body
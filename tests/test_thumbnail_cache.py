@@ -0,0 +1,104 @@
+import io
+import os
+
+from PIL import Image
+
+from newsreader import flask_app as flask_module
+from newsreader.extraction import find_thumbnail
+from newsreader.thumbnails import ThumbnailCache, thumbnail_key
+
+
+def _png_bytes(size=(1200, 800)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGBA", size, (200, 30, 30, 255)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_store_downsizes_to_jpeg(tmp_path):
+    cache = ThumbnailCache(tmp_path)
+
+    path = cache.store("https://img.example.com/a.png", _png_bytes())
+
+    with Image.open(path) as image:
+        assert image.format == "JPEG"
+        assert max(image.size) <= 320
+    assert cache.lookup("https://img.example.com/a.png") == thumbnail_key("https://img.example.com/a.png")
+    assert cache.lookup("https://img.example.com/missing.png") is None
+
+
+def test_enforce_limit_evicts_least_recently_used(tmp_path):
+    cache = ThumbnailCache(tmp_path, max_bytes=0)
+    urls = [f"https://img.example.com/{i}.png" for i in range(3)]
+    paths = [cache.store(url, _png_bytes((400, 400))) for url in urls]
+    for age, path in zip((3 * 3600, 2 * 3600, 2 * 3600 - 60), paths):
+        os.utime(path, (path.stat().st_atime - age, path.stat().st_mtime - age))
+    cache.lookup(urls[0])  # recently viewed, so it survives
+    cache.max_bytes = paths[0].stat().st_size + paths[1].stat().st_size
+
+    assert cache.enforce_limit() == 1
+    assert paths[0].exists() and not paths[1].exists() and paths[2].exists()
+
+
+def test_lookup_touches_rarely_and_store_tracks_size(tmp_path, monkeypatch):
+    cache = ThumbnailCache(tmp_path, max_bytes=10 * 1024 * 1024)
+    first = cache.store("https://img.example.com/first.png", _png_bytes())
+    stamp = first.stat().st_mtime - 60
+    os.utime(first, (stamp, stamp))
+
+    cache.lookup("https://img.example.com/first.png")
+    assert first.stat().st_mtime == stamp
+
+    scans = []
+    original_scan = cache._scan
+    monkeypatch.setattr(cache, "_scan", lambda: scans.append(1) or original_scan())
+    second = cache.store("https://img.example.com/second.png", _png_bytes())
+    assert scans == []
+    assert cache._size == first.stat().st_size + second.stat().st_size
+
+
+def test_find_thumbnail_uses_twitter_image():
+    class Parsed:
+        meta_img_url = ""
+        meta_data = {"twitter": {"image": "https://img.example.com/tw.jpg"}}
+        top_image = "https://img.example.com/top.jpg"
+        html = ""
+
+    assert find_thumbnail(Parsed()) == "https://img.example.com/tw.jpg"
+
+
+def test_index_serves_cached_thumbnail_locally(monkeypatch, tmp_path, flask_app_client, article_factory):
+    cache = ThumbnailCache(tmp_path)
+    monkeypatch.setattr(flask_module, "get_thumbnail_cache", lambda: cache)
+    cached_url = "https://img.example.com/cached.png"
+    cache.store(cached_url, _png_bytes())
+    article_factory(title="Cached", thumbnail_url=cached_url)
+    article_factory(title="Remote", thumbnail_url="https://img.example.com/remote.png")
+
+    body = flask_app_client.get("/").data.decode("utf-8")
+
+    local_src = f"/thumbnails/{thumbnail_key(cached_url)}.jpg"
+    assert local_src in body
+    assert "https://img.example.com/remote.png" in body
+
+    response = flask_app_client.get(local_src)
+    assert response.status_code == 200
+    assert response.mimetype == "image/jpeg"
+    assert "immutable" in response.headers["Cache-Control"]
+    assert flask_app_client.get("/thumbnails/not-a-key.jpg").status_code == 404
+
+
+def test_cached_index_switches_to_local_thumbnail_when_download_lands(monkeypatch, tmp_path, flask_app_client,
+                                                                     article_factory, db_manager):
+    cache = ThumbnailCache(tmp_path)
+    monkeypatch.setattr(flask_module, "get_thumbnail_cache", lambda: cache)
+    url = "https://img.example.com/late.png"
+    article_factory(title="Late", thumbnail_url=url)
+    assert url in flask_app_client.get("/").data.decode("utf-8")
+
+    monkeypatch.setattr(cache, "fetch", lambda remote: cache.store(remote, _png_bytes()))
+    cache.schedule(url, on_stored=db_manager.mark_thumbnails_changed)
+    cache.wait()
+
+    body = flask_app_client.get("/").data.decode("utf-8")
+    assert f"/thumbnails/{thumbnail_key(url)}.jpg" in body
+    assert url not in body
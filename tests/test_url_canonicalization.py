@@ -0,0 +1,94 @@
+import sqlite3
+
+from newsreader.database import DatabaseManager
+from newsreader.urls import canonicalize_url, find_canonical_link
+
+
+def test_canonicalize_url_folds_common_variants():
+    expected = "https://dr.dk/nyheder/indland/klimaplan?id=7"
+    variants = [
+        "http://www.dr.dk/nyheder/indland/klimaplan/?id=7",
+        "https://www.dr.dk/nyheder/indland/klimaplan?utm_source=facebook&id=7#comments",
+        "https://www.dr.dk/nyheder/indland/klimaplan/amp?id=7&fbclid=abc",
+        "https://amp.dr.dk/nyheder/indland/klimaplan?id=7",
+    ]
+
+    assert {canonicalize_url(url) for url in variants} == {expected}
+
+
+def test_canonicalize_url_applies_source_rules():
+    url = "https://nyheder.tv2.dk/samfund/artikel?page=2&ref=forside&session=1"
+
+    assert canonicalize_url(url, {"strip_params": ["session"]}) == "https://nyheder.tv2.dk/samfund/artikel?page=2"
+    assert canonicalize_url(url, {"keep_query": False}) == "https://nyheder.tv2.dk/samfund/artikel"
+    assert canonicalize_url(url, {"keep_params": ["ref"], "strip_params": ["session"]}) == (
+        "https://nyheder.tv2.dk/samfund/artikel?page=2&ref=forside"
+    )
+
+
+def test_find_canonical_link_resolves_relative_href():
+    html = '<html><head><link href="/nyheder/klima" rel="canonical"></head></html>'
+
+    assert find_canonical_link(html, "https://www.dr.dk/nyheder/klima/amp") == "https://www.dr.dk/nyheder/klima"
+    assert find_canonical_link("<html></html>", "https://www.dr.dk/") is None
+
+
+def test_article_exists_matches_url_variants(db_manager, article_factory):
+    article_id = article_factory(url="https://www.dr.dk/nyheder/klima")
+
+    assert db_manager.article_exists("http://dr.dk/nyheder/klima/?utm_medium=rss") == article_id
+    assert db_manager.article_exists("https://www.dr.dk/nyheder/andet") is None
+
+
+def test_save_articles_to_db_skips_canonical_duplicates(db_manager, article_factory):
+    from newsreader.fetcher import NewsFetcher
+
+    article_factory(url="https://nyheder.tv2.dk/samfund/klima")
+    fetcher = NewsFetcher(db_manager)
+    fetcher.geo_tag_on_ingest = False
+
+    fetcher.save_articles_to_db([{
+        "title": "Klima",
+        "content": "Indhold",
+        "url": "https://nyheder.tv2.dk/samfund/klima?utm_source=twitter",
+        "source": "TV 2 Nyheder",
+    }])
+
+    assert db_manager.get_article_count() == 1
+
+
+def test_save_article_keeps_existing_row_for_url_variant(db_manager, article_factory):
+    first_id = article_factory(url="https://www.ex.com/b?utm_source=x")
+    db_manager.save_geo_tags(first_id, [{"tag": "Odense", "confidence": 0.9, "label": "test", "lat": 55.4, "lon": 10.4}])
+
+    second_id = article_factory(url="https://ex.com/b")
+
+    assert second_id == first_id
+    assert db_manager.get_article_count() == 1
+    assert db_manager.get_article_by_id(first_id)["url"] == "https://www.ex.com/b?utm_source=x"
+    assert [tag["tag"] for tag in db_manager.get_geo_tags_for_article(first_id)] == ["Odense"]
+
+
+def test_canonicalize_url_falls_back_on_bad_port():
+    assert canonicalize_url("https://x.dk:99999/a") == "https://x.dk:99999/a"
+
+
+def test_migration_backfills_legacy_url_variants(temp_db_path):
+    DatabaseManager(temp_db_path)
+    conn = sqlite3.connect(temp_db_path)
+    conn.execute("DROP INDEX idx_articles_canonical_url")
+    conn.execute("ALTER TABLE articles DROP COLUMN canonical_url")
+    for url in ("https://x.dk/a?utm_source=fb", "https://x.dk/a", "https://x.dk:99999/b"):
+        conn.execute("INSERT INTO articles (title, content, url, source) VALUES ('T', 'C', ?, 'S')", (url,))
+    conn.commit()
+    conn.close()
+
+    manager = DatabaseManager(temp_db_path)
+
+    rows = {row["url"]: row for row in manager.get_connection().execute(
+        "SELECT id, url, canonical_url, duplicate_of FROM articles")}
+    first, variant = rows["https://x.dk/a?utm_source=fb"], rows["https://x.dk/a"]
+    assert first["canonical_url"] == "https://x.dk/a" and first["duplicate_of"] is None
+    assert variant["canonical_url"] is None and variant["duplicate_of"] == first["id"]
+    assert rows["https://x.dk:99999/b"]["canonical_url"] == "https://x.dk:99999/b"
+    assert manager.article_exists("http://www.x.dk/a/") == first["id"]